@@ -0,0 +1,177 @@
+import json
+import pymysql
+import boto3
+from botocore.exceptions import ClientError
+from sionpo_common import db, reactions, secret_cache, trending
+
+SECRET_NAME = 'sionpoKeys'
+ACTIONS = ('add', 'remove')
+MAX_OPERATIONS = 500
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
+    region_name = 'us-east-2'
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+        secret = get_secret_value_response['SecretString']
+        return json.loads(secret)
+    except ClientError as e:
+        raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def parse_operations(body):
+    """Accept {"operations": [...]} or a bare list; each operation is a reaction plus "action"."""
+    operations = body.get('operations') if isinstance(body, dict) else body
+    if not isinstance(operations, list) or not operations:
+        raise ValueError("operations must be a non-empty list")
+    if len(operations) > MAX_OPERATIONS:
+        raise ValueError(f"At most {MAX_OPERATIONS} operations per batch")
+    return operations
+
+
+def validate_operations(operations):
+    """Return (valid, results): valid is [(index, action, key)]; results holds the invalid ones."""
+    valid = []
+    results = [None] * len(operations)
+    for index, operation in enumerate(operations):
+        try:
+            fk_id_user, fk_id_pokemon, interaction_type = reactions.parse(operation)
+            # Los ids se comparan con las filas leídas de MySQL
+            key = (db.parse_id(fk_id_user, 'Fk_id_user'), db.parse_id(fk_id_pokemon, 'Fk_id_pokemon'), interaction_type)
+            action = operation.get('action', 'add')
+            if action not in ACTIONS:
+                raise ValueError("Invalid action")
+            valid.append((index, action, key))
+        except (TypeError, ValueError) as error:
+            results[index] = {"index": index, "status": "invalid", "message": str(error)}
+    return valid, results
+
+
+def apply_operations(cursor, valid, results):
+    """Replay the operations in order against the current rows, then write only the net change.
+
+    One locking SELECT reads the current state, one multi-row upsert and one multi-row DELETE
+    write it, and each touched Pokemon gets a single counter update.
+    """
+    # No se escriben reacciones nuevas a Pokemon borrados (purge_publications los elimina después)
+    deleted = reactions.deleted_pokemon(cursor, [key[1] for _, action, key in valid if action == 'add'])
+    if deleted:
+        for index, action, key in valid:
+            if action == 'add' and key[1] in deleted:
+                results[index] = {"index": index, "status": "invalid", "message": "Pokemon not found"}
+        valid = [(index, action, key) for index, action, key in valid if results[index] is None]
+
+    present = reactions.existing_keys(cursor, [key for _, _, key in valid], for_update=True)
+    initial = set(present)
+
+    for index, action, key in valid:
+        if action == 'add':
+            status = "exists" if key in present else "created"
+            present.add(key)
+        else:
+            status = "removed" if key in present else "not_found"
+            present.discard(key)
+        results[index] = {"index": index, "action": action, "status": status}
+
+    to_insert = [key for key in dict.fromkeys(k for _, _, k in valid) if key in present and key not in initial]
+    to_delete = sorted(initial - present)
+
+    if to_insert:
+        cursor.execute(reactions.upsert_sql(len(to_insert)), [value for key in to_insert for value in key])
+        created = {}
+        for _, fk_id_pokemon, interaction_type in to_insert:
+            counts = created.setdefault(fk_id_pokemon, {})
+            counts[interaction_type] = counts.get(interaction_type, 0) + 1
+        trending.record_scores(cursor, trending.scores_for(created), reactions.COUNTER_SHARDS)
+    if to_delete:
+        reactions.delete_many(cursor, to_delete)
+
+    deltas = {}
+    for keys, sign in ((to_insert, 1), (to_delete, -1)):
+        for _, fk_id_pokemon, interaction_type in keys:
+            column = reactions.COUNTER_COLUMNS.get(interaction_type)
+            if column:
+                counters = deltas.setdefault(fk_id_pokemon, {})
+                counters[column] = counters.get(column, 0) + sign
+    reactions.apply_counter_deltas(cursor, deltas)
+    return len(to_insert) + len(to_delete)
+
+
+def lambda_handler(event, context):
+    try:
+        operations = parse_operations(json.loads(event['body']))
+    except json.JSONDecodeError:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "Invalid JSON"})
+        }
+    except (KeyError, TypeError):
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "Missing request body"})
+        }
+    except ValueError as error:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    valid, results = validate_operations(operations)
+    if not valid:
+        return {
+            "statusCode": 200,
+            "body": json.dumps({"changed": 0, "results": results})
+        }
+
+    try:
+        secrets = get_secret()
+        connection = db.acquire(secrets, get_secret)
+    except pymysql.MySQLError as error:
+        return {
+            "statusCode": 503,
+            "body": json.dumps({"message": f"Database connection error: {str(error)}"})
+        }
+    except Exception as error:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    try:
+        with connection.cursor() as cursor:
+            changed = apply_operations(cursor, valid, results)
+        connection.commit()
+        response = {
+            "statusCode": 200,
+            "body": json.dumps({"changed": changed, "results": results})
+        }
+    except pymysql.IntegrityError as error:
+        connection.rollback()
+        response = {
+            "statusCode": 422,
+            "body": json.dumps({"message": f"Nothing was applied: {str(error)}"})
+        }
+    except pymysql.MySQLError as error:
+        connection.rollback()
+        response = {
+            "statusCode": 500,
+            "body": json.dumps({"message": f"Nothing was applied: {str(error)}"})
+        }
+    finally:
+        db.release(connection)
+
+    return response
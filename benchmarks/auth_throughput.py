@@ -0,0 +1,116 @@
+"""End-to-end auth throughput against the in-process LocalCognito stand-in, without network.
+
+Each worker registers, confirms and logs in its own users through the real lambda_handlers
+(register_user, confirm_register, login) and then verifies the IdToken the way
+delete_publication does. Stage timings show where the handlers spend their time; the
+Cognito round trips themselves cost nothing here, so this measures our own overhead.
+
+    python benchmarks/auth_throughput.py --threads 1 4 16 --users 200
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'common'))
+sys.path.insert(0, ROOT)
+
+from sionpo_common import identity, jwks, secret_cache  # noqa: E402
+
+from confirm_register import app as confirm_register  # noqa: E402
+from delete_publication import app as delete_publication  # noqa: E402
+from login import app as login  # noqa: E402
+from register_user import app as register_user  # noqa: E402
+
+STAGES = ('register', 'confirm', 'login', 'verify')
+
+
+def call(handler, body):
+    response = handler({'body': json.dumps(body)}, None)
+    if response['statusCode'] != 200:
+        raise AssertionError(f"{handler.__module__}: {response['body']}")
+    return json.loads(response['body'])
+
+
+def worker(cognito, prefix, users, barrier, timings, errors):
+    spent = dict.fromkeys(STAGES, 0.0)
+    try:
+        barrier.wait()
+        for i in range(users):
+            username = f"{prefix}-{i}"
+            password = "Benchmark123!"
+
+            started = time.perf_counter()
+            call(register_user.lambda_handler, {
+                'username': username, 'password': password,
+                'email': f"{username}@example.com", 'picture': "https://example.com/p.png",
+            })
+            registered = time.perf_counter()
+            call(confirm_register.lambda_handler, {
+                'username': username, 'confirmation_code': cognito.confirmation_code(username),
+            })
+            confirmed = time.perf_counter()
+            tokens = call(login.lambda_handler, {'username': username, 'password': password})
+            logged_in = time.perf_counter()
+            delete_publication.verify_token(tokens['id_token'])
+            verified = time.perf_counter()
+
+            spent['register'] += registered - started
+            spent['confirm'] += confirmed - registered
+            spent['login'] += logged_in - confirmed
+            spent['verify'] += verified - logged_in
+    except Exception as error:
+        errors.append(error)
+    timings.append(spent)
+
+
+def run(args, threads):
+    # Mismo pool y cliente que delete_publication, para que acepte los IdToken emitidos
+    cognito = identity.LocalCognito(user_pool_id=delete_publication.USERPOOL_ID,
+                                    client_id=delete_publication.APP_CLIENT_ID)
+    identity.set_client(cognito)
+    # Los handlers leen cognitoKeys de la caché de secretos, sin ir a Secrets Manager
+    secret_cache.clear()
+    secret_cache.get_secret('cognitoKeys', cognito.secrets)
+    login.key_stores.clear()
+    delete_publication.key_store = identity.key_store(delete_publication.JWKS_URL)
+    delete_publication.token_cache = jwks.TokenCache()
+
+    barrier = threading.Barrier(threads + 1)
+    timings, errors = [], []
+    workers = [
+        threading.Thread(target=worker, args=(cognito, f"bench{threads}-{n}", args.users, barrier, timings, errors))
+        for n in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+
+    total = threads * args.users
+    per_stage = {stage: sum(spent[stage] for spent in timings) / total * 1000 for stage in STAGES}
+    return total / elapsed, per_stage
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--users', type=int, default=100, help="users registered and logged in per thread")
+    args = parser.parse_args(argv)
+
+    print(f"{'threads':>8} {'users/s':>10} " + " ".join(f"{stage + ' ms':>12}" for stage in STAGES))
+    for threads in args.threads:
+        rate, per_stage = run(args, threads)
+        print(f"{threads:>8} {rate:>10.1f} " + " ".join(f"{per_stage[stage]:>12.2f}" for stage in STAGES))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,80 @@
+"""Peak RSS of serializing the full Pokemon catalog: fetchall + json.dumps vs SSCursor streaming.
+
+Each (mode, rows) pair runs in its own interpreter so ru_maxrss is not shared between runs.
+Rows are generated lazily with the shape of the Pokemon table, standing in for an unbuffered
+server-side cursor.
+
+    python benchmarks/catalog_serialization.py 1000 10000 100000
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+
+from sionpo_common import json_stream  # noqa: E402
+
+DEFAULT_ROWS = [1000, 10000, 50000, 100000]
+
+
+def make_row(i):
+    return (
+        f"Pokemon {i}",
+        json.dumps(["overgrow", "chlorophyll"]),
+        json.dumps(["grass", "poison"]),
+        "A strange seed was planted on its back at birth. " * 4,
+        "Level 16",
+        f"https://img.example.com/pokemon/{i}.png",
+        i % 1000,
+        i % 100,
+        "2024-06-01 12:00:00",
+        i,
+        1,
+    )
+
+
+class FakeSSCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.position = 0
+
+    def fetchmany(self, size):
+        end = min(self.position + size, self.rows)
+        chunk = [make_row(i) for i in range(self.position, end)]
+        self.position = end
+        return chunk
+
+    def fetchall(self):
+        return self.fetchmany(self.rows - self.position)
+
+
+def run(mode, rows):
+    cursor = FakeSSCursor(rows)
+    if mode == 'buffered':
+        body = json.dumps(cursor.fetchall(), default=str)
+    else:
+        body = json_stream.dumps_rows(cursor)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"mode": mode, "rows": rows, "peak_rss_mb": round(peak_kb / 1024, 1), "body_mb": round(len(body) / 2 ** 20, 1)}))
+
+
+def main(argv):
+    if argv and argv[0] == '--child':
+        run(argv[1], int(argv[2]))
+        return
+
+    row_counts = [int(arg) for arg in argv] or DEFAULT_ROWS
+    print(f"{'rows':>8} {'body MB':>8} {'buffered MB':>12} {'streaming MB':>13}")
+    for rows in row_counts:
+        results = {}
+        for mode in ('buffered', 'streaming'):
+            output = subprocess.check_output([sys.executable, __file__, '--child', mode, str(rows)])
+            results[mode] = json.loads(output)
+        print(f"{rows:>8} {results['streaming']['body_mb']:>8} "
+              f"{results['buffered']['peak_rss_mb']:>12} {results['streaming']['peak_rss_mb']:>13}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,157 @@
+"""Reaction throughput on one hot Pokemon: single-row writes vs PokemonCounterShard/TrendingScoreShard.
+
+Needs a local MySQL; the benchmark creates (and drops with --drop) its own scratch database.
+Every worker thread has its own connection and commits one like per transaction through
+reactions.add, so each transaction writes the Interactions row, the counter, the row version and
+the trending score exactly as post_reaction does. After each run the shards are folded and the
+final like count and trending rows are checked.
+
+    docker run --rm -e MYSQL_ROOT_PASSWORD=root -p 3306:3306 mysql:8
+    python benchmarks/counter_contention.py --password root --threads 4 16 64 --shards 1 8 32
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import pymysql
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'common'))
+sys.path.insert(0, ROOT)
+
+from sionpo_common import reactions  # noqa: E402
+
+from fold_counters import app as fold_counters  # noqa: E402
+
+HOT_POKEMON = 25
+SCHEMA = (
+    "CREATE TABLE Pokemon ("
+    " id_pokemon BIGINT PRIMARY KEY,"
+    " likes_count BIGINT UNSIGNED NOT NULL DEFAULT 0,"
+    " dislikes_count BIGINT UNSIGNED NOT NULL DEFAULT 0,"
+    " deleted_at DATETIME NULL DEFAULT NULL)",
+    "CREATE TABLE CatalogVersion ("
+    " table_name VARCHAR(64) NOT NULL, row_id BIGINT NOT NULL,"
+    " version BIGINT UNSIGNED NOT NULL DEFAULT 0, PRIMARY KEY (table_name, row_id))",
+    "CREATE TABLE PokemonCounterShard ("
+    " id_pokemon BIGINT NOT NULL, slot SMALLINT UNSIGNED NOT NULL,"
+    " likes_count BIGINT NOT NULL DEFAULT 0, dislikes_count BIGINT NOT NULL DEFAULT 0,"
+    " PRIMARY KEY (id_pokemon, slot))",
+    "CREATE TABLE Interactions ("
+    " id_interaction BIGINT AUTO_INCREMENT PRIMARY KEY,"
+    " Fk_id_user BIGINT NOT NULL, Fk_id_pokemon BIGINT NOT NULL, interaction_type VARCHAR(16) NOT NULL,"
+    " created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,"
+    " UNIQUE KEY uq_interaction (Fk_id_user, Fk_id_pokemon, interaction_type))",
+    "CREATE TABLE TrendingScore ("
+    " id_pokemon BIGINT NOT NULL PRIMARY KEY, score DOUBLE NOT NULL, INDEX idx_trending_score (score))",
+    "CREATE TABLE TrendingScoreShard ("
+    " id_pokemon BIGINT NOT NULL, slot SMALLINT UNSIGNED NOT NULL, score DOUBLE NOT NULL,"
+    " PRIMARY KEY (id_pokemon, slot))",
+)
+
+
+def connect(args, db=None):
+    return pymysql.connect(host=args.host, port=args.port, user=args.user, password=args.password, db=db)
+
+
+def reset_schema(args):
+    connection = connect(args)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS {args.db}")
+            cursor.execute(f"CREATE DATABASE {args.db}")
+            cursor.execute(f"USE {args.db}")
+            for statement in SCHEMA:
+                cursor.execute(statement)
+            cursor.execute("INSERT INTO Pokemon (id_pokemon) VALUES (%s)", (HOT_POKEMON,))
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def worker(args, barrier, errors, first_user):
+    connection = connect(args, args.db)
+    try:
+        barrier.wait()
+        # Un usuario distinto por transacción: cada like es nuevo y pasa por contador y trending
+        for fk_id_user in range(first_user, first_user + args.writes):
+            with connection.cursor() as cursor:
+                reactions.add(cursor, fk_id_user, HOT_POKEMON, 'like')
+            connection.commit()
+    except Exception as error:
+        errors.append(error)
+    finally:
+        connection.close()
+
+
+def run(args, threads, shards):
+    reset_schema(args)
+    reactions.COUNTER_SHARDS = shards
+    barrier = threading.Barrier(threads + 1)
+    errors = []
+    workers = [
+        threading.Thread(target=worker, args=(args, barrier, errors, index * args.writes))
+        for index in range(threads)
+    ]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+
+    connection = connect(args, args.db)
+    try:
+        fold_counters.fold(connection)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT likes_count FROM Pokemon WHERE id_pokemon = %s", (HOT_POKEMON,))
+            likes = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM TrendingScore")
+            ranked = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM TrendingScoreShard")
+            pending = cursor.fetchone()[0]
+    finally:
+        connection.close()
+    expected = threads * args.writes
+    if likes != expected:
+        raise AssertionError(f"lost updates: {likes} likes, expected {expected}")
+    if (ranked, pending) != (1, 0):
+        raise AssertionError(f"trending not folded: {ranked} TrendingScore rows, {pending} shard rows")
+    return expected / elapsed
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3306)
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--db', default='sionpo_counter_bench')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 8, 32],
+                        help="1 = direct writes to the Pokemon and TrendingScore rows")
+    parser.add_argument('--writes', type=int, default=500, help="transactions per thread")
+    parser.add_argument('--drop', action='store_true', help="drop the scratch database at the end")
+    args = parser.parse_args(argv)
+
+    print(f"{'threads':>8} " + " ".join(f"{'shards=' + str(shards):>12}" for shards in args.shards) + "   (likes/s)")
+    for threads in args.threads:
+        results = [run(args, threads, shards) for shards in args.shards]
+        print(f"{threads:>8} " + " ".join(f"{rate:>12.0f}" for rate in results))
+
+    if args.drop:
+        connection = connect(args)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP DATABASE IF EXISTS {args.db}")
+        finally:
+            connection.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
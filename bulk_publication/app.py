@@ -0,0 +1,147 @@
+import json
+import pymysql
+import boto3
+from botocore.exceptions import ClientError
+from sionpo_common import db, pokemon, secret_cache, versions
+
+SECRET_NAME = 'sionpoKeys'
+CHUNK_SIZE = 500
+MAX_CHUNK_SIZE = 5000
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
+    region_name = 'us-east-2'
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+        secret = get_secret_value_response['SecretString']
+        return json.loads(secret)
+    except ClientError as e:
+        raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def parse_records(text):
+    """Accept a JSON array or NDJSON (one publication per line)."""
+    stripped = text.strip()
+    if stripped.startswith('['):
+        records = json.loads(stripped)
+    else:
+        records = [json.loads(line) for line in stripped.splitlines() if line.strip()]
+    if not records:
+        raise ValueError("No publications in request body")
+    return records
+
+
+def validate_records(records):
+    """Return (rows, errors): INSERT values for valid records and per-record errors."""
+    rows = []
+    errors = []
+    seen_ids = set()
+    for index, record in enumerate(records):
+        try:
+            values = pokemon.publication_values(record)
+            id_pokemon = record['id_pokemon']
+            if id_pokemon in seen_ids:
+                raise ValueError(f"Duplicate id_pokemon in request: {id_pokemon}")
+            seen_ids.add(id_pokemon)
+            rows.append(values)
+        except ValueError as error:
+            errors.append({"index": index, "message": str(error)})
+    return rows, errors
+
+
+def import_rows(connection, rows, chunk_size=CHUNK_SIZE):
+    """Insert rows in executemany chunks inside one transaction."""
+    id_position = pokemon.PUBLICATION_INSERT_COLUMNS.index('id_pokemon')
+    try:
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                # pymysql reescribe executemany de un INSERT ... VALUES en un INSERT de varias filas
+                cursor.executemany(pokemon.PUBLICATION_INSERT_SQL, chunk)
+                versions.bump(cursor, 'Pokemon', *[row[id_position] for row in chunk])
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    return len(rows)
+
+
+def lambda_handler(event, context):
+    try:
+        records = parse_records(event['body'])
+        params = event.get('queryStringParameters') or {}
+        chunk_size = int(params.get('chunk_size', CHUNK_SIZE))
+        if chunk_size < 1 or chunk_size > MAX_CHUNK_SIZE:
+            raise ValueError(f"chunk_size must be between 1 and {MAX_CHUNK_SIZE}")
+    except (KeyError, TypeError, AttributeError):
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "Missing request body"})
+        }
+    except ValueError as error:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    rows, errors = validate_records(records)
+    if errors and not db.flag(event, 'allow_partial'):
+        return {
+            "statusCode": 422,
+            "body": json.dumps({"message": "Invalid publications, nothing was imported", "errors": errors})
+        }
+    if not rows:
+        return {
+            "statusCode": 422,
+            "body": json.dumps({"message": "No valid publications to import", "errors": errors})
+        }
+
+    try:
+        secrets = get_secret()
+    except Exception as error:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": str(error)})
+        }
+    try:
+        connection = db.acquire(secrets, get_secret)
+    except pymysql.MySQLError as error:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    try:
+        imported = import_rows(connection, rows, chunk_size)
+        response = {
+            "statusCode": 200,
+            "body": json.dumps({"imported": imported, "rejected": len(errors), "errors": errors})
+        }
+    except pymysql.IntegrityError as error:
+        response = {
+            "statusCode": 409,
+            "body": json.dumps({"message": f"Nothing was imported: {error}", "errors": errors})
+        }
+    except pymysql.MySQLError as error:
+        response = {
+            "statusCode": 500,
+            "body": json.dumps({"message": f"Nothing was imported: {error}", "errors": errors})
+        }
+    finally:
+        db.release(connection)
+
+    return response
@@ -0,0 +1,58 @@
+"""Import Pokemon publications from a JSON array or NDJSON file straight into SIONPO.
+
+    PYTHONPATH=common python -m bulk_publication.cli pokemon.ndjson --chunk-size 1000
+
+Uses the same validation and chunked executemany transaction as POST /add_pokemon/bulk.
+Connection settings come from --host/--user/--password or, if omitted, the sionpoKeys secret.
+"""
+import argparse
+import json
+import sys
+import time
+
+from sionpo_common import db
+
+from bulk_publication import app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import Pokemon publications")
+    parser.add_argument('file', help="JSON array or NDJSON file, '-' for stdin")
+    parser.add_argument('--chunk-size', type=int, default=app.CHUNK_SIZE)
+    parser.add_argument('--allow-partial', action='store_true', help="import valid records even if some are invalid")
+    parser.add_argument('--host')
+    parser.add_argument('--user')
+    parser.add_argument('--password')
+    parser.add_argument('--db', default=db.DB_NAME)
+    args = parser.parse_args(argv)
+
+    if args.file == '-':
+        text = sys.stdin.read()
+    else:
+        with open(args.file, encoding='utf-8') as source:
+            text = source.read()
+
+    rows, errors = app.validate_records(app.parse_records(text))
+    for error in errors:
+        print(json.dumps(error), file=sys.stderr)
+    if errors and not args.allow_partial:
+        print(f"{len(errors)} invalid publications, nothing was imported", file=sys.stderr)
+        return 1
+
+    if args.host:
+        secrets = {'host': args.host, 'username': args.user, 'password': args.password}
+        connection = db.open_connection(secrets, args.db)
+    else:
+        connection = db.connect(app.get_secret(), app.get_secret, args.db)
+
+    started = time.monotonic()
+    try:
+        imported = app.import_rows(connection, rows, args.chunk_size)
+    finally:
+        connection.close()
+    print(f"Imported {imported} publications in {time.monotonic() - started:.2f}s ({len(errors)} rejected)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
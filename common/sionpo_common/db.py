@@ -0,0 +1,152 @@
+import threading
+
+import pymysql
+
+DB_NAME = "SIONPO"
+CONNECT_TIMEOUT = 5
+ER_ACCESS_DENIED = 1045
+
+
+def error_code(error):
+    return error.args[0] if error.args else None
+
+
+def open_connection(secrets, db_name=DB_NAME, connect_timeout=CONNECT_TIMEOUT):
+    return pymysql.connect(
+        host=secrets['host'],
+        user=secrets['username'],
+        password=secrets['password'],
+        db=db_name,
+        connect_timeout=connect_timeout
+    )
+
+
+def connect(secrets, get_secret=None, db_name=DB_NAME, connect_timeout=CONNECT_TIMEOUT):
+    """Open a connection; on 1045 re-fetch the (possibly rotated) secret once and retry."""
+    try:
+        return open_connection(secrets, db_name, connect_timeout)
+    except pymysql.MySQLError as error:
+        if get_secret is None or error_code(error) != ER_ACCESS_DENIED:
+            raise
+    return open_connection(get_secret(refresh=True), db_name, connect_timeout)
+
+
+class ConnectionManager:
+    """Keeps one MySQL connection alive across warm Lambda invocations."""
+
+    def __init__(self, db_name=DB_NAME, connect_timeout=CONNECT_TIMEOUT):
+        self.db_name = db_name
+        self.connect_timeout = connect_timeout
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._in_use = False
+        self._lock = threading.Lock()
+
+    def acquire(self, secrets, get_secret=None):
+        with self._lock:
+            if self._in_use:
+                # Otro hilo tiene la conexión persistente; se abre una conexión de un solo uso
+                self.misses += 1
+                return connect(secrets, get_secret, self.db_name, self.connect_timeout)
+            self._in_use = True
+
+        try:
+            connection = self._connection
+            if connection is not None and self._is_alive(connection):
+                self.hits += 1
+                return connection
+
+            self._discard()
+            self.misses += 1
+            self._connection = connect(secrets, get_secret, self.db_name, self.connect_timeout)
+            return self._connection
+        except Exception:
+            with self._lock:
+                self._in_use = False
+            raise
+
+    def release(self, connection):
+        if connection is not self._connection:
+            self._close(connection)
+            return
+
+        try:
+            # Deja la sesión limpia para la siguiente invocación. Siempre: pymysql solo actualiza
+            # server_status con paquetes OK, y un SELECT (termina en EOF) deja la transacción
+            # REPEATABLE READ abierta sin marcarla; la siguiente invocación leería ese snapshot viejo
+            connection.rollback()
+            if connection.autocommit_mode:
+                connection.autocommit(False)
+        except Exception:
+            self._discard()
+        finally:
+            with self._lock:
+                self._in_use = False
+
+    def close(self):
+        self._discard()
+        with self._lock:
+            self._in_use = False
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _is_alive(self, connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self):
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            self._close(connection)
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+_manager = ConnectionManager()
+
+
+def acquire(secrets, get_secret=None):
+    return _manager.acquire(secrets, get_secret)
+
+
+def release(connection):
+    _manager.release(connection)
+
+
+def close():
+    _manager.close()
+
+
+def stats():
+    return _manager.stats()
+
+
+def row_to_dict(cursor, row):
+    if row is None:
+        return None
+    columns = [desc[0] for desc in cursor.description]
+    return dict(zip(columns, row))
+
+
+def flag(event, name):
+    params = event.get('queryStringParameters') or {}
+    return str(params.get(name, '')).lower() in ('1', 'true', 'yes')
+
+
+def parse_id(value, field):
+    # Solo enteros o cadenas de dígitos: int() truncaría 1.9 y aceptaría True como 1
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.isascii() and value.isdigit():
+        return int(value)
+    raise ValueError(f"{field} must be an integer")
@@ -0,0 +1,324 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import random
+import secrets
+import threading
+import time
+import uuid
+
+import boto3
+import jwt
+from botocore.exceptions import ClientError
+from jwt.algorithms import RSAAlgorithm
+
+from sionpo_common import jwks
+
+# cognito -> boto3 cognito-idp; local -> LocalCognito en proceso (pruebas y benchmarks sin red)
+IDENTITY_PROVIDER = os.environ.get('IDENTITY_PROVIDER', 'cognito')
+TOKEN_TTL = 3600
+# Errores de Cognito que se pueden reintentar (cuotas por segundo y fallos transitorios)
+RETRYABLE_CODES = ('TooManyRequestsException', 'LimitExceededException', 'InternalErrorException')
+MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.2
+# Grupo de los usuarios que se registran por /register
+DEFAULT_GROUP = 'user'
+
+
+def secret_hash(username, client_id, client_secret):
+    """SECRET_HASH that Cognito requires from an app client that has a secret."""
+    message = username + client_id
+    dig = hmac.new(client_secret.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).digest()
+    return base64.b64encode(dig).decode()
+
+
+def _error(code, message, operation):
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation)
+
+
+def call_with_retry(operation, attempts=MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY, sleep=None, **kwargs):
+    """Call a cognito-idp operation, retrying throttling with exponential backoff and full jitter."""
+    for attempt in range(attempts):
+        try:
+            return operation(**kwargs)
+        except ClientError as error:
+            if error.response['Error']['Code'] not in RETRYABLE_CODES or attempt == attempts - 1:
+                raise
+            (sleep or time.sleep)(random.uniform(0, base_delay * 2 ** attempt))
+
+
+def add_user_to_group(client, user_pool_id, username, group, **retry):
+    """Idempotent group assignment: adding a user to a group it already has is a no-op in Cognito."""
+    return call_with_retry(client.admin_add_user_to_group, UserPoolId=user_pool_id, Username=username,
+                           GroupName=group, **retry)
+
+
+def ensure_group(client, user_pool_id, username, group=DEFAULT_GROUP, **retry):
+    """Return (first group of the user, whether it was added), adding group if the user has none.
+
+    Repairs users confirmed from the console or the admin API, and users whose assignment
+    failed in confirm_register.
+    """
+    groups = call_with_retry(client.admin_list_groups_for_user, Username=username, UserPoolId=user_pool_id,
+                             **retry)['Groups']
+    if groups:
+        return groups[0]['GroupName'], False
+    add_user_to_group(client, user_pool_id, username, group, **retry)
+    return group, True
+
+
+class RateLimiter:
+    """Token bucket shared by worker threads so a bulk job stays under a Cognito requests-per-second quota."""
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self.sleep(wait)
+
+
+class LocalCognito:
+    """In-process stand-in for the cognito-idp client.
+
+    Implements the calls the handlers make, with Cognito's parameter names and error codes,
+    and signs real RS256 tokens whose public key is served by jwks().
+    """
+
+    def __init__(self, user_pool_id='local_pool', client_id='local-client', client_secret='local-secret',
+                 token_ttl=TOKEN_TTL, clock=time.time):
+        # Import diferido: solo el modo local necesita generar claves
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        self.user_pool_id = user_pool_id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_ttl = token_ttl
+        self.clock = clock
+        self.issuer = f"https://cognito-idp.local/{user_pool_id}"
+        self.key_id = uuid.uuid4().hex
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._users = {}
+        self._refresh_tokens = {}
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def secrets(self):
+        """The cognitoKeys secret the handlers would read from Secrets Manager."""
+        return {'USER_POOL_ID': self.user_pool_id, 'CLIENT_ID': self.client_id, 'CLIENT_SECRET': self.client_secret}
+
+    def jwks(self):
+        jwk = json.loads(RSAAlgorithm.to_jwk(self._private_key.public_key()))
+        jwk.update({"kid": self.key_id, "alg": "RS256", "use": "sig"})
+        return {"keys": [jwk]}
+
+    def confirmation_code(self, username):
+        """Code that confirm_sign_up expects; with real Cognito it arrives by email."""
+        return self._user(username, 'ConfirmSignUp')['code']
+
+    def sign_up(self, ClientId, Username, Password, SecretHash=None, UserAttributes=()):
+        self._check_client(ClientId, Username, SecretHash, 'SignUp')
+        with self._lock:
+            if Username in self._users:
+                raise _error('UsernameExistsException', "User already exists", 'SignUp')
+            user_sub = str(uuid.uuid4())
+            self._users[Username] = {
+                'sub': user_sub,
+                'password': Password,
+                'attributes': {attribute['Name']: attribute['Value'] for attribute in UserAttributes},
+                'confirmed': False,
+                'code': f"{secrets.randbelow(10 ** 6):06d}",
+                'groups': [],
+            }
+        return {'UserConfirmed': False, 'UserSub': user_sub}
+
+    def confirm_sign_up(self, ClientId, Username, ConfirmationCode, SecretHash=None):
+        self._check_client(ClientId, Username, SecretHash, 'ConfirmSignUp')
+        user = self._user(Username, 'ConfirmSignUp')
+        if user['confirmed']:
+            raise _error('NotAuthorizedException', "User cannot be confirmed. Current status is CONFIRMED",
+                         'ConfirmSignUp')
+        if user['code'] != ConfirmationCode:
+            raise _error('CodeMismatchException', "Invalid verification code provided, please try again.",
+                         'ConfirmSignUp')
+        user['confirmed'] = True
+        return {}
+
+    def admin_create_user(self, UserPoolId, Username, UserAttributes=(), DesiredDeliveryMediums=(),
+                          TemporaryPassword=None, MessageAction=None):
+        self._check_pool(UserPoolId, 'AdminCreateUser')
+        with self._lock:
+            if Username in self._users:
+                raise _error('UsernameExistsException', "User account already exists.", 'AdminCreateUser')
+            self._users[Username] = {
+                'sub': str(uuid.uuid4()),
+                'password': TemporaryPassword or secrets.token_urlsafe(12),
+                'attributes': {attribute['Name']: attribute['Value'] for attribute in UserAttributes},
+                'confirmed': True,
+                # Como en Cognito: el primer login responde NEW_PASSWORD_REQUIRED
+                'force_change_password': True,
+                'code': None,
+                'groups': [],
+            }
+            user = self._users[Username]
+        return {'User': {
+            'Username': Username,
+            'Attributes': [{'Name': 'sub', 'Value': user['sub']}] + list(UserAttributes),
+            'UserStatus': 'FORCE_CHANGE_PASSWORD',
+        }}
+
+    def temporary_password(self, username):
+        """Password that admin_create_user generated; with real Cognito it arrives by email."""
+        return self._user(username, 'AdminCreateUser')['password']
+
+    def admin_add_user_to_group(self, UserPoolId, Username, GroupName):
+        self._check_pool(UserPoolId, 'AdminAddUserToGroup')
+        user = self._user(Username, 'AdminAddUserToGroup')
+        with self._lock:
+            if GroupName not in user['groups']:
+                user['groups'].append(GroupName)
+        return {}
+
+    def admin_list_groups_for_user(self, Username, UserPoolId):
+        self._check_pool(UserPoolId, 'AdminListGroupsForUser')
+        user = self._user(Username, 'AdminListGroupsForUser')
+        return {'Groups': [{'GroupName': name, 'UserPoolId': UserPoolId} for name in user['groups']]}
+
+    def initiate_auth(self, ClientId, AuthFlow, AuthParameters):
+        if AuthFlow == 'USER_PASSWORD_AUTH':
+            username = AuthParameters.get('USERNAME', '')
+            user = self._users.get(username)
+            if user is None or user['password'] != AuthParameters.get('PASSWORD'):
+                raise _error('NotAuthorizedException', "Incorrect username or password.", 'InitiateAuth')
+            if not user['confirmed']:
+                raise _error('UserNotConfirmedException', "User is not confirmed.", 'InitiateAuth')
+            if user.get('force_change_password'):
+                self._check_client(ClientId, username, AuthParameters.get('SECRET_HASH'), 'InitiateAuth')
+                session = secrets.token_urlsafe(32)
+                with self._lock:
+                    self._sessions[session] = username
+                return {
+                    'ChallengeName': 'NEW_PASSWORD_REQUIRED',
+                    'Session': session,
+                    'ChallengeParameters': {'USER_ID_FOR_SRP': username, 'requiredAttributes': '[]'},
+                }
+        elif AuthFlow == 'REFRESH_TOKEN_AUTH':
+            username = self._refresh_tokens.get(AuthParameters.get('REFRESH_TOKEN'))
+            if username is None:
+                raise _error('NotAuthorizedException', "Invalid Refresh Token", 'InitiateAuth')
+        else:
+            raise _error('InvalidParameterException', f"Unsupported AuthFlow {AuthFlow}", 'InitiateAuth')
+        self._check_client(ClientId, username, AuthParameters.get('SECRET_HASH'), 'InitiateAuth')
+
+        result = self._tokens(username, self._users[username])
+        if AuthFlow == 'USER_PASSWORD_AUTH':
+            result['RefreshToken'] = secrets.token_urlsafe(32)
+            with self._lock:
+                self._refresh_tokens[result['RefreshToken']] = username
+        return {'AuthenticationResult': result}
+
+    def respond_to_auth_challenge(self, ClientId, ChallengeName, Session, ChallengeResponses):
+        with self._lock:
+            username = self._sessions.pop(Session, None)
+        if ChallengeName != 'NEW_PASSWORD_REQUIRED' or username is None \
+                or ChallengeResponses.get('USERNAME') != username:
+            raise _error('NotAuthorizedException', "Invalid session for the user.", 'RespondToAuthChallenge')
+        self._check_client(ClientId, username, ChallengeResponses.get('SECRET_HASH'), 'RespondToAuthChallenge')
+        if not ChallengeResponses.get('NEW_PASSWORD'):
+            raise _error('InvalidParameterException', "Missing required parameter NEW_PASSWORD",
+                         'RespondToAuthChallenge')
+
+        user = self._users[username]
+        user['password'] = ChallengeResponses['NEW_PASSWORD']
+        user['force_change_password'] = False
+        result = self._tokens(username, user)
+        result['RefreshToken'] = secrets.token_urlsafe(32)
+        with self._lock:
+            self._refresh_tokens[result['RefreshToken']] = username
+        return {'AuthenticationResult': result}
+
+    def _tokens(self, username, user):
+        now = int(self.clock())
+        common = {"sub": user['sub'], "iss": self.issuer, "iat": now, "auth_time": now, "exp": now + self.token_ttl}
+        if user['groups']:
+            common["cognito:groups"] = list(user['groups'])
+        id_claims = dict(common, aud=self.client_id, token_use='id', **{"cognito:username": username})
+        id_claims.update(user['attributes'])
+        access_claims = dict(common, client_id=self.client_id, token_use='access', username=username)
+        return {
+            'IdToken': self._sign(id_claims),
+            'AccessToken': self._sign(access_claims),
+            'ExpiresIn': self.token_ttl,
+            'TokenType': 'Bearer',
+        }
+
+    def _sign(self, claims):
+        return jwt.encode(claims, self._private_key, algorithm="RS256", headers={"kid": self.key_id})
+
+    def _user(self, username, operation):
+        user = self._users.get(username)
+        if user is None:
+            raise _error('UserNotFoundException', "User does not exist.", operation)
+        return user
+
+    def _check_pool(self, user_pool_id, operation):
+        if user_pool_id != self.user_pool_id:
+            raise _error('ResourceNotFoundException', f"User pool {user_pool_id} does not exist.", operation)
+
+    def _check_client(self, client_id, username, hash_value, operation):
+        if client_id != self.client_id:
+            raise _error('ResourceNotFoundException', f"User pool client {client_id} does not exist.", operation)
+        if hash_value != secret_hash(username, self.client_id, self.client_secret):
+            raise _error('NotAuthorizedException',
+                         f"Client {client_id} is configured for secret but secret was not received", operation)
+
+
+_client = None
+
+
+def get_client():
+    """The cognito-idp client for this process: set_client() override, LocalCognito, or a boto3 client.
+
+    The client is created once and reused (boto3 clients are thread-safe), so warm invocations
+    skip building it again.
+    """
+    global _client
+    if _client is None:
+        _client = LocalCognito() if IDENTITY_PROVIDER == 'local' else boto3.client('cognito-idp')
+    return _client
+
+
+def set_client(client):
+    """Replace the process identity provider (tests, local runs and benchmarks); returns the previous one."""
+    global _client
+    previous, _client = _client, client
+    return previous
+
+
+def load_jwks(url, timeout=5):
+    # Con el proveedor local las claves salen del propio LocalCognito, sin red
+    client = _client if _client is not None else (get_client() if IDENTITY_PROVIDER == 'local' else None)
+    if isinstance(client, LocalCognito):
+        return client.jwks()
+    return jwks.load_jwks(url, timeout)
+
+
+def key_store(jwks_url, **kwargs):
+    """A JWKSKeyStore that follows the current provider: LocalCognito's keys or the JWKS at jwks_url."""
+    return jwks.JWKSKeyStore(jwks_url, loader=load_jwks, **kwargs)
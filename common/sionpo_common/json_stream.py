@@ -0,0 +1,28 @@
+import io
+import json
+
+CHUNK_ROWS = 500
+
+
+def iter_json_array(cursor, chunk_rows=CHUNK_ROWS):
+    """Yield the cursor's rows as a JSON array, chunk_rows at a time.
+
+    The output is byte-for-byte what json.dumps(cursor.fetchall(), default=str) returns.
+    """
+    yield '['
+    first = True
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            break
+        encoded = ', '.join(json.dumps(row, default=str) for row in rows)
+        yield encoded if first else ', ' + encoded
+        first = False
+    yield ']'
+
+
+def dumps_rows(cursor, chunk_rows=CHUNK_ROWS):
+    buffer = io.StringIO()
+    for chunk in iter_json_array(cursor, chunk_rows):
+        buffer.write(chunk)
+    return buffer.getvalue()
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+
+import jwt
+
+JWKS_TTL = 3600
+# Evita golpear el endpoint JWKS con tokens de kid desconocido
+MIN_REFRESH_INTERVAL = 30
+TOKEN_CACHE_SIZE = 1024
+
+
+def load_jwks(url, timeout=5):
+    # urllib entiende https:// y file://, así se puede probar con un JWKS local
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+class JWKSKeyStore:
+    """Signing keys by kid, refreshed on TTL expiry or when an unknown kid shows up."""
+
+    def __init__(self, jwks_url, ttl=JWKS_TTL, min_refresh_interval=MIN_REFRESH_INTERVAL,
+                 loader=load_jwks, clock=time.monotonic):
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.loader = loader
+        self.clock = clock
+        self.fetches = 0
+        self._keys = {}
+        self._fetched_at = None
+        self._lock = threading.Lock()
+
+    def get_signing_key(self, kid):
+        with self._lock:
+            now = self.clock()
+            expired = self._fetched_at is None or now - self._fetched_at >= self.ttl
+            unknown = kid not in self._keys
+            may_refresh = self._fetched_at is None or now - self._fetched_at >= self.min_refresh_interval
+            if expired or (unknown and may_refresh):
+                self._refresh(now)
+            key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unable to find a signing key that matches: {kid}")
+        return key
+
+    def _refresh(self, now):
+        jwks = self.loader(self.jwks_url)
+        self.fetches += 1
+        keys = {}
+        for jwk in jwks.get('keys', []):
+            if jwk.get('use', 'sig') == 'sig' and 'kid' in jwk:
+                keys[jwk['kid']] = jwt.PyJWK(jwk).key
+        self._keys = keys
+        self._fetched_at = now
+
+
+class TokenCache:
+    """Bounded LRU of already-verified token claims, keyed by token hash and valid until exp."""
+
+    def __init__(self, max_size=TOKEN_CACHE_SIZE, clock=time.time):
+        self.max_size = max_size
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            claims, exp = entry
+            if exp is not None and exp <= self.clock():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return dict(claims)
+
+    def put(self, token, claims):
+        exp = claims.get('exp')
+        if exp is None:
+            # Sin exp no hay un límite seguro para reutilizar la verificación
+            return
+        with self._lock:
+            self._entries[self._digest(token)] = (dict(claims), exp)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _digest(token):
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def verify(token, key_store, audience, token_cache=None, algorithms=("RS256",)):
+    if token_cache is not None:
+        claims = token_cache.get(token)
+        if claims is not None:
+            return claims
+
+    kid = jwt.get_unverified_header(token).get('kid')
+    signing_key = key_store.get_signing_key(kid)
+    claims = jwt.decode(token, signing_key, algorithms=list(algorithms), audience=audience)
+
+    if token_cache is not None:
+        token_cache.put(token, claims)
+    return claims
@@ -0,0 +1,44 @@
+import base64
+import binascii
+import json
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 100
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key, default=str).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token):
+    try:
+        return json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_page(params, default_limit=DEFAULT_LIMIT, max_limit=MAX_LIMIT):
+    """Return (limit, after_key) for a paginated request, or None when no page was asked for."""
+    params = params or {}
+    if 'limit' not in params and 'cursor' not in params:
+        return None
+
+    try:
+        limit = int(params.get('limit', default_limit))
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1 or limit > max_limit:
+        raise ValueError(f"limit must be between 1 and {max_limit}")
+
+    cursor = params.get('cursor')
+    after_key = decode_cursor(cursor) if cursor else None
+    return limit, after_key
+
+
+def build_page(rows, columns, limit, key_column):
+    """Turn a LIMIT limit + 1 result into {"items", "next_cursor"}."""
+    items = [dict(zip(columns, row)) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(items[-1][key_column])
+    return {"items": items, "next_cursor": next_cursor}
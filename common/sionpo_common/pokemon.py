@@ -0,0 +1,103 @@
+import json
+
+POKEMON_COLUMNS = (
+    'id_pokemon',
+    'pokemon_name',
+    'abilities',
+    'types',
+    'description',
+    'evolution_conditions',
+    'image',
+    'likes_count',
+    'dislikes_count',
+    'creation_update_date',
+    'fk_id_user_creator',
+)
+
+
+def parse_fields(params, required=()):
+    """Validate ?fields= against POKEMON_COLUMNS; None means every column."""
+    raw = (params or {}).get('fields')
+    if raw is None:
+        return None
+
+    fields = []
+    for field in raw.split(','):
+        field = field.strip()
+        if not field:
+            continue
+        if field not in POKEMON_COLUMNS:
+            raise ValueError(f"Unknown field: {field}")
+        if field not in fields:
+            fields.append(field)
+    if not fields:
+        raise ValueError("fields cannot be empty")
+
+    for field in required:
+        if field not in fields:
+            fields.insert(0, field)
+    return fields
+
+
+# Borrado lógico: las lecturas solo ven filas sin deleted_at (idx_pokemon_deleted_at, migrations/007)
+NOT_DELETED = "deleted_at IS NULL"
+
+# update_publication solo acepta estas columnas: la llave no cambia y deleted_at va por /delete_pokemon
+UPDATABLE_COLUMNS = tuple(column for column in POKEMON_COLUMNS if column != 'id_pokemon')
+
+
+def select_list(fields, alias=None):
+    # Solo nombres de POKEMON_COLUMNS llegan aquí, así que se pueden interpolar.
+    # Sin fields se listan las columnas públicas en lugar de * para no exponer deleted_at.
+    prefix = f"{alias}." if alias else ''
+    return ', '.join(prefix + field for field in (fields or POKEMON_COLUMNS))
+
+
+def not_deleted(alias=None):
+    return f"{alias}.{NOT_DELETED}" if alias else NOT_DELETED
+
+
+REQUIRED_PUBLICATION_FIELDS = ['pokemon_name', 'abilities', 'types', 'description', 'image']
+
+PUBLICATION_INSERT_COLUMNS = (
+    'pokemon_name', 'abilities', 'types', 'description',
+    'evolution_conditions', 'image', 'likes_count',
+    'dislikes_count', 'creation_update_date', 'id_pokemon', 'fk_id_user_creator',
+)
+
+PUBLICATION_INSERT_SQL = """
+    INSERT INTO Pokemon (
+        pokemon_name, abilities, types, description,
+        evolution_conditions, image, likes_count,
+        dislikes_count, creation_update_date, id_pokemon, fk_id_user_creator
+    ) VALUES (
+        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+    )
+"""
+
+
+class UnprocessableError(ValueError):
+    pass
+
+
+def publication_values(body):
+    """Apply the /add_pokemon field rules and return the values in PUBLICATION_INSERT_COLUMNS order.
+
+    Raises ValueError for missing fields and UnprocessableError for invalid counters.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("Publication must be a JSON object")
+    remaining_fields = [field for field in PUBLICATION_INSERT_COLUMNS if field not in REQUIRED_PUBLICATION_FIELDS]
+    for field in REQUIRED_PUBLICATION_FIELDS + remaining_fields:
+        if field not in body:
+            raise ValueError(f"Missing required field: {field}")
+    for field in ('id_pokemon', 'likes_count', 'dislikes_count'):
+        if not isinstance(body[field], int) or isinstance(body[field], bool):
+            raise ValueError(f"{field} must be an integer")
+
+    for field in ('likes_count', 'dislikes_count'):
+        if body[field] < 0:
+            raise UnprocessableError(f"{field} cannot be negative")
+
+    values = dict(body, abilities=json.dumps(body['abilities']), types=json.dumps(body['types']))
+    return tuple(values[column] for column in PUBLICATION_INSERT_COLUMNS)
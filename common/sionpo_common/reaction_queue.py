@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+import uuid
+
+# https://sqs... -> SQS, file:///ruta -> cola en fichero (JSON por línea), memory:// -> en proceso
+REACTION_QUEUE_URL = os.environ.get('REACTION_QUEUE_URL', 'memory://')
+SQS_BATCH_SIZE = 10
+
+
+class MemoryQueue:
+    """In-process stand-in for SQS, used by tests and local runs."""
+
+    def __init__(self):
+        self._messages = []
+        self._lock = threading.Lock()
+
+    def send(self, message):
+        with self._lock:
+            self._messages.append({"messageId": str(uuid.uuid4()), "body": json.dumps(message)})
+
+    def receive(self, max_messages=SQS_BATCH_SIZE):
+        """Remove and return up to max_messages records shaped like SQS event records."""
+        with self._lock:
+            batch = self._messages[:max_messages]
+            del self._messages[:max_messages]
+        return batch
+
+    def __len__(self):
+        return len(self._messages)
+
+
+class FileQueue:
+    """Append-only JSON-lines file, so an API process and a consumer process can share a queue locally."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, message):
+        record = {"messageId": str(uuid.uuid4()), "body": json.dumps(message)}
+        with self._lock, open(self.path, 'a', encoding='utf-8') as queue_file:
+            queue_file.write(json.dumps(record) + "\n")
+
+    def receive(self, max_messages=SQS_BATCH_SIZE):
+        with self._lock:
+            if not os.path.exists(self.path):
+                return []
+            with open(self.path, encoding='utf-8') as queue_file:
+                lines = [line for line in queue_file if line.strip()]
+            with open(self.path, 'w', encoding='utf-8') as queue_file:
+                queue_file.writelines(lines[max_messages:])
+        return [json.loads(line) for line in lines[:max_messages]]
+
+    def __len__(self):
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding='utf-8') as queue_file:
+            return sum(1 for line in queue_file if line.strip())
+
+
+class SQSQueue:
+
+    def __init__(self, queue_url, client=None):
+        self.queue_url = queue_url
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+            self._client = boto3.client('sqs')
+        return self._client
+
+    def send(self, message):
+        self.client.send_message(QueueUrl=self.queue_url, MessageBody=json.dumps(message))
+
+
+def from_url(url):
+    if url.startswith('memory://'):
+        return MemoryQueue()
+    if url.startswith('file://'):
+        return FileQueue(url[len('file://'):])
+    return SQSQueue(url)
+
+
+_queue = None
+
+
+def get_queue():
+    global _queue
+    if _queue is None:
+        _queue = from_url(REACTION_QUEUE_URL)
+    return _queue
+
+
+def set_queue(queue):
+    """Replace the process queue (tests and local runs); returns the previous one."""
+    global _queue
+    previous, _queue = _queue, queue
+    return previous
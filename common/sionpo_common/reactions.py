@@ -0,0 +1,287 @@
+import os
+import random
+
+from sionpo_common import trending, versions
+
+INTERACTION_TYPES = ('like', 'dislike', 'favorite')
+
+# Los favoritos no tienen contador en Pokemon
+COUNTER_COLUMNS = {
+    'like': 'likes_count',
+    'dislike': 'dislikes_count',
+}
+
+# >1 reparte los incrementos entre N filas de PokemonCounterShard por Pokemon (migrations/004) y los
+# puntajes trending entre N filas de TrendingScoreShard (migrations/009); fold_counters los suma
+# periódicamente a Pokemon.likes_count / dislikes_count y a TrendingScore
+COUNTER_SHARDS = int(os.environ.get('COUNTER_SHARDS', '1'))
+
+SHARD_UPSERT_SQL = (
+    "INSERT INTO PokemonCounterShard (id_pokemon, slot, likes_count, dislikes_count) "
+    "VALUES (%s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE likes_count = likes_count + VALUES(likes_count), "
+    "dislikes_count = dislikes_count + VALUES(dislikes_count)"
+)
+
+# Clave natural de Interactions (UNIQUE uq_interaction, ver migrations/003)
+NATURAL_KEY_FIELDS = ('Fk_id_user', 'Fk_id_pokemon', 'interaction_type')
+
+
+def upsert_sql(rows=1):
+    values = ", ".join(["(%s, %s, %s)"] * rows)
+    return (
+        "INSERT INTO Interactions (Fk_id_user, Fk_id_pokemon, interaction_type) "
+        f"VALUES {values} "
+        "ON DUPLICATE KEY UPDATE id_interaction = id_interaction"
+    )
+
+
+UPSERT_SQL = upsert_sql()
+
+DELETE_BY_KEY_SQL = (
+    "DELETE FROM Interactions "
+    "WHERE Fk_id_user = %s AND Fk_id_pokemon = %s AND interaction_type = %s"
+)
+
+
+class PokemonDeletedError(ValueError):
+    """The reaction targets a soft-deleted Pokemon, which purge_publications is about to remove."""
+
+
+def deleted_pokemon(cursor, ids):
+    """The subset of ids whose Pokemon is soft-deleted, with one primary key lookup."""
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return set()
+    cursor.execute(
+        f"SELECT id_pokemon FROM Pokemon WHERE id_pokemon IN ({', '.join(['%s'] * len(ids))}) "
+        "AND deleted_at IS NOT NULL",
+        ids
+    )
+    # Los ids del cuerpo pueden venir como texto; se devuelven tal como se recibieron
+    found = {str(row[0]) for row in cursor.fetchall()}
+    return {id_pokemon for id_pokemon in ids if str(id_pokemon) in found}
+
+
+def parse(body):
+    """Validate a reaction payload and return its natural key tuple."""
+    if not isinstance(body, dict):
+        raise ValueError("Invalid reaction")
+    fk_id_user, fk_id_pokemon, interaction_type = (body.get(field) for field in NATURAL_KEY_FIELDS)
+    if not fk_id_user or not fk_id_pokemon or not interaction_type:
+        raise ValueError("Missing required fields")
+    if interaction_type not in INTERACTION_TYPES:
+        raise ValueError("Invalid interaction_type")
+    return fk_id_user, fk_id_pokemon, interaction_type
+
+
+def adjust_counter(cursor, id_pokemon, interaction_type, delta):
+    """Atomically add delta to the Pokemon counter for interaction_type; call inside the write transaction.
+
+    Returns the number of Pokemon rows updated (0 for interaction types without a counter).
+    """
+    column = COUNTER_COLUMNS.get(interaction_type)
+    if column is None or delta == 0:
+        return 0
+    if COUNTER_SHARDS > 1:
+        return add_to_shard(cursor, id_pokemon, {column: delta})
+
+    if delta > 0:
+        sql = f"UPDATE Pokemon SET {column} = {column} + %s WHERE id_pokemon = %s"
+        params = (delta, id_pokemon)
+    else:
+        # Nunca por debajo de cero aunque el contador se haya desalineado
+        sql = f"UPDATE Pokemon SET {column} = GREATEST({column}, %s) - %s WHERE id_pokemon = %s"
+        params = (-delta, -delta, id_pokemon)
+    updated = cursor.execute(sql, params)
+    # Los contadores forman parte de la representación de Pokemon (ETag y caché de respuestas).
+    # Solo la versión de la fila: la de tabla serializaría todas las reacciones (ver get_data_all_pokemon)
+    versions.bump(cursor, 'Pokemon', id_pokemon, table=False)
+    return updated
+
+
+def add_to_shard(cursor, id_pokemon, deltas):
+    """Add {column: delta} to a random shard row so concurrent writers rarely wait on the same row lock.
+
+    Shards hold pending deltas (possibly negative); the Pokemon row and CatalogVersion only
+    change when fold_counters folds them in.
+    """
+    slot = random.randrange(COUNTER_SHARDS)
+    return cursor.execute(SHARD_UPSERT_SQL, (
+        id_pokemon,
+        slot,
+        deltas.get('likes_count', 0),
+        deltas.get('dislikes_count', 0),
+    ))
+
+
+def pending_counts(cursor, id_pokemon):
+    """Sum of not-yet-folded shard deltas for one Pokemon: at most COUNTER_SHARDS rows of one index range."""
+    cursor.execute(
+        "SELECT COALESCE(SUM(likes_count), 0), COALESCE(SUM(dislikes_count), 0) "
+        "FROM PokemonCounterShard WHERE id_pokemon = %s",
+        (id_pokemon,)
+    )
+    row = cursor.fetchone() or (0, 0)
+    return {'likes_count': int(row[0]), 'dislikes_count': int(row[1])}
+
+
+def with_pending_counts(record, pending):
+    """Overlay shard deltas on a Pokemon dict that contains the counter columns."""
+    for column, delta in pending.items():
+        if column in record and delta:
+            record[column] = max(int(record[column]) + delta, 0)
+    return record
+
+
+def add(cursor, fk_id_user, fk_id_pokemon, interaction_type):
+    """Insert the interaction unless it already exists; returns True if a row was created.
+
+    The no-op UPDATE leaves the row untouched, so MySQL reports 0 affected rows for a
+    duplicate and the counter is only incremented once per (user, pokemon, type).
+    Raises PokemonDeletedError for a soft-deleted Pokemon.
+    """
+    if deleted_pokemon(cursor, [fk_id_pokemon]):
+        raise PokemonDeletedError("Pokemon not found")
+    created = cursor.execute(UPSERT_SQL, (fk_id_user, fk_id_pokemon, interaction_type)) == 1
+    if created:
+        adjust_counter(cursor, fk_id_pokemon, interaction_type, 1)
+        trending.record(cursor, fk_id_pokemon, interaction_type, shards=COUNTER_SHARDS)
+    return created
+
+
+def remove(cursor, fk_id_user, fk_id_pokemon, interaction_type):
+    """Delete the interaction by its natural key; returns True if a row was deleted.
+
+    Its trending contribution is subtracted as well.
+    """
+    key = (fk_id_user, fk_id_pokemon, interaction_type)
+    scores = trending_scores(cursor, [key])
+    deleted = cursor.execute(DELETE_BY_KEY_SQL, key) > 0
+    if deleted:
+        adjust_counter(cursor, fk_id_pokemon, interaction_type, -1)
+        trending.retract_scores(cursor, scores, COUNTER_SHARDS)
+    return deleted
+
+
+def add_batch(cursor, keys):
+    """Write many (user, pokemon, type) reactions coalesced per Pokemon; call inside the write transaction.
+
+    Duplicates inside the batch collapse to one row. Each Pokemon gets one multi-row INSERT per
+    interaction type and a single counter UPDATE, and the batch bumps the row versions once.
+    Reactions to soft-deleted Pokemon are dropped. Returns {id_pokemon: {interaction_type: rows created}}.
+    """
+    keys = list(keys)
+    deleted = deleted_pokemon(cursor, [key[1] for key in keys])
+    grouped = {}
+    for fk_id_user, fk_id_pokemon, interaction_type in keys:
+        if fk_id_pokemon in deleted:
+            continue
+        # dict como conjunto ordenado de usuarios
+        grouped.setdefault(fk_id_pokemon, {}).setdefault(interaction_type, {})[fk_id_user] = None
+
+    created = {}
+    deltas = {}
+    for fk_id_pokemon, by_type in grouped.items():
+        created[fk_id_pokemon] = {}
+        for interaction_type, users in by_type.items():
+            params = [value for user in users for value in (user, fk_id_pokemon, interaction_type)]
+            created[fk_id_pokemon][interaction_type] = cursor.execute(upsert_sql(len(users)), params) or 0
+
+        increments = [
+            (COUNTER_COLUMNS[interaction_type], count)
+            for interaction_type, count in created[fk_id_pokemon].items()
+            if count and interaction_type in COUNTER_COLUMNS
+        ]
+        deltas[fk_id_pokemon] = dict(increments)
+
+    apply_counter_deltas(cursor, deltas)
+    trending.record_scores(cursor, trending.scores_for(created), COUNTER_SHARDS)
+    return created
+
+
+def key_in_clause(count):
+    """Row-constructor IN over the uq_interaction columns, answered from the unique index."""
+    return "(Fk_id_user, Fk_id_pokemon, interaction_type) IN (" + ", ".join(["(%s, %s, %s)"] * count) + ")"
+
+
+def existing_keys(cursor, keys, for_update=False):
+    """Return the subset of (user, pokemon, type) keys present in Interactions, in one query."""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return set()
+    cursor.execute(
+        "SELECT Fk_id_user, Fk_id_pokemon, interaction_type FROM Interactions "
+        f"WHERE {key_in_clause(len(keys))}" + (" FOR UPDATE" if for_update else ""),
+        [value for key in keys for value in key]
+    )
+    return {tuple(row) for row in cursor.fetchall()}
+
+
+def trending_scores(cursor, keys):
+    """{id_pokemon: log_score} that the existing keys added to the trending ranking; locks their rows.
+
+    Read before deleting them: the contribution depends on created_at. Keys whose type does not
+    count for trending are skipped without a query.
+    """
+    keys = [key for key in dict.fromkeys(keys) if key[2] in trending.WEIGHTS]
+    if not keys:
+        return {}
+    cursor.execute(
+        "SELECT Fk_id_pokemon, interaction_type, UNIX_TIMESTAMP(created_at) FROM Interactions "
+        f"WHERE {key_in_clause(len(keys))} FOR UPDATE",
+        [value for key in keys for value in key]
+    )
+    scores = {}
+    for id_pokemon, interaction_type, created_at in cursor.fetchall():
+        score = trending.log_weight(interaction_type, float(created_at))
+        scores[id_pokemon] = trending.log_add(scores.get(id_pokemon), score)
+    return scores
+
+
+def delete_many(cursor, keys):
+    """Delete many interactions by natural key with one statement and retract their trending scores.
+
+    Returns rows deleted.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return 0
+    scores = trending_scores(cursor, keys)
+    deleted = cursor.execute(
+        f"DELETE FROM Interactions WHERE {key_in_clause(len(keys))}",
+        [value for key in keys for value in key]
+    )
+    trending.retract_scores(cursor, scores, COUNTER_SHARDS)
+    return deleted
+
+
+def apply_counter_deltas(cursor, deltas):
+    """Apply {id_pokemon: {column: delta}} with one counter write per Pokemon and one row-version bump.
+
+    Returns the ids whose counters changed.
+    """
+    changed = []
+    for id_pokemon, columns in deltas.items():
+        columns = {column: delta for column, delta in columns.items() if delta}
+        if not columns:
+            continue
+        changed.append(id_pokemon)
+        if COUNTER_SHARDS > 1:
+            add_to_shard(cursor, id_pokemon, columns)
+            continue
+
+        assignments = []
+        params = []
+        for column, delta in columns.items():
+            if delta > 0:
+                assignments.append(f"{column} = {column} + %s")
+                params.append(delta)
+            else:
+                assignments.append(f"{column} = GREATEST({column}, %s) - %s")
+                params.extend([-delta, -delta])
+        cursor.execute(f"UPDATE Pokemon SET {', '.join(assignments)} WHERE id_pokemon = %s", params + [id_pokemon])
+
+    if changed and COUNTER_SHARDS <= 1:
+        versions.bump(cursor, 'Pokemon', *changed, table=False)
+    return changed
@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', '60'))
+METRICS_INTERVAL = 60
+
+
+class ResponseCache:
+    """LRU cache of serialized response bodies, bounded by bytes and validated by version."""
+
+    def __init__(self, max_bytes=RESPONSE_CACHE_MAX_BYTES, ttl=RESPONSE_CACHE_TTL, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, body, stored_at = entry
+                if entry_version == version and self.clock() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return body
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key, version, body):
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (version, body, self.clock())
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "bytes": self.bytes,
+            "entries": len(self._entries),
+        }
+
+    def _remove(self, key):
+        _, body, _ = self._entries.pop(key)
+        self.bytes -= len(body)
+
+
+_cache = ResponseCache()
+_last_metrics = None
+
+
+def cache_key(*parts):
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+def get(key, version):
+    return _cache.get(key, version)
+
+
+def put(key, version, body):
+    _cache.put(key, version, body)
+
+
+def clear():
+    global _last_metrics
+    _cache.clear()
+    _last_metrics = None
+
+
+def stats():
+    return _cache.stats()
+
+
+def emit_metrics(function_name):
+    """Log cache stats in CloudWatch Embedded Metric Format, at most once per METRICS_INTERVAL."""
+    global _last_metrics
+    now = time.monotonic()
+    if _last_metrics is not None and now - _last_metrics < METRICS_INTERVAL:
+        return
+    _last_metrics = now
+
+    current = stats()
+    print(json.dumps({
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": "Sionpo",
+                "Dimensions": [["FunctionName"]],
+                "Metrics": [
+                    {"Name": "ResponseCacheHitRatio", "Unit": "None"},
+                    {"Name": "ResponseCacheBytes", "Unit": "Bytes"},
+                ],
+            }],
+        },
+        "FunctionName": function_name,
+        "ResponseCacheHitRatio": current["hit_ratio"],
+        "ResponseCacheBytes": current["bytes"],
+    }))
@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+
+# Segundos que un secreto se sirve sin volver a Secrets Manager
+SECRETS_CACHE_TTL = int(os.environ.get('SECRETS_CACHE_TTL', '300'))
+# Segundos extra en los que se sirve el valor viejo mientras se refresca en segundo plano
+SECRETS_CACHE_MAX_STALE = int(os.environ.get('SECRETS_CACHE_MAX_STALE', '3600'))
+
+
+class SecretCache:
+    """Process-wide cache of Secrets Manager values with stale-while-revalidate."""
+
+    def __init__(self, ttl=SECRETS_CACHE_TTL, max_stale=SECRETS_CACHE_MAX_STALE, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, secret_name, loader):
+        with self._lock:
+            entry = self._entries.get(secret_name)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = self.clock() - fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                return value
+            if age < self.ttl + self.max_stale:
+                self.hits += 1
+                self._refresh_in_background(secret_name, loader)
+                return value
+
+        self.misses += 1
+        return self._load(secret_name, loader)
+
+    def invalidate(self, secret_name):
+        with self._lock:
+            self._entries.pop(secret_name, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._refreshing.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, secret_name, loader):
+        value = loader()
+        with self._lock:
+            self._entries[secret_name] = (value, self.clock())
+        return value
+
+    def _refresh_in_background(self, secret_name, loader):
+        with self._lock:
+            if secret_name in self._refreshing:
+                return
+            self._refreshing.add(secret_name)
+
+        def refresh():
+            try:
+                self._load(secret_name, loader)
+            except Exception:
+                # Se sigue sirviendo el valor viejo; el siguiente get vuelve a intentarlo
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(secret_name)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+_cache = SecretCache()
+
+
+def get_secret(secret_name, loader, refresh=False):
+    if refresh:
+        _cache.invalidate(secret_name)
+    return _cache.get(secret_name, loader)
+
+
+def invalidate(secret_name):
+    _cache.invalidate(secret_name)
+
+
+def clear():
+    _cache.clear()
+
+
+def stats():
+    return {"hits": _cache.hits, "misses": _cache.misses}
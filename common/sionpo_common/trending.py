@@ -0,0 +1,165 @@
+import math
+import os
+import random
+import time
+
+# Puntaje "hot" con decaimiento exponencial: cada reacción vale weight * 2^((t - EPOCH) / HALF_LIFE).
+# Se guarda en espacio logarítmico (log-sum-exp), así el orden no cambia con el tiempo, no hay
+# que reescribir filas para envejecerlas y el valor no desborda un DOUBLE.
+EPOCH = 1704067200  # 2024-01-01T00:00:00Z
+HALF_LIFE_HOURS = float(os.environ.get('TRENDING_HALF_LIFE_HOURS', '24'))
+# Reacciones más viejas que esto pesan menos de 2^-10 y el rebuild las ignora
+WINDOW_HALF_LIVES = 10
+
+WEIGHTS = {
+    'like': 1.0,
+    'favorite': 2.0,
+}
+
+LOG_ADD_SQL = "score = GREATEST(score, VALUES(score)) + LN(1 + EXP(-ABS(score - VALUES(score))))"
+
+UPSERT_SQL_TEMPLATE = (
+    "INSERT INTO TrendingScore (id_pokemon, score) VALUES {values} "
+    f"ON DUPLICATE KEY UPDATE {LOG_ADD_SQL}"
+)
+
+# Con shards > 1 las reacciones suman en TrendingScoreShard (migrations/009) y fold_counters
+# lo pliega en TrendingScore, igual que los contadores
+SHARD_UPSERT_SQL_TEMPLATE = (
+    "INSERT INTO TrendingScoreShard (id_pokemon, slot, score) VALUES {values} "
+    f"ON DUPLICATE KEY UPDATE {LOG_ADD_SQL}"
+)
+
+# Quitar una reacción resta su aporte: log(exp(score) - exp(x)). Si no queda nada (redondeo de
+# created_at o puntaje desalineado) el puntaje cae a MIN_FRACTION de lo que era en vez de fallar con LN(0)
+MIN_FRACTION = 1e-12
+
+SUBTRACT_SQL = (
+    "UPDATE TrendingScore SET score = score + LN(GREATEST(1 - EXP(LEAST(%s - score, 0)), %s)) "
+    "WHERE id_pokemon = %s"
+)
+
+
+def _rate():
+    return math.log(2) / (HALF_LIFE_HOURS * 3600)
+
+
+def log_weight(interaction_type, timestamp=None):
+    """Log-space contribution of one reaction, or None for types that do not count."""
+    weight = WEIGHTS.get(interaction_type)
+    if weight is None:
+        return None
+    if timestamp is None:
+        timestamp = time.time()
+    return math.log(weight) + (timestamp - EPOCH) * _rate()
+
+
+def log_add(a, b):
+    """log(exp(a) + exp(b)) without overflow."""
+    if a is None:
+        return b
+    return max(a, b) + math.log1p(math.exp(-abs(a - b)))
+
+
+def log_sub(a, b):
+    """log(exp(a) - exp(b)), floored at MIN_FRACTION of exp(a) exactly like SUBTRACT_SQL."""
+    return a + math.log(max(1 - math.exp(min(b - a, 0)), MIN_FRACTION))
+
+
+def current_score(log_score, now=None):
+    """Decayed score as of now, in "reactions right now" units."""
+    if now is None:
+        now = time.time()
+    return math.exp(log_score - (now - EPOCH) * _rate())
+
+
+def record(cursor, id_pokemon, interaction_type, timestamp=None, shards=1):
+    """Add one reaction to the Pokemon's trending score; call inside the write transaction."""
+    score = log_weight(interaction_type, timestamp)
+    if score is None:
+        return 0
+    return record_scores(cursor, {id_pokemon: score}, shards)
+
+
+def record_scores(cursor, scores, shards=1):
+    """Merge {id_pokemon: log_score} with one multi-row upsert.
+
+    shards > 1 writes to a random TrendingScoreShard slot instead of TrendingScore, so concurrent
+    reactions on the same Pokemon rarely wait on one row lock.
+    """
+    if not scores:
+        return 0
+    if shards > 1:
+        slot = random.randrange(shards)
+        values = ", ".join(["(%s, %s, %s)"] * len(scores))
+        params = [value for id_pokemon, score in scores.items() for value in (id_pokemon, slot, score)]
+        return cursor.execute(SHARD_UPSERT_SQL_TEMPLATE.format(values=values), params)
+    values = ", ".join(["(%s, %s)"] * len(scores))
+    params = [value for item in scores.items() for value in item]
+    return cursor.execute(UPSERT_SQL_TEMPLATE.format(values=values), params)
+
+
+def fold_shards(cursor, ids):
+    """Merge the TrendingScoreShard rows of ids into TrendingScore and delete them; returns the folded ids.
+
+    Call inside the fold transaction: the shard rows stay locked until it commits.
+    """
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(
+        f"SELECT id_pokemon, score FROM TrendingScoreShard WHERE id_pokemon IN ({placeholders}) FOR UPDATE",
+        ids
+    )
+    scores = {}
+    for id_pokemon, score in cursor.fetchall():
+        scores[id_pokemon] = log_add(scores.get(id_pokemon), score)
+    if scores:
+        record_scores(cursor, scores)
+        cursor.execute(f"DELETE FROM TrendingScoreShard WHERE id_pokemon IN ({placeholders})", ids)
+    return list(scores)
+
+
+def retract_scores(cursor, scores, shards=1):
+    """Subtract {id_pokemon: log_score} of removed reactions, so add/remove loops cannot inflate the ranking.
+
+    With shards > 1 the pending shard rows are folded first, so the subtraction sees every recorded reaction.
+    """
+    if not scores:
+        return 0
+    ids = sorted(scores)
+    if shards > 1:
+        fold_shards(cursor, ids)
+    for id_pokemon in ids:
+        cursor.execute(SUBTRACT_SQL, (scores[id_pokemon], MIN_FRACTION, id_pokemon))
+    return len(ids)
+
+
+def scores_for(created, timestamp=None):
+    """{id_pokemon: {interaction_type: count}} -> {id_pokemon: log_score} for record_scores."""
+    scores = {}
+    for id_pokemon, counts in created.items():
+        for interaction_type, count in counts.items():
+            score = log_weight(interaction_type, timestamp)
+            if score is not None and count > 0:
+                scores[id_pokemon] = log_add(scores.get(id_pokemon), score + math.log(count))
+    return scores
+
+
+def top(cursor, limit):
+    """Top limit Pokemon by trending score: a backward scan of idx_trending_score."""
+    cursor.execute(
+        "SELECT t.id_pokemon, t.score, p.pokemon_name, p.image FROM TrendingScore t "
+        "JOIN Pokemon p ON p.id_pokemon = t.id_pokemon "
+        "WHERE p.deleted_at IS NULL "
+        "ORDER BY t.score DESC LIMIT %s",
+        (limit,)
+    )
+    now = time.time()
+    return [
+        {
+            "id_pokemon": id_pokemon,
+            "pokemon_name": pokemon_name,
+            "image": image,
+            "score": round(current_score(score, now), 4),
+        }
+        for id_pokemon, score, pokemon_name, image in cursor.fetchall()
+    ]
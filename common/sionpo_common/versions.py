@@ -0,0 +1,66 @@
+import hashlib
+import json
+
+TABLE_ROW = 0
+
+
+def read_version(cursor, table_name, row_id=TABLE_ROW):
+    cursor.execute(
+        "SELECT version FROM CatalogVersion WHERE table_name = %s AND row_id = %s",
+        (table_name, row_id)
+    )
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def bump(cursor, table_name, *row_ids, table=True):
+    """Bump the table version and each given row version; call inside the write transaction.
+
+    table=False bumps only the row versions, so hot writers do not all queue on the table row.
+    """
+    keys = ([(table_name, TABLE_ROW)] if table else []) + [(table_name, row_id) for row_id in row_ids]
+    if not keys:
+        return
+    values = ", ".join(["(%s, %s, 1)"] * len(keys))
+    cursor.execute(
+        f"INSERT INTO CatalogVersion (table_name, row_id, version) VALUES {values} "
+        "ON DUPLICATE KEY UPDATE version = version + 1",
+        tuple(value for key in keys for value in key)
+    )
+
+
+def make_etag(version, *variant):
+    # La misma versión puede tener varias representaciones (fields, limit, cursor...)
+    digest = hashlib.sha1(json.dumps(variant, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def get_header(event, name):
+    headers = event.get('headers') or {}
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def not_modified(event, etag):
+    if_none_match = get_header(event, 'If-None-Match')
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        # If-None-Match usa comparación débil
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == '*' or tag == etag:
+            return True
+    return False
+
+
+def not_modified_response(etag):
+    return {
+        "statusCode": 304,
+        "headers": {"ETag": etag},
+        "body": ""
+    }
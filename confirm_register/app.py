@@ -1,13 +1,13 @@
 import json
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
-import hmac
-import hashlib
-import base64
+from sionpo_common import identity, secret_cache
 
+SECRET_NAME = 'cognitoKeys'
 
-def get_secret():
-    secret_name = 'cognitoKeys'
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -66,11 +66,9 @@ def get_secret():
         })
 
 
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
 
-def get_secret_hash(username, client_id, client_secret):
-    message = username + client_id
-    dig = hmac.new(client_secret.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).digest()
-    return base64.b64encode(dig).decode()
 
 
 def lambda_handler(event, context):
@@ -86,19 +84,42 @@ def lambda_handler(event, context):
         CLIENT_ID = secrets['CLIENT_ID']
         CLIENT_SECRET = secrets['CLIENT_SECRET']
 
-        client = boto3.client('cognito-idp')
+        client = identity.get_client()
 
-        secret_hash = get_secret_hash(username, CLIENT_ID, CLIENT_SECRET)
+        secret_hash = identity.secret_hash(username, CLIENT_ID, CLIENT_SECRET)
 
-        response = client.confirm_sign_up(
-            ClientId=CLIENT_ID,
-            Username=username,
-            ConfirmationCode=confirmation_code,
-            SecretHash=secret_hash,
-        )
+        try:
+            client.confirm_sign_up(
+                ClientId=CLIENT_ID,
+                Username=username,
+                ConfirmationCode=confirmation_code,
+                SecretHash=secret_hash,
+            )
+            already_confirmed = False
+        except ClientError as e:
+            # Repetir la confirmación tras un fallo del grupo: Cognito responde que ya está CONFIRMED
+            if e.response['Error']['Code'] != 'NotAuthorizedException' \
+                    or 'CONFIRMED' not in e.response['Error']['Message']:
+                raise
+            already_confirmed = True
+
+        # Antes lo hacía register_user en serie tras sign_up; aquí va fuera del camino del registro
+        try:
+            if already_confirmed:
+                # Solo completa un usuario sin grupo; no toca los que ya tienen uno
+                identity.ensure_group(client, USER_POOL_ID, username)
+            else:
+                identity.add_user_to_group(client, USER_POOL_ID, username, identity.DEFAULT_GROUP)
+        except ClientError as e:
+            return {
+                'statusCode': 500,
+                'body': json.dumps({'error': f"User account confirmed but group assignment failed: "
+                                             f"{e.response['Error']['Code']}"})
+            }
         return {
             'statusCode': 200,
-            'body': json.dumps({'message': 'User account confirmed successfully'})
+            'body': json.dumps({'message': 'User account already confirmed' if already_confirmed
+                                else 'User account confirmed successfully'})
         }
     except KeyError as e:
         return {
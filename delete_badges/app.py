@@ -2,10 +2,14 @@ import json
 import pymysql
 import boto3
 from botocore.exceptions import ClientError
+from sionpo_common import db, secret_cache
 
+SECRET_NAME = 'sionpoKeys'
+MAX_IDS = 100
 
-def get_secret():
-    secret_name = 'sionpoKeys'
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -24,20 +28,44 @@ def get_secret():
         raise Exception(f"Error retrieving secret: {e.response['Error']['Message']}")
 
 
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def parse_ids(body):
+    """Return the badge ids from {"id_badge": 1} or {"id_badges": [1, 2, 3]}, deduplicated."""
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+    if "id_badges" in body:
+        values = body["id_badges"]
+        if not isinstance(values, list):
+            raise ValueError("id_badges must be a list")
+    elif "id_badge" in body:
+        values = [body["id_badge"]]
+    else:
+        raise ValueError("Missing id_badge in request body")
+    ids = list(dict.fromkeys(db.parse_id(value, "id_badge") for value in values))
+    if not ids:
+        raise ValueError("id_badges cannot be empty")
+    if len(ids) > MAX_IDS:
+        raise ValueError(f"At most {MAX_IDS} badges per request")
+    return ids
+
+
 def lambda_handler(event, context):
     try:
         body = json.loads(event["body"])
-        if "id_badge" not in body:
-            return {
-                "statusCode": 400,
-                "body": json.dumps({"message": "Missing id_badge in request body"})
-            }
-        id_badge = body["id_badge"]
+        ids = parse_ids(body)
     except json.JSONDecodeError as e:
         return {
             "statusCode": 400,
             "body": json.dumps({"message": f"Invalid JSON: {e}"})
         }
+    except ValueError as e:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": str(e)})
+        }
     try:
         secrets = get_secret()
     except Exception as e:
@@ -46,31 +74,22 @@ def lambda_handler(event, context):
             "body": json.dumps({"error": str(e)})
         }
 
-    host = secrets['host']
-    name = secrets['username']
-    password = secrets['password']
-    db_name = "SIONPO"
-
     try:
-        connection = pymysql.connect(
-            host=host,
-            user=name,
-            password=password,
-            db=db_name,
-            connect_timeout=5
-        )
+        connection = db.acquire(secrets, get_secret)
     except pymysql.MySQLError as e:
         return {
             "statusCode": 503,
             "body": json.dumps({"error": f"Database connection error: {e}"})
         }
 
+    placeholders = ", ".join(["%s"] * len(ids))
     try:
+        # Desvincular usuarios y borrar insignias en una sola transacción: o se hace todo o nada
         with connection.cursor() as cursor:
             try:
-                update_users_sql = "UPDATE Users SET fk_id_badge = NULL WHERE fk_id_badge = %s"
-                rows_affected_users = cursor.execute(update_users_sql, (id_badge,))
-                connection.commit()
+                # Rango de idx_users_fk_id_badge (migrations/008), sin recorrer Users
+                update_users_sql = f"UPDATE Users SET fk_id_badge = NULL WHERE fk_id_badge IN ({placeholders})"
+                cursor.execute(update_users_sql, ids)
             except pymysql.MySQLError as e:
                 connection.rollback()
                 return {
@@ -79,8 +98,8 @@ def lambda_handler(event, context):
                 }
 
             try:
-                delete_badge_sql = "DELETE FROM Badges WHERE id_badge = %s"
-                rows_affected_badges = cursor.execute(delete_badge_sql, (id_badge,))
+                delete_badge_sql = f"DELETE FROM Badges WHERE id_badge IN ({placeholders})"
+                rows_affected_badges = cursor.execute(delete_badge_sql, ids)
                 connection.commit()
             except pymysql.MySQLError as e:
                 connection.rollback()
@@ -95,9 +114,10 @@ def lambda_handler(event, context):
                     "body": json.dumps({"error": "Badge not found"})
                 }
 
+            message = "Badge deleted successfully" if len(ids) == 1 else "Badges deleted successfully"
             response = {
                 "statusCode": 200,
-                "body": json.dumps({"message": "Badge deleted successfully"})
+                "body": json.dumps({"message": message, "deleted": rows_affected_badges})
             }
             return response
     except pymysql.MySQLError as e:
@@ -111,3 +131,5 @@ def lambda_handler(event, context):
             "statusCode": 500,
             "body": json.dumps({"error": "An unexpected error occurred"})
         }
+    finally:
+        db.release(connection)
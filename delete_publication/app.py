@@ -1,12 +1,26 @@
 import json
+import os
 import pymysql
 import boto3
 from botocore.exceptions import ClientError
 import jwt
-from jwt import PyJWKClient
+from sionpo_common import db, identity, jwks, secret_cache, versions
 
-def get_secret():
-    secret_name = 'sionpoKeys'
+SECRET_NAME = 'sionpoKeys'
+
+REGION = "us-east-2"
+USERPOOL_ID = os.environ.get('USER_POOL_ID', "us-east-2_NDXZOG7DQ")
+APP_CLIENT_ID = os.environ.get('APP_CLIENT_ID', "5s5c1ofpkq30gkbt61q1hdicfd")
+# JWKS_URL puede apuntar a un archivo (file://...) para pruebas sin red
+JWKS_URL = os.environ.get(
+    'JWKS_URL', f'https://cognito-idp.{REGION}.amazonaws.com/{USERPOOL_ID}/.well-known/jwks.json')
+
+# Se conservan entre invocaciones del mismo contenedor; con IDENTITY_PROVIDER=local usa las claves de LocalCognito
+key_store = identity.key_store(JWKS_URL)
+token_cache = jwks.TokenCache()
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -25,23 +39,13 @@ def get_secret():
         raise Exception(f"Error retrieving secret: {e.response['Error']['Message']}")
 
 
-def verify_token(token):
-    region = "us-east-2"
-    userpool_id = "us-east-2_NDXZOG7DQ"  # Reemplaza con tu User Pool ID
-    app_client_id = "5s5c1ofpkq30gkbt61q1hdicfd"  # Reemplaza con tu App Client ID
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
 
-    jwks_url = f'https://cognito-idp.{region}.amazonaws.com/{userpool_id}/.well-known/jwks.json'
-    jwks_client = PyJWKClient(jwks_url)
 
+def verify_token(token):
     try:
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
-        decoded_token = jwt.decode(
-            token,
-            signing_key.key,
-            algorithms=["RS256"],
-            audience=app_client_id
-        )
-        return decoded_token
+        return jwks.verify(token, key_store, APP_CLIENT_ID, token_cache)
     except jwt.ExpiredSignatureError:
         raise Exception("Token has expired")
     except jwt.InvalidTokenError:
@@ -86,18 +90,8 @@ def lambda_handler(event, context):
             "body": json.dumps({"message": str(e)})
         }
 
-    host = secrets['host']
-    name = secrets['username']
-    password = secrets['password']
-    db_name = "SIONPO"
     try:
-        connection = pymysql.connect(
-            host=host,
-            user=name,
-            password=password,
-            db=db_name,
-            connect_timeout=5
-        )
+        connection = db.acquire(secrets, get_secret)
     except pymysql.OperationalError as e:
         return {
             "statusCode": 503,
@@ -107,8 +101,14 @@ def lambda_handler(event, context):
     try:
         with connection.cursor() as cursor:
             try:
-                delete_publication = "DELETE FROM Pokemon WHERE id_pokemon = %s"
+                # Borrado lógico: purge_publications quita luego las Interactions por bloques y la fila
+                delete_publication = (
+                    "UPDATE Pokemon SET deleted_at = CURRENT_TIMESTAMP "
+                    "WHERE id_pokemon = %s AND deleted_at IS NULL"
+                )
                 rows_affected_publications = cursor.execute(delete_publication, (id_pokemon,))
+                if rows_affected_publications != 0:
+                    versions.bump(cursor, 'Pokemon', id_pokemon)
                 connection.commit()
             except pymysql.MySQLError as e:
                 connection.rollback()
@@ -139,4 +139,4 @@ def lambda_handler(event, context):
             "body": json.dumps({"error": "An unexpected error occurred"})
         }
     finally:
-        connection.close()
+        db.release(connection)
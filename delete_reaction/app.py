@@ -1,12 +1,16 @@
 # DELETE FROM Interactions WHERE id_interaction = %s
+# o por clave natural: WHERE Fk_id_user = %s AND Fk_id_pokemon = %s AND interaction_type = %s
 import json
 import pymysql
 import boto3
 from botocore.exceptions import ClientError
+from sionpo_common import db, reactions, secret_cache
 
+SECRET_NAME = 'sionpoKeys'
 
-def get_secret():
-    secret_name = 'sionpoKeys'
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -25,15 +29,46 @@ def get_secret():
         raise Exception(f"Error retrieving secret: {e.response['Error']['Message']}")
 
 
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def delete_by_id(cursor, id_interaction):
+    # Bloquea la fila para que el contador se descuente una sola vez
+    select_query = (
+        "SELECT Fk_id_pokemon, interaction_type FROM Interactions "
+        "WHERE id_interaction = %s FOR UPDATE"
+    )
+    rows_affected_interaction = cursor.execute(select_query, (id_interaction,))
+    if rows_affected_interaction:
+        interaction = cursor.fetchone()
+        fk_id_pokemon, interaction_type = interaction[0], interaction[1]
+        delete_query = "DELETE FROM Interactions WHERE id_interaction = %s"
+        rows_affected_interaction = cursor.execute(delete_query, (id_interaction,))
+        if rows_affected_interaction:
+            reactions.adjust_counter(cursor, fk_id_pokemon, interaction_type, -1)
+    return rows_affected_interaction
+
+
 def lambda_handler(event, context):
     try:
         body = json.loads(event['body'])
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        natural_key = None
+        id_interaction = body.get('id_interaction')
         if 'id_interaction' not in body:
-            return {
-                "statusCode": 400,
-                "body": json.dumps({"error": "Missing id_interaction in request body"})
-            }
-        id_interaction = body['id_interaction']
+            if not any(field in body for field in reactions.NATURAL_KEY_FIELDS):
+                return {
+                    "statusCode": 400,
+                    "body": json.dumps({"error": "Missing id_interaction in request body"})
+                }
+            natural_key = tuple(body.get(field) for field in reactions.NATURAL_KEY_FIELDS)
+            if not all(natural_key):
+                missing = [field for field, value in zip(reactions.NATURAL_KEY_FIELDS, natural_key) if not value]
+                raise ValueError(f"Missing required fields: {', '.join(missing)}")
+            if natural_key[2] not in reactions.INTERACTION_TYPES:
+                raise ValueError("Invalid interaction_type")
     except (json.JSONDecodeError, ValueError) as e:
         return {
             "statusCode": 400,
@@ -46,18 +81,8 @@ def lambda_handler(event, context):
             "statusCode": 500,
             "body": json.dumps({"error": str(e)})
         }
-    host = secrets['host']
-    name = secrets['username']
-    password = secrets['password']
-    db_name = "SIONPO"
     try:
-        connection = pymysql.connect(
-            host=host,
-            user=name,
-            password=password,
-            db=db_name,
-            connect_timeout=5
-        )
+        connection = db.acquire(secrets, get_secret)
     except pymysql.OperationalError as e:
         return {
             "statusCode": 503,
@@ -66,8 +91,11 @@ def lambda_handler(event, context):
     try:
         with connection.cursor() as cursor:
             try:
-                delete_query = "DELETE FROM Interactions WHERE id_interaction = %s"
-                rows_affected_interaction = cursor.execute(delete_query, (id_interaction,))
+                if natural_key:
+                    # Con la clave natural el tipo y el pokemon ya se conocen: un solo DELETE
+                    rows_affected_interaction = int(reactions.remove(cursor, *natural_key))
+                else:
+                    rows_affected_interaction = delete_by_id(cursor, id_interaction)
                 connection.commit()
             except pymysql.MySQLError as e:
                 connection.rollback()
@@ -96,3 +124,5 @@ def lambda_handler(event, context):
             "statusCode": 500,
             "body": json.dumps({"error": "An unexpected error occurred"})
         }
+    finally:
+        db.release(connection)
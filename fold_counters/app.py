@@ -0,0 +1,123 @@
+import json
+import pymysql
+import boto3
+from botocore.exceptions import ClientError
+from sionpo_common import db, secret_cache, trending, versions
+
+SECRET_NAME = 'sionpoKeys'
+CHUNK_SIZE = 100
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
+    region_name = 'us-east-2'
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+        secret = get_secret_value_response['SecretString']
+        return json.loads(secret)
+    except ClientError as e:
+        raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def pending_pokemon(connection):
+    # Lectura sin bloqueo: solo decide qué Pokemon plegar; ordenados para bloquear siempre en el mismo orden
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT id_pokemon FROM PokemonCounterShard "
+            "WHERE likes_count <> 0 OR dislikes_count <> 0 "
+            "UNION SELECT id_pokemon FROM TrendingScoreShard"
+        )
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+def fold_chunk(connection, ids):
+    """Move the counter and trending shards of ids into Pokemon and TrendingScore in one short transaction.
+
+    Returns the folded ids.
+    """
+    placeholders = ", ".join(["%s"] * len(ids))
+    try:
+        with connection.cursor() as cursor:
+            # Bloquea las filas shard para que ningún incremento concurrente se pierda al ponerlas a cero
+            cursor.execute(
+                "SELECT id_pokemon, likes_count, dislikes_count FROM PokemonCounterShard "
+                f"WHERE id_pokemon IN ({placeholders}) FOR UPDATE",
+                ids
+            )
+            sums = {}
+            for id_pokemon, likes, dislikes in cursor.fetchall():
+                total = sums.setdefault(id_pokemon, [0, 0])
+                total[0] += likes
+                total[1] += dislikes
+            totals = [(id_pokemon, likes, dislikes) for id_pokemon, (likes, dislikes) in sums.items() if likes or dislikes]
+            for id_pokemon, likes, dislikes in totals:
+                cursor.execute(
+                    "UPDATE Pokemon SET "
+                    "likes_count = GREATEST(CAST(likes_count AS SIGNED) + %s, 0), "
+                    "dislikes_count = GREATEST(CAST(dislikes_count AS SIGNED) + %s, 0) "
+                    "WHERE id_pokemon = %s",
+                    (likes, dislikes, id_pokemon)
+                )
+            cursor.execute(
+                "UPDATE PokemonCounterShard SET likes_count = 0, dislikes_count = 0 "
+                f"WHERE id_pokemon IN ({placeholders})",
+                ids
+            )
+            folded = [id_pokemon for id_pokemon, _, _ in totals]
+            if folded:
+                versions.bump(cursor, 'Pokemon', *folded)
+            folded = sorted(set(folded).union(trending.fold_shards(cursor, ids)))
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    return folded
+
+
+def fold(connection, chunk_size=CHUNK_SIZE):
+    """Fold every pending shard delta into Pokemon and TrendingScore, chunk_size Pokemon per transaction."""
+    ids = pending_pokemon(connection)
+    folded = 0
+    for start in range(0, len(ids), chunk_size):
+        folded += len(fold_chunk(connection, ids[start:start + chunk_size]))
+    return folded
+
+
+def lambda_handler(event, context):
+    try:
+        secrets = get_secret()
+        connection = db.acquire(secrets, get_secret)
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": str(e)})
+        }
+
+    try:
+        folded = fold(connection)
+        response = {
+            "statusCode": 200,
+            "body": json.dumps({"folded": folded})
+        }
+    except pymysql.MySQLError as e:
+        response = {
+            "statusCode": 500,
+            "body": json.dumps({"message": f"Database error: {str(e)}"})
+        }
+    finally:
+        db.release(connection)
+
+    return response
@@ -1,11 +1,18 @@
 import json
+import os
+import time
 import pymysql
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
+from sionpo_common import db, json_stream, pagination, pokemon, response_cache, secret_cache, versions
 
+SECRET_NAME = 'sionpoKeys'
+# Lista completa leída con SSCursor y codificada por bloques (memoria constante)
+STREAM_FULL_CATALOG = os.environ.get('STREAM_FULL_CATALOG', 'false').lower() == 'true'
 
-def get_secret():
-    secret_name = 'sionpoKeys'
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -65,14 +72,76 @@ def get_secret():
         })
 
 
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def get_page(params):
+    page = pagination.parse_page(params)
+    if page is not None and page[1] is not None and not isinstance(page[1], int):
+        raise ValueError("Invalid cursor")
+    return page
+
+
+def counters_window():
+    return int(time.time() // max(response_cache.RESPONSE_CACHE_TTL, 1))
+
+
+def fetch_page(cursor, limit, after_id, columns='*'):
+    # Keyset: rango sobre la llave primaria, cada página cuesta lo mismo que la primera
+    if after_id is None:
+        cursor.execute(
+            f"SELECT {columns} FROM Pokemon WHERE {pokemon.NOT_DELETED} ORDER BY id_pokemon LIMIT %s",
+            (limit + 1,)
+        )
+    else:
+        cursor.execute(
+            f"SELECT {columns} FROM Pokemon WHERE {pokemon.NOT_DELETED} AND id_pokemon > %s "
+            "ORDER BY id_pokemon LIMIT %s",
+            (after_id, limit + 1)
+        )
+    rows = cursor.fetchall()
+    columns = [desc[0] for desc in cursor.description]
+    return pagination.build_page(rows, columns, limit, 'id_pokemon')
+
+
+def stream_catalog(connection, columns='*'):
+    with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute(f"SELECT {columns} FROM Pokemon WHERE {pokemon.NOT_DELETED}")
+        return json_stream.dumps_rows(cursor)
+
+
+def read_catalog(connection, page, columns):
+    if page is None and STREAM_FULL_CATALOG:
+        return stream_catalog(connection, columns)
+
+    with connection.cursor() as cursor:
+        if page is None:
+            cursor.execute(f"SELECT {columns} FROM Pokemon WHERE {pokemon.NOT_DELETED}")
+            result = cursor.fetchall()
+        else:
+            result = fetch_page(cursor, *page, columns)
+    return json.dumps(result, default=str)
+
+
 def lambda_handler(event, context):
+    try:
+        params = event.get('queryStringParameters')
+        page = get_page(params)
+        fields = pokemon.parse_fields(params, required=('id_pokemon',) if page else ())
+        columns = pokemon.select_list(fields)
+    except ValueError as ve:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": str(ve)})
+        }
+
     try:
         secrets = get_secret()
 
         host = secrets.get('host')
         name = secrets.get('username')
         password = secrets.get('password')
-        db_name = "SIONPO"
 
         if not all([host, name, password]):
             raise Exception({
@@ -81,30 +150,38 @@ def lambda_handler(event, context):
             })
 
         try:
-            connection = pymysql.connect(
-                host=host,
-                user=name,
-                password=password,
-                db=db_name,
-                connect_timeout=5
-            )
+            connection = db.acquire(secrets, get_secret)
 
             try:
                 with connection.cursor() as cursor:
-                    cursor.execute("SELECT * FROM Pokemon")
-                    result = cursor.fetchall()
+                    version = versions.read_version(cursor, 'Pokemon')
+                # Las reacciones solo cambian la versión de fila, no la de tabla: los contadores de la
+                # lista pueden ir atrasados como mucho una ventana de RESPONSE_CACHE_TTL
+                etag = versions.make_etag(version, 'list', page, fields, counters_window())
 
-                response = {
-                    "statusCode": 200,
-                    "body": json.dumps(result, default=str)
-                }
+                if versions.not_modified(event, etag):
+                    response = versions.not_modified_response(etag)
+                else:
+                    key = response_cache.cache_key('list', page, fields)
+                    body = response_cache.get(key, version)
+                    cache_status = "HIT"
+                    if body is None:
+                        body = read_catalog(connection, page, columns)
+                        response_cache.put(key, version, body)
+                        cache_status = "MISS"
+
+                    response = {
+                        "statusCode": 200,
+                        "headers": {"ETag": etag, "X-Cache": cache_status},
+                        "body": body
+                    }
             except Exception as e:
                 response = {
                     "statusCode": 500,
                     "body": f"Query execution error: {str(e)}"
                 }
             finally:
-                connection.close()
+                db.release(connection)
         except pymysql.MySQLError as error:
             error_code = error.args[0]
             if error_code == 2003:
@@ -136,4 +213,5 @@ def lambda_handler(event, context):
                 "body": f"Error: {str(e)}"
             }
 
+    response_cache.emit_metrics(getattr(context, 'function_name', 'get_data_all_pokemon'))
     return response
@@ -0,0 +1,110 @@
+import json
+import pymysql
+import boto3
+from botocore.exceptions import ClientError
+from sionpo_common import db, pagination, pokemon, secret_cache
+
+SECRET_NAME = 'sionpoKeys'
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
+    region_name = 'us-east-2'
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+        secret = get_secret_value_response['SecretString']
+        return json.loads(secret)
+    except ClientError as e:
+        raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def parse_request(params):
+    """Return (id_user, limit, after_id, fields); the listing is always paginated."""
+    params = params or {}
+    try:
+        id_user = int(params['id_user'])
+    except KeyError:
+        raise ValueError("Missing query parameter: id_user")
+    except (TypeError, ValueError):
+        raise ValueError("id_user must be an integer")
+
+    limit, after_id = pagination.parse_page(params) or (pagination.DEFAULT_LIMIT, None)
+    if after_id is not None and not isinstance(after_id, int):
+        raise ValueError("Invalid cursor")
+    fields = pokemon.parse_fields(params, required=('id_pokemon',))
+    return id_user, limit, after_id, fields
+
+
+def fetch_favorites(cursor, id_user, limit, after_id, fields=None):
+    # Keyset sobre idx_interactions_user_type (Fk_id_user, interaction_type, Fk_id_pokemon):
+    # cada página es un rango del índice, sin OFFSET ni ordenar en memoria
+    sql = (
+        f"SELECT {pokemon.select_list(fields, 'p')} FROM Interactions i "
+        "JOIN Pokemon p ON p.id_pokemon = i.Fk_id_pokemon "
+        f"WHERE i.Fk_id_user = %s AND i.interaction_type = 'favorite' AND {pokemon.not_deleted('p')}"
+    )
+    params = [id_user]
+    if after_id is not None:
+        sql += " AND i.Fk_id_pokemon > %s"
+        params.append(after_id)
+    sql += " ORDER BY i.Fk_id_pokemon LIMIT %s"
+    params.append(limit + 1)
+
+    cursor.execute(sql, params)
+    rows = cursor.fetchall()
+    columns = [desc[0] for desc in cursor.description]
+    return pagination.build_page(rows, columns, limit, 'id_pokemon')
+
+
+def lambda_handler(event, context):
+    try:
+        id_user, limit, after_id, fields = parse_request(event.get('queryStringParameters'))
+    except ValueError as error:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    try:
+        secrets = get_secret()
+        connection = db.acquire(secrets, get_secret)
+    except pymysql.MySQLError as error:
+        return {
+            "statusCode": 503,
+            "body": json.dumps({"message": f"Database connection error: {str(error)}"})
+        }
+    except Exception as error:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    try:
+        with connection.cursor() as cursor:
+            page = fetch_favorites(cursor, id_user, limit, after_id, fields)
+        response = {
+            "statusCode": 200,
+            "body": json.dumps(page, default=str)
+        }
+    except pymysql.MySQLError as error:
+        response = {
+            "statusCode": 500,
+            "body": json.dumps({"message": f"Database error: {str(error)}"})
+        }
+    finally:
+        db.release(connection)
+
+    return response
@@ -2,9 +2,12 @@ import json
 import pymysql
 import boto3
 from botocore.exceptions import ClientError
+from sionpo_common import db, pokemon, reactions, response_cache, secret_cache, versions
 
-def get_secret():
-    secret_name = 'sionpoKeys'
+SECRET_NAME = 'sionpoKeys'
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -22,6 +25,10 @@ def get_secret():
     except ClientError as e:
         raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
 
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
 def lambda_handler(event, context):
     try:
         secrets = get_secret()
@@ -31,19 +38,8 @@ def lambda_handler(event, context):
             "body": json.dumps(f"Error retrieving secret: {str(e)}")
         }
 
-    host = secrets['host']
-    name = secrets['username']
-    password = secrets['password']
-    db_name = "SIONPO"
-
     try:
-        connection = pymysql.connect(
-            host=host,
-            user=name,
-            password=password,
-            db=db_name,
-            connect_timeout=5
-        )
+        connection = db.acquire(secrets, get_secret)
     except pymysql.IntegrityError as e:
         return {
             "statusCode": 422,
@@ -63,18 +59,47 @@ def lambda_handler(event, context):
     try:
         with connection.cursor() as cursor:
             id_pokemon = event['queryStringParameters']['id_pokemon']
-            cursor.execute("SELECT * FROM Pokemon WHERE id_pokemon = %s", (id_pokemon,))
-            result = cursor.fetchone()
-
-            if result:
-                columns = [desc[0] for desc in cursor.description]
-                result_dict = dict(zip(columns, result))
-            else:
-                result_dict = {}
+            fields = pokemon.parse_fields(event['queryStringParameters'])
+
+            version = versions.read_version(cursor, 'Pokemon', id_pokemon)
+            pending = None
+            if reactions.COUNTER_SHARDS > 1 and (
+                    fields is None or set(fields) & set(reactions.COUNTER_COLUMNS.values())):
+                # Con contadores repartidos la versión solo cambia al plegar; lo pendiente va en el ETag
+                pending = reactions.pending_counts(cursor, id_pokemon)
+                if not any(pending.values()):
+                    pending = None
+            variant = ('one', str(id_pokemon), fields) + ((pending,) if pending else ())
+            etag = versions.make_etag(version, *variant)
+            if versions.not_modified(event, etag):
+                return versions.not_modified_response(etag)
+
+            key = response_cache.cache_key('one', str(id_pokemon), fields)
+            body = response_cache.get(key, version)
+            cache_status = "HIT"
+            if body is None:
+                cursor.execute(
+                    f"SELECT {pokemon.select_list(fields)} FROM Pokemon "
+                    f"WHERE id_pokemon = %s AND {pokemon.NOT_DELETED}", (id_pokemon,))
+                result = cursor.fetchone()
+
+                if result:
+                    columns = [desc[0] for desc in cursor.description]
+                    result_dict = dict(zip(columns, result))
+                else:
+                    result_dict = {}
+
+                body = json.dumps(result_dict, default=str)
+                response_cache.put(key, version, body)
+                cache_status = "MISS"
+
+            if pending:
+                body = json.dumps(reactions.with_pending_counts(json.loads(body), pending), default=str)
 
         response = {
             "statusCode": 200,
-            "body": json.dumps(result_dict, default=str)
+            "headers": {"ETag": etag, "X-Cache": cache_status},
+            "body": body
         }
 
     except KeyError as e:
@@ -83,6 +108,12 @@ def lambda_handler(event, context):
             "body": json.dumps(f"Missing key in request body: {str(e)}")
         }
 
+    except ValueError as e:
+        response = {
+            "statusCode": 400,
+            "body": json.dumps(str(e))
+        }
+
     except pymysql.IntegrityError as e:
         response = {
             "statusCode": 422,
@@ -108,6 +139,7 @@ def lambda_handler(event, context):
         }
 
     finally:
-        connection.close()
+        db.release(connection)
+        response_cache.emit_metrics(getattr(context, 'function_name', 'get_publication'))
 
     return response
@@ -0,0 +1,84 @@
+import json
+import pymysql
+import boto3
+from botocore.exceptions import ClientError
+from sionpo_common import db, secret_cache, trending
+
+SECRET_NAME = 'sionpoKeys'
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
+    region_name = 'us-east-2'
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+        secret = get_secret_value_response['SecretString']
+        return json.loads(secret)
+    except ClientError as e:
+        raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def parse_limit(params):
+    try:
+        limit = int((params or {}).get('limit', DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1 or limit > MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    return limit
+
+
+def lambda_handler(event, context):
+    try:
+        limit = parse_limit(event.get('queryStringParameters'))
+    except ValueError as error:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    try:
+        secrets = get_secret()
+        connection = db.acquire(secrets, get_secret)
+    except pymysql.MySQLError as error:
+        return {
+            "statusCode": 503,
+            "body": json.dumps({"message": f"Database connection error: {str(error)}"})
+        }
+    except Exception as error:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    try:
+        with connection.cursor() as cursor:
+            items = trending.top(cursor, limit)
+        response = {
+            "statusCode": 200,
+            "body": json.dumps({"items": items}, default=str)
+        }
+    except pymysql.MySQLError as error:
+        response = {
+            "statusCode": 500,
+            "body": json.dumps({"message": f"Database error: {str(error)}"})
+        }
+    finally:
+        db.release(connection)
+
+    return response
@@ -0,0 +1,109 @@
+import json
+import pymysql
+import boto3
+from botocore.exceptions import ClientError
+from sionpo_common import db, pokemon, reactions, secret_cache
+
+SECRET_NAME = 'sionpoKeys'
+# Una página del catálogo (pagination.MAX_LIMIT)
+MAX_IDS = 100
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
+    region_name = 'us-east-2'
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+        secret = get_secret_value_response['SecretString']
+        return json.loads(secret)
+    except ClientError as e:
+        raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def parse_request(params):
+    """Return (id_user, [id_pokemon]) from ?id_user=1&ids=1,2,3."""
+    params = params or {}
+    try:
+        id_user = int(params['id_user'])
+        ids = list(dict.fromkeys(int(value) for value in params['ids'].split(',') if value.strip()))
+    except KeyError as e:
+        raise ValueError(f"Missing query parameter: {e.args[0]}")
+    except (TypeError, ValueError):
+        raise ValueError("id_user and ids must be integers")
+    if not ids:
+        raise ValueError("ids cannot be empty")
+    if len(ids) > MAX_IDS:
+        raise ValueError(f"At most {MAX_IDS} ids per request")
+    return id_user, ids
+
+
+def read_reactions(cursor, id_user, ids):
+    # Índice único (Fk_id_user, Fk_id_pokemon, interaction_type) más la llave primaria de Pokemon;
+    # los Pokemon borrados quedan sin reacciones, como en el resto de lecturas
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(
+        "SELECT i.Fk_id_pokemon, i.interaction_type FROM Interactions i "
+        "JOIN Pokemon p ON p.id_pokemon = i.Fk_id_pokemon "
+        f"WHERE i.Fk_id_user = %s AND i.Fk_id_pokemon IN ({placeholders}) AND {pokemon.not_deleted('p')}",
+        [id_user] + ids
+    )
+    by_pokemon = {str(id_pokemon): [] for id_pokemon in ids}
+    for id_pokemon, interaction_type in cursor.fetchall():
+        by_pokemon[str(id_pokemon)].append(interaction_type)
+    for types in by_pokemon.values():
+        types.sort(key=reactions.INTERACTION_TYPES.index)
+    return by_pokemon
+
+
+def lambda_handler(event, context):
+    try:
+        id_user, ids = parse_request(event.get('queryStringParameters'))
+    except ValueError as error:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    try:
+        secrets = get_secret()
+        connection = db.acquire(secrets, get_secret)
+    except pymysql.MySQLError as error:
+        return {
+            "statusCode": 503,
+            "body": json.dumps({"message": f"Database connection error: {str(error)}"})
+        }
+    except Exception as error:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    try:
+        with connection.cursor() as cursor:
+            by_pokemon = read_reactions(cursor, id_user, ids)
+        response = {
+            "statusCode": 200,
+            "body": json.dumps({"id_user": id_user, "reactions": by_pokemon})
+        }
+    except pymysql.MySQLError as error:
+        response = {
+            "statusCode": 500,
+            "body": json.dumps({"message": f"Database error: {str(error)}"})
+        }
+    finally:
+        db.release(connection)
+
+    return response
@@ -0,0 +1,218 @@
+import csv
+import io
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
+from sionpo_common import identity, secret_cache
+
+SECRET_NAME = 'cognitoKeys'
+# Hilos simultáneos contra Cognito; el límite real lo pone RATE_LIMIT
+MAX_WORKERS = int(os.environ.get('IMPORT_MAX_WORKERS', '8'))
+# Llamadas por segundo: por debajo de la cuota de AdminCreateUser / AdminAddUserToGroup de la cuenta
+RATE_LIMIT = float(os.environ.get('IMPORT_RATE_LIMIT', '20'))
+MAX_RECORDS = 10000
+GROUPS = ('user', 'moderator')
+# No empieza otro usuario si quedan menos de estos ms de ejecución
+TIME_MARGIN_MS = 10000
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
+    region_name = 'us-east-2'
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+        secret = get_secret_value_response['SecretString']
+        return json.loads(secret)
+    except ClientError as e:
+        raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def parse_records(text):
+    """Accept a JSON array, NDJSON (one user per line) or CSV with a username,email[,picture][,group] header."""
+    stripped = text.strip()
+    if stripped.startswith('['):
+        records = json.loads(stripped)
+    elif stripped.startswith('{'):
+        records = [json.loads(line) for line in stripped.splitlines() if line.strip()]
+    else:
+        records = [dict(row) for row in csv.DictReader(io.StringIO(stripped))]
+    if not records:
+        raise ValueError("No users in request body")
+    if len(records) > MAX_RECORDS:
+        raise ValueError(f"At most {MAX_RECORDS} users per import")
+    return records
+
+
+def validate_records(records):
+    """Return (users, errors): normalised users and per-record errors."""
+    users = []
+    errors = []
+    seen = set()
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            errors.append({"index": index, "message": "Record must be an object"})
+            continue
+        fields = {field: record.get(field) or '' for field in ('username', 'email', 'picture', 'group')}
+        if not all(isinstance(value, str) for value in fields.values()):
+            errors.append({"index": index, "message": "username, email, picture and group must be strings"})
+            continue
+        username = fields['username'].strip()
+        email = fields['email'].strip()
+        group = fields['group'].strip() or 'user'
+        if not username or not email:
+            errors.append({"index": index, "message": "Missing username or email"})
+        elif group not in GROUPS:
+            errors.append({"index": index, "message": f"Invalid group: {group}"})
+        elif username in seen:
+            errors.append({"index": index, "message": f"Duplicate username in request: {username}"})
+        else:
+            seen.add(username)
+            users.append({"index": index, "username": username, "email": email,
+                          "picture": fields['picture'].strip(), "group": group})
+    return users, errors
+
+
+def parse_options(event):
+    """Return (max_workers, rate) from a direct invocation, defaulting to IMPORT_MAX_WORKERS / IMPORT_RATE_LIMIT."""
+    try:
+        max_workers = int(event.get('max_workers', MAX_WORKERS))
+        rate = float(event.get('rate', RATE_LIMIT))
+    except (TypeError, ValueError):
+        raise ValueError("max_workers and rate must be numbers")
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    # rate 0 dividiría por cero en RateLimiter; inf o nan no limitan nada
+    if not (math.isfinite(rate) and rate > 0):
+        raise ValueError("rate must be a positive number")
+    return max_workers, rate
+
+
+def import_user(client, user_pool_id, user, limiter):
+    """Create one user (or reuse an existing one) and add it to its group; returns the outcome.
+
+    Cognito emails a temporary password and leaves the user in FORCE_CHANGE_PASSWORD: the first
+    /login answers NEW_PASSWORD_REQUIRED until it is repeated with new_password.
+    """
+    attributes = [
+        {'Name': 'email', 'Value': user['email']},
+        {'Name': 'email_verified', 'Value': 'true'},
+    ]
+    if user['picture']:
+        attributes.append({'Name': 'picture', 'Value': user['picture']})
+
+    status = 'created'
+    limiter.acquire()
+    try:
+        identity.call_with_retry(
+            client.admin_create_user,
+            UserPoolId=user_pool_id,
+            Username=user['username'],
+            UserAttributes=attributes,
+            DesiredDeliveryMediums=['EMAIL']
+        )
+    except ClientError as error:
+        if error.response['Error']['Code'] != 'UsernameExistsException':
+            raise
+        # Reimportar el mismo fichero solo completa los grupos que falten
+        status = 'exists'
+    limiter.acquire()
+    identity.add_user_to_group(client, user_pool_id, user['username'], user['group'])
+    return status
+
+
+def import_users(client, user_pool_id, users, max_workers=MAX_WORKERS, rate=RATE_LIMIT, time_left=None):
+    """Register users through a bounded thread pool sharing one rate limiter.
+
+    Users not started before time_left() drops under TIME_MARGIN_MS are reported as skipped
+    and can be imported again with the same file.
+    """
+    limiter = identity.RateLimiter(rate)
+
+    def run(user):
+        if time_left is not None and time_left() < TIME_MARGIN_MS:
+            return user, 'skipped', None
+        try:
+            return user, import_user(client, user_pool_id, user, limiter), None
+        except ClientError as error:
+            return user, 'failed', f"{error.response['Error']['Code']}: {error.response['Error']['Message']}"
+        except Exception as error:
+            # Un error de red o de endpoint no debe abortar el resto ni perder las estadísticas
+            return user, 'failed', f"{type(error).__name__}: {error}"
+
+    stats = {"created": 0, "exists": 0, "failed": 0, "skipped": 0, "errors": []}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for user, status, message in executor.map(run, users):
+            stats[status] += 1
+            if message:
+                stats["errors"].append({"index": user["index"], "username": user["username"], "message": message})
+    return stats
+
+
+def lambda_handler(event, context):
+    # Solo por invocación directa (sin ruta en API Gateway): {"body": "<csv | ndjson | json>"}
+    try:
+        records = parse_records(event['body'])
+        max_workers, rate = parse_options(event)
+    except (KeyError, TypeError, AttributeError):
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "Missing request body"})
+        }
+    except ValueError as error:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    users, errors = validate_records(records)
+    if not users:
+        return {
+            "statusCode": 422,
+            "body": json.dumps({"message": "No valid users to import", "errors": errors})
+        }
+
+    try:
+        secrets = get_secret()
+        stats = import_users(
+            identity.get_client(),
+            secrets['USER_POOL_ID'],
+            users,
+            max_workers=max_workers,
+            rate=rate,
+            time_left=getattr(context, 'get_remaining_time_in_millis', None)
+        )
+    except (NoCredentialsError, PartialCredentialsError) as error:
+        return {
+            "statusCode": 401,
+            "body": json.dumps({"message": str(error)})
+        }
+    except Exception as error:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": str(error)})
+        }
+
+    stats["rejected"] = len(errors)
+    stats["errors"] = errors + stats["errors"]
+    print(json.dumps({"import_users": {key: value for key, value in stats.items() if key != "errors"}}))
+    return {
+        "statusCode": 200,
+        "body": json.dumps(stats)
+    }
@@ -1,13 +1,19 @@
 import json
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
-import hmac
-import hashlib
-import base64
+import os
+from sionpo_common import identity, jwks, secret_cache
 
+SECRET_NAME = 'cognitoKeys'
+# JWKS_URL puede apuntar a un archivo (file://...) para pruebas sin red
+JWKS_URL = os.environ.get('JWKS_URL')
 
-def get_secret():
-    secret_name = 'cognitoKeys'
+# Se conservan entre invocaciones del mismo contenedor, una por User Pool
+key_stores = {}
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -66,10 +72,34 @@ def get_secret():
         })
 
 
-def get_secret_hash(username, client_id, client_secret):
-    message = username + client_id
-    dig = hmac.new(client_secret.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).digest()
-    return base64.b64encode(dig).decode()
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def get_key_store(user_pool_id):
+    # El id del pool empieza por la región: us-east-2_XXXX
+    url = JWKS_URL or (
+        f"https://cognito-idp.{user_pool_id.split('_')[0]}.amazonaws.com/{user_pool_id}/.well-known/jwks.json")
+    if url not in key_stores:
+        key_stores[url] = identity.key_store(url)
+    return key_stores[url]
+
+
+def role_from_token(id_token, secrets):
+    """First group in the cognito:groups claim of a verified IdToken, or None if the user has no group."""
+    claims = jwks.verify(id_token, get_key_store(secrets['USER_POOL_ID']), secrets['CLIENT_ID'])
+    groups = claims.get('cognito:groups') or []
+    return groups[0] if groups else None
+
+
+def role_from_admin_api(client, username, user_pool_id):
+    user_groups = client.admin_list_groups_for_user(
+        Username=username,
+        UserPoolId=user_pool_id
+    )
+    if user_groups['Groups']:
+        return user_groups['Groups'][0]['GroupName']
+    return None
 
 
 def lambda_handler(event, context):
@@ -77,7 +107,9 @@ def lambda_handler(event, context):
         body = json.loads(event['body'])
 
         username = body['username']
-        password = body['password']
+        # Con refresh_token se renuevan los tokens sin volver a pedir la contraseña
+        refresh_token = body.get('refresh_token')
+        password = None if refresh_token else body['password']
 
         secrets = get_secret()
 
@@ -85,35 +117,76 @@ def lambda_handler(event, context):
         CLIENT_ID = secrets['CLIENT_ID']
         CLIENT_SECRET = secrets['CLIENT_SECRET']
 
-        client = boto3.client('cognito-idp')
+        client = identity.get_client()
 
-        secret_hash = get_secret_hash(username, CLIENT_ID, CLIENT_SECRET)
+        secret_hash = identity.secret_hash(username, CLIENT_ID, CLIENT_SECRET)
 
-        response = client.initiate_auth(
-            ClientId=CLIENT_ID,
-            AuthFlow='USER_PASSWORD_AUTH',
-            AuthParameters={
-                'USERNAME': username,
-                'PASSWORD': password,
-                'SECRET_HASH': secret_hash
+        def refresh(token):
+            return client.initiate_auth(
+                ClientId=CLIENT_ID,
+                AuthFlow='REFRESH_TOKEN_AUTH',
+                AuthParameters={
+                    'REFRESH_TOKEN': token,
+                    'SECRET_HASH': secret_hash
+                }
+            )
+
+        if refresh_token:
+            response = refresh(refresh_token)
+        else:
+            response = client.initiate_auth(
+                ClientId=CLIENT_ID,
+                AuthFlow='USER_PASSWORD_AUTH',
+                AuthParameters={
+                    'USERNAME': username,
+                    'PASSWORD': password,
+                    'SECRET_HASH': secret_hash
+                }
+            )
+            if response.get('ChallengeName') == 'NEW_PASSWORD_REQUIRED' and body.get('new_password'):
+                response = client.respond_to_auth_challenge(
+                    ClientId=CLIENT_ID,
+                    ChallengeName='NEW_PASSWORD_REQUIRED',
+                    Session=response['Session'],
+                    ChallengeResponses={
+                        'USERNAME': username,
+                        'NEW_PASSWORD': body['new_password'],
+                        'SECRET_HASH': secret_hash
+                    }
+                )
+
+        if 'AuthenticationResult' not in response:
+            # Usuarios de import_users (FORCE_CHANGE_PASSWORD): deben repetir el login con new_password
+            return {
+                'statusCode': 403,
+                'body': json.dumps({
+                    'error': f"{response.get('ChallengeName')}: send new_password to finish signing in",
+                    'challenge': response.get('ChallengeName')
+                })
             }
-        )
 
-        role = None
-        user_groups = client.admin_list_groups_for_user(
-            Username=username,
-            UserPoolId=secrets['USER_POOL_ID']
-        )
-        if user_groups['Groups']:
-            role = user_groups['Groups'][0]['GroupName']
+        # El rol viaja en el IdToken; la API admin (lenta y con cuota baja) solo si no se puede verificar
+        try:
+            role = role_from_token(response['AuthenticationResult']['IdToken'], secrets)
+        except Exception:
+            role = role_from_admin_api(client, username, USER_POOL_ID)
+
+        if role is None:
+            # Confirmado sin grupo (por consola, por la API admin o con fallo en confirm_register)
+            role, added = identity.ensure_group(client, USER_POOL_ID, username)
+            if added:
+                # Tokens nuevos para que el IdToken lleve el grupo; se conserva el refresh token
+                result = response['AuthenticationResult']
+                result.update(refresh(result.get('RefreshToken', refresh_token))['AuthenticationResult'])
 
         return {
             'statusCode': 200,
             'body': json.dumps({
-                'message': 'User login successful',
+                'message': 'Tokens refreshed successfully' if refresh_token else 'User login successful',
                 'id_token': response['AuthenticationResult']['IdToken'],
                 'access_token': response['AuthenticationResult']['AccessToken'],
-                'refresh_token': response['AuthenticationResult']['RefreshToken'],
+                # REFRESH_TOKEN_AUTH no devuelve un refresh token nuevo salvo que el pool los rote
+                'refresh_token': response['AuthenticationResult'].get('RefreshToken', refresh_token),
                 'role': role
             })
         }
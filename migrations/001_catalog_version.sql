@@ -0,0 +1,10 @@
+-- Contadores de versión para ETag / If-None-Match.
+-- row_id = 0 es la versión de toda la tabla; row_id = <id> la de un registro.
+CREATE TABLE IF NOT EXISTS CatalogVersion (
+    table_name VARCHAR(64) NOT NULL,
+    row_id BIGINT NOT NULL,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    PRIMARY KEY (table_name, row_id)
+);
+
+INSERT IGNORE INTO CatalogVersion (table_name, row_id, version) VALUES ('Pokemon', 0, 0);
@@ -0,0 +1,15 @@
+-- post_reaction / delete_reaction mantienen likes_count y dislikes_count desde ahora.
+-- Recalcula una vez los contadores a partir de Interactions antes de desplegar.
+UPDATE Pokemon p
+LEFT JOIN (
+    SELECT Fk_id_pokemon,
+           SUM(interaction_type = 'like') AS likes,
+           SUM(interaction_type = 'dislike') AS dislikes
+    FROM Interactions
+    GROUP BY Fk_id_pokemon
+) i ON i.Fk_id_pokemon = p.id_pokemon
+SET p.likes_count = COALESCE(i.likes, 0),
+    p.dislikes_count = COALESCE(i.dislikes, 0);
+
+INSERT INTO CatalogVersion (table_name, row_id, version) VALUES ('Pokemon', 0, 1)
+ON DUPLICATE KEY UPDATE version = version + 1;
@@ -0,0 +1,27 @@
+-- Una interacción por (usuario, pokemon, tipo): post_reaction pasa a ser un upsert idempotente
+-- y delete_reaction puede borrar por clave natural sin buscar antes id_interaction.
+-- Elimina los duplicados existentes conservando el registro más antiguo.
+DELETE dup FROM Interactions dup
+JOIN Interactions keep
+  ON keep.Fk_id_user = dup.Fk_id_user
+ AND keep.Fk_id_pokemon = dup.Fk_id_pokemon
+ AND keep.interaction_type = dup.interaction_type
+ AND keep.id_interaction < dup.id_interaction;
+
+ALTER TABLE Interactions
+    ADD UNIQUE KEY uq_interaction (Fk_id_user, Fk_id_pokemon, interaction_type);
+
+-- Los duplicados inflaban los contadores: se recalculan como en 002
+UPDATE Pokemon p
+LEFT JOIN (
+    SELECT Fk_id_pokemon,
+           SUM(interaction_type = 'like') AS likes,
+           SUM(interaction_type = 'dislike') AS dislikes
+    FROM Interactions
+    GROUP BY Fk_id_pokemon
+) i ON i.Fk_id_pokemon = p.id_pokemon
+SET p.likes_count = COALESCE(i.likes, 0),
+    p.dislikes_count = COALESCE(i.dislikes, 0);
+
+INSERT INTO CatalogVersion (table_name, row_id, version) VALUES ('Pokemon', 0, 1)
+ON DUPLICATE KEY UPDATE version = version + 1;
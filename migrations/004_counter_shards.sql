@@ -0,0 +1,10 @@
+-- Contadores repartidos para Pokemon con mucho tráfico de reacciones (COUNTER_SHARDS > 1).
+-- Cada fila guarda incrementos pendientes (pueden ser negativos); fold_counters los suma a
+-- Pokemon.likes_count / dislikes_count y los deja en cero.
+CREATE TABLE IF NOT EXISTS PokemonCounterShard (
+    id_pokemon BIGINT NOT NULL,
+    slot SMALLINT UNSIGNED NOT NULL,
+    likes_count BIGINT NOT NULL DEFAULT 0,
+    dislikes_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (id_pokemon, slot)
+);
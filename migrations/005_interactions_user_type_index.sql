@@ -0,0 +1,4 @@
+-- Favoritos de un usuario paginados por id_pokemon (get_favorites): rango de índice sin filesort.
+-- Las consultas "mis reacciones" por lista de ids usan uq_interaction (migrations/003).
+ALTER TABLE Interactions
+    ADD INDEX idx_interactions_user_type (Fk_id_user, interaction_type, Fk_id_pokemon);
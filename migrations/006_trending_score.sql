@@ -0,0 +1,12 @@
+-- Ranking "trending": una fila por Pokemon con el puntaje decaído en espacio logarítmico
+-- (ver sionpo_common/trending.py). Top-N = recorrido inverso de idx_trending_score.
+CREATE TABLE IF NOT EXISTS TrendingScore (
+    id_pokemon BIGINT NOT NULL PRIMARY KEY,
+    score DOUBLE NOT NULL,
+    INDEX idx_trending_score (score)
+);
+
+-- rebuild_trending necesita la fecha de cada reacción; las filas existentes quedan con la fecha
+-- de la migración
+ALTER TABLE Interactions
+    ADD COLUMN created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
@@ -0,0 +1,5 @@
+-- delete_publication marca deleted_at en lugar de borrar; purge_publications elimina después las
+-- Interactions por bloques y la fila. Todas las lecturas filtran deleted_at IS NULL con este índice.
+ALTER TABLE Pokemon
+    ADD COLUMN deleted_at DATETIME NULL DEFAULT NULL,
+    ADD INDEX idx_pokemon_deleted_at (deleted_at, id_pokemon);
@@ -0,0 +1,4 @@
+-- delete_badges desvincula a los usuarios con UPDATE Users ... WHERE fk_id_badge IN (...):
+-- sin este índice la sentencia recorre (y bloquea) toda la tabla Users.
+ALTER TABLE Users
+    ADD INDEX idx_users_fk_id_badge (fk_id_badge);
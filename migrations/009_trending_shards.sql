@@ -0,0 +1,9 @@
+-- Puntajes trending pendientes cuando COUNTER_SHARDS > 1: cada reacción suma (log-sum-exp) en una
+-- fila (id_pokemon, slot) al azar en lugar de bloquear la única fila de TrendingScore del Pokemon.
+-- fold_counters las pliega en TrendingScore y las borra.
+CREATE TABLE IF NOT EXISTS TrendingScoreShard (
+    id_pokemon BIGINT NOT NULL,
+    slot SMALLINT UNSIGNED NOT NULL,
+    score DOUBLE NOT NULL,
+    PRIMARY KEY (id_pokemon, slot)
+);
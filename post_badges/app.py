@@ -2,10 +2,13 @@ import json
 import pymysql
 import boto3
 from botocore.exceptions import ClientError
+from sionpo_common import db, secret_cache
 
+SECRET_NAME = 'sionpoKeys'
 
-def get_secret():
-    secret_name = 'sionpoKeys'
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -24,6 +27,10 @@ def get_secret():
         raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
 
 
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
 def lambda_handler(event, context):
     try:
         body = json.loads(event['body'])
@@ -52,19 +59,8 @@ def lambda_handler(event, context):
             "body": json.dumps({"message": str(error)})
         }
 
-    host = secrets['host']
-    name = secrets['username']
-    password = secrets['password']
-    db_name = "SIONPO"
-
     try:
-        connection = pymysql.connect(
-            host=host,
-            user=name,
-            password=password,
-            db=db_name,
-            connect_timeout=5
-        )
+        connection = db.acquire(secrets, get_secret)
     except pymysql.MySQLError as error:
         return {
             "statusCode": 503,
@@ -83,14 +79,20 @@ def lambda_handler(event, context):
             cursor.execute(sql, (
                 badge_name, description, standard_to_get, date_earned, image
             ))
+            id_badge = cursor.lastrowid
             connection.commit()
 
-            cursor.execute("SELECT * FROM Badges")
-            result = cursor.fetchall()
+            if db.flag(event, 'full_list'):
+                # Respuesta anterior (toda la tabla), solo para clientes que la pidan
+                cursor.execute("SELECT * FROM Badges")
+                result = {"badges": cursor.fetchall()}
+            else:
+                cursor.execute("SELECT * FROM Badges WHERE id_badge = %s", (id_badge,))
+                result = {"badge": db.row_to_dict(cursor, cursor.fetchone())}
 
             response = {
                 "statusCode": 200,
-                "body": json.dumps({"badges": result})
+                "body": json.dumps(result, default=str)
             }
 
     except pymysql.MySQLError as error:
@@ -99,6 +101,6 @@ def lambda_handler(event, context):
             "body": json.dumps({"message": str(error)})
         }
     finally:
-        connection.close()
+        db.release(connection)
 
     return response
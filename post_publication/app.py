@@ -2,10 +2,13 @@ import json
 import pymysql
 import boto3
 from botocore.exceptions import ClientError
+from sionpo_common import db, pokemon, secret_cache, versions
 
+SECRET_NAME = 'sionpoKeys'
 
-def get_secret():
-    secret_name = 'sionpoKeys'
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -24,35 +27,20 @@ def get_secret():
         raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
 
 
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
 def lambda_handler(event, context):
     try:
         body = json.loads(event['body'])
-        required_fields = ['pokemon_name', 'abilities', 'types', 'description', 'image']
-        for field in required_fields:
-            if field not in body:
-                raise ValueError(f"Missing required field: {field}")
-        pokemon_name = body['pokemon_name']
-        abilities = json.dumps(body['abilities'])
-        types = json.dumps(body['types'])
-        description = body['description']
-        evolution_conditions = body['evolution_conditions']
-        image = body['image']
-        likes_count = body['likes_count']
-        dislikes_count = body['dislikes_count']
-        creation_update_date = body['creation_update_date']
+        values = pokemon.publication_values(body)
         id_pokemon = body['id_pokemon']
-        fk_id_user_creator = body['fk_id_user_creator']
-
-        if likes_count < 0:
-            return {
-                "statusCode": 422,
-                "body": json.dumps({"message": "likes_count cannot be negative"})
-            }
-        if dislikes_count < 0:
-            return {
-                "statusCode": 422,
-                "body": json.dumps({"message": "likes_count cannot be negative"})
-            }
+    except pokemon.UnprocessableError as error:
+        return {
+            "statusCode": 422,
+            "body": json.dumps({"message": str(error)})
+        }
     except (json.JSONDecodeError, ValueError) as error:
         return {
             "statusCode": 400,
@@ -65,18 +53,8 @@ def lambda_handler(event, context):
             "statusCode": 500,
             "body": json.dumps({"message": str(error)})
         }
-    host = secrets['host']
-    name = secrets['username']
-    password = secrets['password']
-    db_name = "SIONPO"
     try:
-        connection = pymysql.connect(
-            host=host,
-            user=name,
-            password=password,
-            db=db_name,
-            connect_timeout=5
-        )
+        connection = db.acquire(secrets, get_secret)
     except pymysql.MySQLError as error:
         return {
             "statusCode": 500,
@@ -85,29 +63,22 @@ def lambda_handler(event, context):
 
     try:
         with connection.cursor() as cursor:
-            sql = """
-                    INSERT INTO Pokemon (
-                        pokemon_name, abilities, types, description, 
-                        evolution_conditions, image, likes_count, 
-                        dislikes_count, creation_update_date, id_pokemon, fk_id_user_creator
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    )
-                """
-            cursor.execute(sql, (
-                pokemon_name, abilities, types, description,
-                evolution_conditions, image, likes_count,
-                dislikes_count, creation_update_date, id_pokemon, fk_id_user_creator
-            ))
+            cursor.execute(pokemon.PUBLICATION_INSERT_SQL, values)
+            versions.bump(cursor, 'Pokemon', id_pokemon)
             connection.commit()
 
         with connection.cursor() as cursor:
-            cursor.execute("SELECT * FROM Pokemon")
-            result = cursor.fetchall()
+            if db.flag(event, 'full_list'):
+                # Respuesta anterior (toda la tabla), solo para clientes que la pidan
+                cursor.execute(f"SELECT {pokemon.select_list(None)} FROM Pokemon WHERE {pokemon.NOT_DELETED}")
+                result = cursor.fetchall()
+            else:
+                cursor.execute(f"SELECT {pokemon.select_list(None)} FROM Pokemon WHERE id_pokemon = %s", (id_pokemon,))
+                result = db.row_to_dict(cursor, cursor.fetchone())
 
         response = {
             "statusCode": 200,
-            "body": json.dumps(result)
+            "body": json.dumps(result, default=str)
         }
 
     except pymysql.MySQLError as error:
@@ -118,6 +89,6 @@ def lambda_handler(event, context):
         }
 
     finally:
-        connection.close()
+        db.release(connection)
 
     return response
@@ -1,11 +1,17 @@
 import json
+import os
 import pymysql
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
+from sionpo_common import db, reaction_queue, reactions, secret_cache
 
+SECRET_NAME = 'sionpoKeys'
+# 'async' encola la reacción y responde 202; reaction_consumer la escribe por lotes
+REACTION_WRITE_MODE = os.environ.get('REACTION_WRITE_MODE', 'sync')
 
-def get_secret():
-    secret_name = 'sionpoKeys'
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -65,14 +71,56 @@ def get_secret():
         })
 
 
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def enqueue_reaction(event):
+    try:
+        body = json.loads(event['body'])
+        key = reactions.parse(body)
+        if body.get('toggle'):
+            # El orden de los mensajes no está garantizado, así que toggle solo es síncrono
+            raise ValueError("toggle is not supported in async mode")
+    except json.JSONDecodeError:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "Invalid JSON"})
+        }
+    except (KeyError, TypeError):
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": "Missing request body"})
+        }
+    except ValueError as ve:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"message": str(ve)})
+        }
+
+    try:
+        reaction_queue.get_queue().send(dict(zip(reactions.NATURAL_KEY_FIELDS, key)))
+    except Exception as e:
+        return {
+            "statusCode": 503,
+            "body": f"Error queueing interaction: {str(e)}"
+        }
+    return {
+        "statusCode": 202,
+        "body": json.dumps({"message": "Interacción en cola", "queued": True})
+    }
+
+
 def lambda_handler(event, context):
+    if REACTION_WRITE_MODE == 'async':
+        return enqueue_reaction(event)
+
     try:
         secrets = get_secret()
 
         host = secrets.get('host')
         name = secrets.get('username')
         password = secrets.get('password')
-        db_name = "SIONPO"
 
         if not all([host, name, password]):
             raise Exception({
@@ -81,43 +129,38 @@ def lambda_handler(event, context):
             })
 
         try:
-            connection = pymysql.connect(
-                host=host,
-                user=name,
-                password=password,
-                db=db_name,
-                connect_timeout=5
-            )
+            connection = db.acquire(secrets, get_secret)
 
             try:
                 body = json.loads(event['body'])
-                fk_id_user = body.get('Fk_id_user')
-                fk_id_pokemon = body.get('Fk_id_pokemon')
-                interaction_type = body.get('interaction_type')
-
-                if not fk_id_user or not fk_id_pokemon or not interaction_type:
-                    raise ValueError("Missing required fields")
-
-                if interaction_type not in ['like', 'dislike', 'favorite']:
-                    raise ValueError("Invalid interaction_type")
+                fk_id_user, fk_id_pokemon, interaction_type = reactions.parse(body)
 
                 with connection.cursor() as cursor:
-                    sql = """
-                    INSERT INTO Interactions (Fk_id_user, Fk_id_pokemon, interaction_type)
-                    VALUES (%s, %s, %s)
-                    """
-                    cursor.execute(sql, (fk_id_user, fk_id_pokemon, interaction_type))
+                    created = reactions.add(cursor, fk_id_user, fk_id_pokemon, interaction_type)
+                    removed = False
+                    if not created and body.get('toggle'):
+                        # toggle: repetir la misma reacción la quita
+                        removed = reactions.remove(cursor, fk_id_user, fk_id_pokemon, interaction_type)
                     connection.commit()
 
+                if removed:
+                    message = "Interacción eliminada exitosamente"
+                else:
+                    message = "Interacción añadida exitosamente"
                 response = {
                     "statusCode": 200,
-                    "body": json.dumps({"message": "Interacción añadida exitosamente"})
+                    "body": json.dumps({"message": message, "created": created, "removed": removed})
                 }
             except json.JSONDecodeError:
                 response = {
                     "statusCode": 400,
                     "body": json.dumps({"message": "Invalid JSON"})
                 }
+            except reactions.PokemonDeletedError as error:
+                response = {
+                    "statusCode": 404,
+                    "body": json.dumps({"message": str(error)})
+                }
             except ValueError as ve:
                 response = {
                     "statusCode": 400,
@@ -129,7 +172,7 @@ def lambda_handler(event, context):
                     "body": f"Query execution error: {str(e)}"
                 }
             finally:
-                connection.close()
+                db.release(connection)
         except pymysql.MySQLError as error:
             error_code = error.args[0]
             if error_code == 2003:
@@ -0,0 +1,145 @@
+import json
+import pymysql
+import boto3
+from botocore.exceptions import ClientError
+from sionpo_common import db, secret_cache
+
+SECRET_NAME = 'sionpoKeys'
+# Filas de Interactions por transacción: acota el tiempo que se retienen los bloqueos
+CHUNK_SIZE = 1000
+# Pokemon borrados por ejecución
+BATCH_SIZE = 50
+# Margen antes de purgar, por si hay que deshacer un borrado a mano
+GRACE_SECONDS = 3600
+# No empieza otro bloque si quedan menos de estos ms de ejecución
+TIME_MARGIN_MS = 10000
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
+    region_name = 'us-east-2'
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+        secret = get_secret_value_response['SecretString']
+        return json.loads(secret)
+    except ClientError as e:
+        raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def tombstoned(connection, grace_seconds, limit):
+    """Ids deleted more than grace_seconds ago, oldest first: a range scan of idx_pokemon_deleted_at."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT id_pokemon FROM Pokemon "
+            "WHERE deleted_at IS NOT NULL AND deleted_at < NOW() - INTERVAL %s SECOND "
+            "ORDER BY deleted_at LIMIT %s",
+            (grace_seconds, limit)
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    connection.commit()
+    return ids
+
+
+def purge_chunk(connection, id_pokemon, chunk_size):
+    """Delete up to chunk_size Interactions of one Pokemon in its own transaction.
+
+    When the chunk comes back short the Pokemon has no Interactions left, so its trending
+    score, shard rows and Pokemon row are dropped in the same transaction. Returns
+    (interactions deleted, whether the Pokemon row is gone).
+    """
+    try:
+        with connection.cursor() as cursor:
+            deleted = cursor.execute(
+                "DELETE FROM Interactions WHERE Fk_id_pokemon = %s LIMIT %s",
+                (id_pokemon, chunk_size)
+            )
+            done = deleted < chunk_size
+            if done:
+                cursor.execute("DELETE FROM TrendingScore WHERE id_pokemon = %s", (id_pokemon,))
+                cursor.execute("DELETE FROM TrendingScoreShard WHERE id_pokemon = %s", (id_pokemon,))
+                cursor.execute("DELETE FROM PokemonCounterShard WHERE id_pokemon = %s", (id_pokemon,))
+                # Solo si sigue marcado: un borrado deshecho a mano no se purga
+                cursor.execute(
+                    "DELETE FROM Pokemon WHERE id_pokemon = %s AND deleted_at IS NOT NULL",
+                    (id_pokemon,)
+                )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    return deleted, done
+
+
+def purge(connection, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE, grace_seconds=GRACE_SECONDS,
+          time_left=None):
+    """Purge tombstoned Pokemon chunk by chunk until done or time_left() drops under TIME_MARGIN_MS.
+
+    A Pokemon cut off by the deadline keeps its tombstone and is resumed on the next run.
+    """
+    stats = {"purged": 0, "interactions_deleted": 0, "pending": 0, "failed": 0}
+    ids = tombstoned(connection, grace_seconds, batch_size)
+    for position, id_pokemon in enumerate(ids):
+        done = False
+        while not done:
+            if time_left is not None and time_left() < TIME_MARGIN_MS:
+                stats["pending"] = len(ids) - position
+                return stats
+            try:
+                deleted, done = purge_chunk(connection, id_pokemon, chunk_size)
+            except pymysql.MySQLError as error:
+                # Un Pokemon que falla (p. ej. una reacción que entró tras el tombstone) no frena al resto;
+                # conserva su marca y se reintenta en la siguiente ejecución
+                print(f"Purge of Pokemon {id_pokemon} failed: {error}")
+                stats["failed"] += 1
+                break
+            stats["interactions_deleted"] += deleted
+        else:
+            stats["purged"] += 1
+    return stats
+
+
+def lambda_handler(event, context):
+    event = event or {}
+    try:
+        secrets = get_secret()
+        connection = db.acquire(secrets, get_secret)
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": str(e)})
+        }
+
+    try:
+        stats = purge(
+            connection,
+            chunk_size=int(event.get('chunk_size', CHUNK_SIZE)),
+            grace_seconds=int(event.get('grace_seconds', GRACE_SECONDS)),
+            time_left=getattr(context, 'get_remaining_time_in_millis', None)
+        )
+        print(json.dumps({"purge_publications": stats}))
+        response = {
+            "statusCode": 200,
+            "body": json.dumps(stats)
+        }
+    except pymysql.MySQLError as e:
+        response = {
+            "statusCode": 500,
+            "body": json.dumps({"message": f"Database error: {str(e)}"})
+        }
+    finally:
+        db.release(connection)
+
+    return response
@@ -0,0 +1,103 @@
+import json
+import pymysql
+import boto3
+from botocore.exceptions import ClientError
+from sionpo_common import db, reactions, secret_cache
+
+SECRET_NAME = 'sionpoKeys'
+BATCH_SIZE = 100
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
+    region_name = 'us-east-2'
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+        secret = get_secret_value_response['SecretString']
+        return json.loads(secret)
+    except ClientError as e:
+        raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def parse_records(records):
+    """Return ([(messageId, key)], [failed messageIds]) for SQS-shaped records."""
+    items = []
+    failures = []
+    for record in records:
+        try:
+            items.append((record['messageId'], reactions.parse(json.loads(record['body']))))
+        except (KeyError, TypeError, ValueError):
+            failures.append(record.get('messageId'))
+    return items, failures
+
+
+def write_batch(connection, items):
+    """Write all reactions in one transaction; if it fails, retry one by one and return the failed ids."""
+    if not items:
+        return []
+    try:
+        with connection.cursor() as cursor:
+            reactions.add_batch(cursor, [key for _, key in items])
+        connection.commit()
+        return []
+    except pymysql.MySQLError as error:
+        connection.rollback()
+        print(f"Batch write failed, retrying {len(items)} reactions one by one: {error}")
+
+    failures = []
+    for message_id, key in items:
+        try:
+            with connection.cursor() as cursor:
+                reactions.add(cursor, *key)
+            connection.commit()
+        except reactions.PokemonDeletedError:
+            # Reintentar no cambia nada: el mensaje se descarta
+            connection.rollback()
+        except pymysql.MySQLError as error:
+            connection.rollback()
+            print(f"Reaction {message_id} failed: {error}")
+            failures.append(message_id)
+    return failures
+
+
+def drain(queue, connection, batch_size=BATCH_SIZE):
+    """Consume a local MemoryQueue/FileQueue until empty; returns (written, failed)."""
+    written = failed = 0
+    while True:
+        records = queue.receive(batch_size)
+        if not records:
+            return written, failed
+        items, failures = parse_records(records)
+        failures += write_batch(connection, items)
+        written += len(records) - len(failures)
+        failed += len(failures)
+
+
+def lambda_handler(event, context):
+    items, failures = parse_records(event.get('Records') or [])
+
+    if items:
+        # Sin secreto o sin conexión se reintenta todo el lote
+        secrets = get_secret()
+        connection = db.acquire(secrets, get_secret)
+        try:
+            failures += write_batch(connection, items)
+        finally:
+            db.release(connection)
+
+    return {
+        "batchItemFailures": [{"itemIdentifier": message_id} for message_id in failures]
+    }
@@ -0,0 +1,166 @@
+import json
+import time
+import pymysql
+import boto3
+from botocore.exceptions import ClientError
+from sionpo_common import db, secret_cache, trending
+
+SECRET_NAME = 'sionpoKeys'
+CHUNK_SIZE = 5000
+WRITE_CHUNK_SIZE = 500
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
+    region_name = 'us-east-2'
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+        secret = get_secret_value_response['SecretString']
+        return json.loads(secret)
+    except ClientError as e:
+        raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def latest_interaction(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COALESCE(MAX(id_interaction), 0) FROM Interactions")
+        return cursor.fetchone()[0]
+
+
+def compute_scores(connection, until_id, now=None, chunk_size=CHUNK_SIZE):
+    """Recompute {id_pokemon: log_score} from Interactions up to until_id, reading chunk_size rows per query."""
+    if now is None:
+        now = time.time()
+    since = now - trending.WINDOW_HALF_LIVES * trending.HALF_LIFE_HOURS * 3600
+    types = list(trending.WEIGHTS)
+    placeholders = ", ".join(["%s"] * len(types))
+
+    scores = {}
+    after_id = 0
+    while True:
+        with connection.cursor() as cursor:
+            # Keyset sobre la llave primaria: cada bloque cuesta lo mismo sin importar el avance
+            cursor.execute(
+                "SELECT id_interaction, Fk_id_pokemon, interaction_type, UNIX_TIMESTAMP(created_at) "
+                "FROM Interactions "
+                f"WHERE id_interaction > %s AND id_interaction <= %s AND interaction_type IN ({placeholders}) "
+                "AND created_at >= FROM_UNIXTIME(%s) "
+                "ORDER BY id_interaction LIMIT %s",
+                [after_id, until_id] + types + [int(since), chunk_size]
+            )
+            rows = cursor.fetchall()
+        for _, id_pokemon, interaction_type, created_at in rows:
+            score = trending.log_weight(interaction_type, float(created_at))
+            scores[id_pokemon] = trending.log_add(scores.get(id_pokemon), score)
+        if len(rows) < chunk_size:
+            return scores
+        after_id = rows[-1][0]
+
+
+def merge_chunk(connection, ids, scores, until_id):
+    """Replace the scores of ids with the recomputed ones plus the reactions newer than until_id.
+
+    Returns the number of Pokemon left with a score.
+    """
+    placeholders = ", ".join(["%s"] * len(ids))
+    types = list(trending.WEIGHTS)
+    try:
+        with connection.cursor() as cursor:
+            # Shards antes que TrendingScore, el mismo orden que fold_counters
+            cursor.execute(
+                f"SELECT id_pokemon FROM TrendingScoreShard WHERE id_pokemon IN ({placeholders}) FOR UPDATE", ids
+            )
+            cursor.execute(
+                f"SELECT id_pokemon FROM TrendingScore WHERE id_pokemon IN ({placeholders}) FOR UPDATE", ids
+            )
+            # Con las filas bloqueadas, toda reacción que ya sumó su puntaje está confirmada y esta lectura
+            # (la primera sin bloqueo de la transacción) la ve; las que aún no lo han sumado esperan al commit
+            cursor.execute(
+                "SELECT Fk_id_pokemon, interaction_type, UNIX_TIMESTAMP(created_at) FROM Interactions "
+                f"WHERE id_interaction > %s AND Fk_id_pokemon IN ({placeholders}) "
+                f"AND interaction_type IN ({', '.join(['%s'] * len(types))})",
+                [until_id] + list(ids) + types
+            )
+            merged = {id_pokemon: scores[id_pokemon] for id_pokemon in ids if id_pokemon in scores}
+            for id_pokemon, interaction_type, created_at in cursor.fetchall():
+                score = trending.log_weight(interaction_type, float(created_at))
+                merged[id_pokemon] = trending.log_add(merged.get(id_pokemon), score)
+
+            if merged:
+                values = ", ".join(["(%s, %s)"] * len(merged))
+                cursor.execute(
+                    f"INSERT INTO TrendingScore (id_pokemon, score) VALUES {values} "
+                    "ON DUPLICATE KEY UPDATE score = VALUES(score)",
+                    [value for item in merged.items() for value in item]
+                )
+            stale = [id_pokemon for id_pokemon in ids if id_pokemon not in merged]
+            if stale:
+                cursor.execute(
+                    f"DELETE FROM TrendingScore WHERE id_pokemon IN ({', '.join(['%s'] * len(stale))})", stale
+                )
+            # Lo pendiente en los shards ya está contado en merged
+            cursor.execute(f"DELETE FROM TrendingScoreShard WHERE id_pokemon IN ({placeholders})", ids)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    return len(merged)
+
+
+def merge_scores(connection, scores, until_id, chunk_size=WRITE_CHUNK_SIZE):
+    """Write the recomputed ranking in short per-chunk transactions without losing concurrent reactions.
+
+    Pokemon already ranked but without a recomputed score are dropped, unless they got new reactions.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT id_pokemon FROM TrendingScore")
+        ranked = {row[0] for row in cursor.fetchall()}
+    # Termina la transacción de lectura: cada bloque necesita ver lo confirmado durante el cálculo
+    connection.commit()
+
+    ids = sorted(ranked.union(scores))
+    written = 0
+    for start in range(0, len(ids), chunk_size):
+        written += merge_chunk(connection, ids[start:start + chunk_size], scores, until_id)
+    return written
+
+
+def lambda_handler(event, context):
+    try:
+        secrets = get_secret()
+        connection = db.acquire(secrets, get_secret)
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": str(e)})
+        }
+
+    try:
+        until_id = latest_interaction(connection)
+        ranked = merge_scores(connection, compute_scores(connection, until_id), until_id)
+        response = {
+            "statusCode": 200,
+            "body": json.dumps({"ranked": ranked})
+        }
+    except pymysql.MySQLError as e:
+        response = {
+            "statusCode": 500,
+            "body": json.dumps({"message": f"Database error: {str(e)}"})
+        }
+    finally:
+        db.release(connection)
+
+    return response
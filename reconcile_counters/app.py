@@ -0,0 +1,197 @@
+import json
+import pymysql
+import boto3
+from botocore.exceptions import ClientError
+from sionpo_common import db, reactions, secret_cache, versions
+
+SECRET_NAME = 'sionpoKeys'
+CHUNK_SIZE = 1000
+FIX_BATCH_SIZE = 50
+MAX_EXAMPLES = 20
+
+
+def fetch_secret():
+    secret_name = SECRET_NAME
+    region_name = 'us-east-2'
+
+    session = boto3.session.Session()
+    client = session.client(
+        service_name='secretsmanager',
+        region_name=region_name
+    )
+
+    try:
+        get_secret_value_response = client.get_secret_value(
+            SecretId=secret_name
+        )
+        secret = get_secret_value_response['SecretString']
+        return json.loads(secret)
+    except ClientError as e:
+        raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
+
+
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def count_interactions(cursor, ids):
+    """Actual (likes, dislikes) per Pokemon for ids, grouped in one query."""
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(
+        "SELECT Fk_id_pokemon, SUM(interaction_type = 'like'), SUM(interaction_type = 'dislike') "
+        f"FROM Interactions WHERE Fk_id_pokemon IN ({placeholders}) "
+        "AND interaction_type IN ('like', 'dislike') GROUP BY Fk_id_pokemon",
+        list(ids)
+    )
+    counts = {id_pokemon: (0, 0) for id_pokemon in ids}
+    for id_pokemon, likes, dislikes in cursor.fetchall():
+        counts[id_pokemon] = (int(likes or 0), int(dislikes or 0))
+    return counts
+
+
+def pending_shards(cursor, ids):
+    """Shard deltas not yet folded; the stored counter plus these must match Interactions."""
+    if reactions.COUNTER_SHARDS <= 1:
+        return {}
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(
+        "SELECT id_pokemon, SUM(likes_count), SUM(dislikes_count) FROM PokemonCounterShard "
+        f"WHERE id_pokemon IN ({placeholders}) GROUP BY id_pokemon",
+        list(ids)
+    )
+    return {id_pokemon: (int(likes), int(dislikes)) for id_pokemon, likes, dislikes in cursor.fetchall()}
+
+
+def find_drift(cursor, stored):
+    """Return {id_pokemon: (stored, expected)} for rows whose counters disagree with Interactions."""
+    ids = list(stored)
+    actual = count_interactions(cursor, ids)
+    pending = pending_shards(cursor, ids)
+    drift = {}
+    for id_pokemon in ids:
+        pending_likes, pending_dislikes = pending.get(id_pokemon, (0, 0))
+        expected = (actual[id_pokemon][0] - pending_likes, actual[id_pokemon][1] - pending_dislikes)
+        if tuple(stored[id_pokemon]) != expected:
+            drift[id_pokemon] = (tuple(stored[id_pokemon]), expected)
+    return drift
+
+
+def fix_batch(connection, ids):
+    """Lock, recount and fix ids in one short transaction; returns {id_pokemon: (old, new)} applied."""
+    placeholders = ", ".join(["%s"] * len(ids))
+    try:
+        with connection.cursor() as cursor:
+            # Los escritores de reacciones esperan este bloqueo, así que el recuento no se adelanta a ellos
+            cursor.execute(
+                "SELECT id_pokemon, likes_count, dislikes_count FROM Pokemon "
+                f"WHERE id_pokemon IN ({placeholders}) FOR UPDATE",
+                list(ids)
+            )
+            stored = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+            drift = find_drift(cursor, stored) if stored else {}
+            for id_pokemon, (_, (likes, dislikes)) in drift.items():
+                cursor.execute(
+                    "UPDATE Pokemon SET likes_count = %s, dislikes_count = %s WHERE id_pokemon = %s",
+                    (max(likes, 0), max(dislikes, 0), id_pokemon)
+                )
+            if drift:
+                versions.bump(cursor, 'Pokemon', *drift)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    return drift
+
+
+def reconcile(connection, chunk_size=CHUNK_SIZE, fix_batch_size=FIX_BATCH_SIZE, dry_run=False):
+    """Walk Pokemon by id in chunks, compare counters with Interactions and fix the rows that differ."""
+    stats = {
+        "scanned": 0,
+        "drifted": 0,
+        "fixed": 0,
+        "likes_drift": 0,
+        "dislikes_drift": 0,
+        "max_drift": 0,
+        "examples": [],
+    }
+    after_id = None
+    while True:
+        with connection.cursor() as cursor:
+            # Lectura sin bloqueo: solo busca candidatos
+            if after_id is None:
+                cursor.execute(
+                    "SELECT id_pokemon, likes_count, dislikes_count FROM Pokemon ORDER BY id_pokemon LIMIT %s",
+                    (chunk_size,)
+                )
+            else:
+                cursor.execute(
+                    "SELECT id_pokemon, likes_count, dislikes_count FROM Pokemon "
+                    "WHERE id_pokemon > %s ORDER BY id_pokemon LIMIT %s",
+                    (after_id, chunk_size)
+                )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            stored = {row[0]: (row[1], row[2]) for row in rows}
+            drift = find_drift(cursor, stored)
+        # Cierra la lectura para no retener el snapshot entre bloques
+        connection.commit()
+
+        stats["scanned"] += len(rows)
+        candidates = list(drift)
+        if not dry_run:
+            drift = {}
+            for start in range(0, len(candidates), fix_batch_size):
+                drift.update(fix_batch(connection, candidates[start:start + fix_batch_size]))
+            stats["fixed"] += len(drift)
+
+        stats["drifted"] += len(drift)
+        for id_pokemon, ((likes, dislikes), (expected_likes, expected_dislikes)) in drift.items():
+            stats["likes_drift"] += abs(likes - expected_likes)
+            stats["dislikes_drift"] += abs(dislikes - expected_dislikes)
+            stats["max_drift"] = max(stats["max_drift"], abs(likes - expected_likes), abs(dislikes - expected_dislikes))
+            if len(stats["examples"]) < MAX_EXAMPLES:
+                stats["examples"].append({
+                    "id_pokemon": id_pokemon,
+                    "stored": [likes, dislikes],
+                    "expected": [expected_likes, expected_dislikes],
+                })
+
+        if len(rows) < chunk_size:
+            break
+        after_id = rows[-1][0]
+    return stats
+
+
+def lambda_handler(event, context):
+    event = event or {}
+    try:
+        secrets = get_secret()
+        connection = db.acquire(secrets, get_secret)
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"message": str(e)})
+        }
+
+    try:
+        stats = reconcile(
+            connection,
+            chunk_size=int(event.get('chunk_size', CHUNK_SIZE)),
+            dry_run=bool(event.get('dry_run', False))
+        )
+        # Queda en CloudWatch Logs para seguir la deriva entre ejecuciones
+        print(json.dumps({"reconcile_counters": stats}))
+        response = {
+            "statusCode": 200,
+            "body": json.dumps(stats)
+        }
+    except pymysql.MySQLError as e:
+        response = {
+            "statusCode": 500,
+            "body": json.dumps({"message": f"Database error: {str(e)}"})
+        }
+    finally:
+        db.release(connection)
+
+    return response
@@ -2,10 +2,13 @@ import json
 import pymysql
 import boto3
 from botocore.exceptions import ClientError
+from sionpo_common import db, secret_cache
 
+SECRET_NAME = 'sionpoKeys'
 
-def get_secret():
-    secret_name = 'sionpoKeys'
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -24,21 +27,14 @@ def get_secret():
         raise Exception(f"Error retrieving secret {secret_name}: {str(e)}")
 
 
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
 def lambda_handler(event, context):
     secrets = get_secret()
 
-    host = secrets['host']
-    name = secrets['username']
-    password = secrets['password']
-    db_name = "SIONPO"
-
-    connection = pymysql.connect(
-        host=host,
-        user=name,
-        password=password,
-        db=db_name,
-        connect_timeout=5
-    )
+    connection = db.acquire(secrets, get_secret)
     try:
         body = json.loads(event['body'])
 
@@ -72,6 +68,6 @@ def lambda_handler(event, context):
         }
 
     finally:
-        connection.close()
+        db.release(connection)
 
     return response
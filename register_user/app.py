@@ -1,13 +1,14 @@
 import json
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
-import hmac
-import hashlib
-import base64
+import os
+from sionpo_common import identity, secret_cache
 
+SECRET_NAME = 'cognitoKeys'
 
-def get_secret():
-    secret_name = 'cognitoKeys'
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -66,10 +67,22 @@ def get_secret():
         })
 
 
-def get_secret_hash(username, client_id, client_secret):
-    message = username + client_id
-    dig = hmac.new(client_secret.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).digest()
-    return base64.b64encode(dig).decode()
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
+def prefetch():
+    """Load the secret and the Cognito client during the Lambda init phase, off the request path."""
+    try:
+        get_secret()
+        identity.get_client()
+    except Exception:
+        # Se vuelve a intentar (y se informa el error) en la primera invocación
+        pass
+
+
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    prefetch()
 
 
 def lambda_handler(event, context):
@@ -82,15 +95,12 @@ def lambda_handler(event, context):
 
         secrets = get_secret()
 
-        USER_POOL_ID = secrets.get('USER_POOL_ID')
         CLIENT_ID = secrets.get('CLIENT_ID')
         CLIENT_SECRET = secrets.get('CLIENT_SECRET')
 
-        role = 'user'
-
-        client = boto3.client('cognito-idp')
+        client = identity.get_client()
 
-        secret_hash = get_secret_hash(username, CLIENT_ID, CLIENT_SECRET)
+        secret_hash = identity.secret_hash(username, CLIENT_ID, CLIENT_SECRET)
 
         response = client.sign_up(
             ClientId=CLIENT_ID,
@@ -109,12 +119,7 @@ def lambda_handler(event, context):
             ],
         )
 
-        client.admin_add_user_to_group(
-            UserPoolId=USER_POOL_ID,
-            Username=username,
-            GroupName=role
-        )
-        
+        # El grupo 'user' se asigna en confirm_register: sin confirmar no se puede iniciar sesión
         return {
             'statusCode': 200,
             'body': json.dumps({'message': 'User registration successful', 'user_sub': response['UserSub']})
@@ -0,0 +1,68 @@
+import importlib
+import json
+import threading
+
+# (ruta, método) -> paquete cuyo app.lambda_handler atiende la petición; igual que los eventos Api de template.yaml
+ROUTES = {
+    ('/get_pokemon', 'GET'): 'get_data_all_pokemon',
+    ('/get_one_pokemon', 'GET'): 'get_publication',
+    ('/add_pokemon', 'POST'): 'post_publication',
+    ('/add_pokemon/bulk', 'POST'): 'bulk_publication',
+    ('/update_pokemon', 'PUT'): 'update_publication',
+    ('/delete_pokemon', 'DELETE'): 'delete_publication',
+    ('/add_badges', 'POST'): 'post_badges',
+    ('/delete_badges', 'DELETE'): 'delete_badges',
+    ('/add_reaction', 'POST'): 'post_reaction',
+    ('/reactions/batch', 'POST'): 'batch_reaction',
+    ('/delete_reaction', 'DELETE'): 'delete_reaction',
+    ('/my_reactions', 'GET'): 'get_user_reactions',
+    ('/my_favorites', 'GET'): 'get_favorites',
+    ('/trending', 'GET'): 'get_trending',
+    ('/new_moderator', 'POST'): 'register_moderator',
+    ('/register_user', 'POST'): 'register_user',
+    ('/confirm_register', 'POST'): 'confirm_register',
+    ('/login', 'POST'): 'login',
+}
+
+# Los handlers se importan en su primera petición: un arranque en frío no paga las rutas que no se usan.
+# Todos comparten los módulos de sionpo_common, así que hay una sola caché de secretos y una sola conexión.
+_handlers = {}
+_lock = threading.Lock()
+
+
+def request_route(event):
+    """(path, method) of an API Gateway REST (v1) or HTTP API (v2) event."""
+    path = event.get('path') or event.get('rawPath') or '/'
+    method = event.get('httpMethod') or event.get('requestContext', {}).get('http', {}).get('method', '')
+    if len(path) > 1:
+        path = path.rstrip('/')
+    return path, method.upper()
+
+
+def get_handler(package):
+    handler = _handlers.get(package)
+    if handler is None:
+        with _lock:
+            handler = _handlers.get(package)
+            if handler is None:
+                handler = importlib.import_module(f"{package}.app").lambda_handler
+                _handlers[package] = handler
+    return handler
+
+
+def lambda_handler(event, context):
+    path, method = request_route(event)
+    package = ROUTES.get((path, method))
+    if package is None:
+        allowed = sorted(route_method for route_path, route_method in ROUTES if route_path == path)
+        if allowed:
+            return {
+                "statusCode": 405,
+                "headers": {"Allow": ", ".join(allowed)},
+                "body": json.dumps({"message": f"Method {method} not allowed for {path}"})
+            }
+        return {
+            "statusCode": 404,
+            "body": json.dumps({"message": f"No route for {path}"})
+        }
+    return get_handler(package)(event, context)
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# El código compartido se despliega como Lambda Layer (common/); en pruebas se agrega al path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common'))
+
+from sionpo_common import db, identity, reaction_queue, response_cache, secret_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state():
+    secret_cache.clear()
+    response_cache.clear()
+    db.close()
+    reaction_queue.set_queue(None)
+    identity.set_client(None)
+    yield
+    secret_cache.clear()
+    response_cache.clear()
+    db.close()
+    reaction_queue.set_queue(None)
+    identity.set_client(None)
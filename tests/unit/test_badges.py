@@ -35,7 +35,7 @@ class TestPostBadges(unittest.TestCase):
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
 
-        event = mock_body
+        event = dict(mock_body, queryStringParameters={'full_list': 'true'})
         context = {}
 
         response = app.lambda_handler(event, context)
@@ -146,3 +146,27 @@ class TestPostBadges(unittest.TestCase):
         self.assertIn("Insert failed", response_body["message"])
 
 
+
+    @patch('post_badges.app.get_secret')
+    @patch('post_badges.app.pymysql.connect')
+    def test_lambda_handler_returns_created_badge(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 7
+        mock_cursor.description = (('id_badge',), ('badge_name',))
+        mock_cursor.fetchone.return_value = (7, 'test_badge')
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        response = app.lambda_handler(mock_body, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body']), {'badge': {'id_badge': 7, 'badge_name': 'test_badge'}})
+        mock_cursor.execute.assert_called_with("SELECT * FROM Badges WHERE id_badge = %s", (7,))
+        mock_cursor.fetchall.assert_not_called()
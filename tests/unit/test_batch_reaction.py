@@ -0,0 +1,142 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+import pymysql
+
+from batch_reaction import app
+
+mock_secrets = {
+    'host': 'mock-host',
+    'username': 'mock-username',
+    'password': 'mock-password'
+}
+
+
+def operation(action, user, pokemon, interaction_type='like'):
+    return {"action": action, "Fk_id_user": user, "Fk_id_pokemon": pokemon, "interaction_type": interaction_type}
+
+
+class TestBatchReaction(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('batch_reaction.app.get_secret', return_value=mock_secrets)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        connect_patcher = patch('pymysql.connect')
+        self.mock_connect = connect_patcher.start()
+        self.addCleanup(connect_patcher.stop)
+        self.mock_connection = MagicMock()
+        self.mock_cursor = MagicMock()
+        self.mock_connection.cursor.return_value.__enter__.return_value = self.mock_cursor
+        self.mock_connect.return_value = self.mock_connection
+
+    def test_lambda_handler_applies_net_change_in_one_transaction(self):
+        # Ningún Pokemon borrado; después, las reacciones que ya existen
+        self.mock_cursor.fetchall.side_effect = [[], [(1, 25, 'dislike'), (1, 7, 'like')]]
+        operations = [
+            operation('add', 1, 25),
+            operation('add', 1, 25),
+            operation('remove', 1, 25, 'dislike'),
+            operation('add', 1, 7),
+            operation('remove', 2, 7, 'favorite'),
+            operation('add', 1, 26, 'favorite'),
+            operation('remove', 1, 26, 'favorite'),
+        ]
+
+        response = app.lambda_handler({"body": json.dumps({"operations": operations})}, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        body = json.loads(response['body'])
+        self.assertEqual([result['status'] for result in body['results']],
+                         ['created', 'exists', 'removed', 'exists', 'not_found', 'created', 'removed'])
+        self.assertEqual(body['changed'], 2)
+
+        statements = [call.args for call in self.mock_cursor.execute.call_args_list]
+        self.assertIn("deleted_at IS NOT NULL", statements[0][0])
+        self.assertEqual(statements[0][1], [25, 7, 26])
+        self.assertIn("FOR UPDATE", statements[1][0])
+        self.assertTrue(statements[2][0].startswith("INSERT INTO Interactions"))
+        self.assertEqual(statements[2][1], [1, 25, 'like'])
+        self.assertTrue(statements[3][0].startswith("INSERT INTO TrendingScore"))
+        self.assertEqual(statements[3][1][0], 25)
+        self.assertTrue(statements[4][0].startswith("DELETE FROM Interactions WHERE (Fk_id_user"))
+        self.assertEqual(statements[4][1], [1, 25, 'dislike'])
+        self.assertEqual(statements[5], (
+            "UPDATE Pokemon SET likes_count = likes_count + %s, "
+            "dislikes_count = GREATEST(dislikes_count, %s) - %s WHERE id_pokemon = %s",
+            [1, 1, 1, 25]
+        ))
+        self.assertIn("CatalogVersion", statements[6][0])
+        self.assertEqual(len(statements), 7)
+        self.mock_connection.commit.assert_called_once()
+
+    def test_lambda_handler_reports_invalid_operations(self):
+        self.mock_cursor.fetchall.return_value = []
+        operations = [
+            operation('add', 1, 25),
+            operation('add', 1, 25, 'love'),
+            operation('toggle', 1, 25),
+            {"action": "add", "Fk_id_user": 1},
+        ]
+
+        response = app.lambda_handler({"body": json.dumps(operations)}, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        results = json.loads(response['body'])['results']
+        self.assertEqual(results[0]['status'], 'created')
+        self.assertEqual([result['message'] for result in results[1:]],
+                         ["Invalid interaction_type", "Invalid action", "Missing required fields"])
+
+    def test_lambda_handler_rejects_non_integer_ids(self):
+        self.mock_cursor.fetchall.return_value = []
+        operations = [
+            operation('add', [1], 25),
+            operation('add', 1, {"id": 25}),
+            operation('add', 1.9, 25),
+            operation('add', "2", "25"),
+        ]
+
+        response = app.lambda_handler({"body": json.dumps(operations)}, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        results = json.loads(response['body'])['results']
+        self.assertEqual([result.get('message') for result in results],
+                         ["Fk_id_user must be an integer", "Fk_id_pokemon must be an integer",
+                          "Fk_id_user must be an integer", None])
+        self.assertEqual(results[3]['status'], 'created')
+
+    def test_lambda_handler_skips_adds_to_deleted_pokemon(self):
+        self.mock_cursor.fetchall.side_effect = [[(25,)], []]
+        operations = [operation('add', 1, 25), operation('remove', 1, 25, 'dislike'), operation('add', 1, 7)]
+
+        response = app.lambda_handler({"body": json.dumps(operations)}, None)
+
+        results = json.loads(response['body'])['results']
+        self.assertEqual([result['status'] for result in results], ['invalid', 'not_found', 'created'])
+        self.assertEqual(results[0]['message'], "Pokemon not found")
+        inserts = [call.args for call in self.mock_cursor.execute.call_args_list
+                   if call.args[0].startswith("INSERT INTO Interactions")]
+        self.assertEqual(inserts[0][1], [1, 7, 'like'])
+
+    def test_lambda_handler_nothing_valid_skips_database(self):
+        response = app.lambda_handler({"body": json.dumps([operation('add', 1, 25, 'love')])}, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        self.mock_connect.assert_not_called()
+
+    def test_lambda_handler_rolls_back_on_integrity_error(self):
+        self.mock_cursor.fetchall.return_value = []
+        self.mock_cursor.execute.side_effect = [0, pymysql.IntegrityError(1452, "foreign key constraint fails")]
+
+        response = app.lambda_handler({"body": json.dumps([operation('add', 1, 999)])}, None)
+
+        self.assertEqual(response['statusCode'], 422)
+        self.mock_connection.rollback.assert_called()
+        self.mock_connection.commit.assert_not_called()
+
+    def test_lambda_handler_invalid_body(self):
+        for body in ("not json", json.dumps({"operations": []}), json.dumps([{}] * (app.MAX_OPERATIONS + 1))):
+            response = app.lambda_handler({"body": body}, None)
+
+            self.assertEqual(response['statusCode'], 400)
@@ -0,0 +1,138 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+import pymysql
+from bulk_publication import app
+
+
+def make_publication(id_pokemon, **overrides):
+    publication = {
+        "pokemon_name": f"Pokemon {id_pokemon}",
+        "abilities": ["Static"],
+        "types": ["Electric"],
+        "description": "An electric Pokémon",
+        "evolution_conditions": "Thunderstone",
+        "image": "pikachu.png",
+        "likes_count": 0,
+        "dislikes_count": 0,
+        "creation_update_date": "2024-06-05",
+        "id_pokemon": id_pokemon,
+        "fk_id_user_creator": 1
+    }
+    publication.update(overrides)
+    return publication
+
+
+mock_secrets = {
+    'host': 'mock-host',
+    'username': 'mock-username',
+    'password': 'mock-password'
+}
+
+
+class TestBulkPublication(unittest.TestCase):
+
+    def test_parse_records_accepts_array_and_ndjson(self):
+        records = [make_publication(1), make_publication(2)]
+
+        self.assertEqual(app.parse_records(json.dumps(records)), records)
+        self.assertEqual(app.parse_records("\n".join(json.dumps(r) for r in records) + "\n"), records)
+
+    def test_validate_records_reports_every_error(self):
+        records = [
+            make_publication(1),
+            {"pokemon_name": "Missing"},
+            make_publication(3, likes_count=-1),
+            make_publication(1),
+        ]
+
+        rows, errors = app.validate_records(records)
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual([error["index"] for error in errors], [1, 2, 3])
+        self.assertEqual(errors[0]["message"], "Missing required field: abilities")
+        self.assertIn("Duplicate id_pokemon", errors[2]["message"])
+
+    def test_validate_records_rejects_non_integer_ids(self):
+        rows, errors = app.validate_records([make_publication([1]), make_publication({"id": 2}), make_publication(True)])
+
+        self.assertEqual(rows, [])
+        self.assertEqual([error["message"] for error in errors], ["id_pokemon must be an integer"] * 3)
+
+    @patch('bulk_publication.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_imports_in_chunks(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = mock_secrets
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        event = {
+            "body": json.dumps([make_publication(i) for i in range(1, 6)]),
+            "queryStringParameters": {"chunk_size": "2"}
+        }
+
+        response = app.lambda_handler(event, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])['imported'], 5)
+        self.assertEqual(mock_cursor.executemany.call_count, 3)
+        self.assertEqual([len(call.args[1]) for call in mock_cursor.executemany.call_args_list], [2, 2, 1])
+        mock_connection.commit.assert_called_once()
+
+    @patch('bulk_publication.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_rejects_invalid_batch(self, mock_connect, mock_get_secret):
+        event = {"body": json.dumps([make_publication(1), make_publication(2, dislikes_count=-5)])}
+
+        response = app.lambda_handler(event, None)
+
+        self.assertEqual(response['statusCode'], 422)
+        body = json.loads(response['body'])
+        self.assertEqual(body['errors'], [{"index": 1, "message": "dislikes_count cannot be negative"}])
+        mock_connect.assert_not_called()
+
+    @patch('bulk_publication.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_allow_partial_imports_valid_records(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = mock_secrets
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        event = {
+            "body": json.dumps([make_publication(1), {"pokemon_name": "Missing"}]),
+            "queryStringParameters": {"allow_partial": "true"}
+        }
+
+        response = app.lambda_handler(event, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        body = json.loads(response['body'])
+        self.assertEqual(body['imported'], 1)
+        self.assertEqual(body['rejected'], 1)
+
+    @patch('bulk_publication.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_rolls_back_on_duplicate_key(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = mock_secrets
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.executemany.side_effect = pymysql.IntegrityError(1062, "Duplicate entry '1' for key 'PRIMARY'")
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        response = app.lambda_handler({"body": json.dumps([make_publication(1)])}, None)
+
+        self.assertEqual(response['statusCode'], 409)
+        mock_connection.rollback.assert_called()
+        mock_connection.commit.assert_not_called()
+
+    def test_lambda_handler_invalid_body(self):
+        for body in ("not json", "[]", None):
+            response = app.lambda_handler({"body": body}, None)
+
+            self.assertEqual(response['statusCode'], 400)
@@ -51,6 +51,35 @@ class TestLambdaHandler(unittest.TestCase):
         response = lambda_handler(event, context)
         self.assertEqual(response['statusCode'], 200)
         self.assertEqual(json.loads(response['body']), {'message': 'User account confirmed successfully'})
+        mock_cognito_client.admin_add_user_to_group.assert_called_once_with(
+            UserPoolId='mock_pool_id', Username='testuser', GroupName='user')
+
+    @patch('sionpo_common.identity.time.sleep')
+    @patch('confirm_register.app.get_secret')
+    @patch('boto3.client')
+    def test_lambda_handler_group_assignment_retried(self, mock_boto_client, mock_get_secret, mock_sleep):
+        mock_get_secret.return_value = {
+            'USER_POOL_ID': 'mock_pool_id',
+            'CLIENT_ID': 'mock_client_id',
+            'CLIENT_SECRET': 'mock_client_secret'
+        }
+        mock_cognito_client = MagicMock()
+        mock_boto_client.return_value = mock_cognito_client
+        throttled = ClientError({"Error": {"Code": "TooManyRequestsException", "Message": "Rate exceeded"}},
+                                "AdminAddUserToGroup")
+        mock_cognito_client.admin_add_user_to_group.side_effect = [throttled, throttled, {}]
+
+        event = {'body': json.dumps({'username': 'testuser', 'confirmation_code': '123456'})}
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(mock_cognito_client.admin_add_user_to_group.call_count, 3)
+
+        mock_cognito_client.admin_add_user_to_group.side_effect = throttled
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 500)
+        self.assertIn('group assignment failed', json.loads(response['body'])['error'])
 
     @patch('confirm_register.app.get_secret')
     @patch('boto3.client')
@@ -0,0 +1,124 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pymysql
+from sionpo_common import db
+from sionpo_common.db import ConnectionManager
+
+mock_secrets = {'host': 'mock-host', 'username': 'mock-username', 'password': 'mock-password'}
+
+
+class TestConnect(unittest.TestCase):
+
+    @patch('pymysql.connect')
+    def test_access_denied_refetches_secret_once(self, mock_connect):
+        mock_connection = MagicMock()
+        mock_connect.side_effect = [pymysql.MySQLError(1045, "Access denied"), mock_connection]
+        get_secret = MagicMock(return_value=dict(mock_secrets, password='rotated'))
+
+        connection = db.connect(mock_secrets, get_secret)
+
+        self.assertIs(connection, mock_connection)
+        get_secret.assert_called_once_with(refresh=True)
+        self.assertEqual(mock_connect.call_args.kwargs['password'], 'rotated')
+
+    @patch('pymysql.connect')
+    def test_other_errors_are_not_retried(self, mock_connect):
+        mock_connect.side_effect = pymysql.MySQLError(2003, "Cannot connect")
+        get_secret = MagicMock()
+
+        with self.assertRaises(pymysql.MySQLError):
+            db.connect(mock_secrets, get_secret)
+        get_secret.assert_not_called()
+
+
+class TestConnectionManager(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = ConnectionManager()
+
+    def make_connection(self):
+        connection = MagicMock(spec=pymysql.connections.Connection)
+        connection.autocommit_mode = False
+        return connection
+
+    @patch('pymysql.connect')
+    def test_warm_invocation_reuses_connection(self, mock_connect):
+        mock_connect.return_value = self.make_connection()
+
+        first = self.manager.acquire(mock_secrets)
+        self.manager.release(first)
+        second = self.manager.acquire(mock_secrets)
+        self.manager.release(second)
+
+        self.assertIs(first, second)
+        mock_connect.assert_called_once()
+        first.ping.assert_called_once_with(reconnect=False)
+        self.assertEqual(self.manager.stats(), {"hits": 1, "misses": 1})
+
+    @patch('pymysql.connect')
+    def test_dead_connection_is_replaced(self, mock_connect):
+        dead = self.make_connection()
+        dead.ping.side_effect = pymysql.OperationalError(2006, "MySQL server has gone away")
+        fresh = self.make_connection()
+        mock_connect.side_effect = [dead, fresh]
+
+        self.manager.release(self.manager.acquire(mock_secrets))
+        connection = self.manager.acquire(mock_secrets)
+
+        self.assertIs(connection, fresh)
+        dead.close.assert_called_once()
+        self.assertEqual(self.manager.stats(), {"hits": 0, "misses": 2})
+
+    @patch('pymysql.connect')
+    def test_release_resets_autocommit(self, mock_connect):
+        connection = self.make_connection()
+        connection.autocommit_mode = True
+        mock_connect.return_value = connection
+
+        self.manager.release(self.manager.acquire(mock_secrets))
+
+        connection.rollback.assert_called_once()
+        connection.autocommit.assert_called_once_with(False)
+        connection.close.assert_not_called()
+
+    @patch('pymysql.connect')
+    def test_release_ends_read_only_transaction(self, mock_connect):
+        # Un SELECT abre la transacción pero termina en EOF, así que pymysql no marca server_status;
+        # release no puede fiarse de ese flag o la siguiente invocación lee un snapshot viejo
+        connection = self.make_connection()
+        mock_connect.return_value = connection
+
+        first = self.manager.acquire(mock_secrets)
+        with first.cursor() as cursor:
+            cursor.execute("SELECT version FROM CatalogVersion WHERE table_name = %s", ('Pokemon',))
+        self.manager.release(first)
+
+        connection.rollback.assert_called_once()
+        second = self.manager.acquire(mock_secrets)
+        self.assertIs(second, first)
+
+    @patch('pymysql.connect')
+    def test_concurrent_acquire_gets_one_off_connection(self, mock_connect):
+        pooled = self.make_connection()
+        extra = self.make_connection()
+        mock_connect.side_effect = [pooled, extra]
+
+        first = self.manager.acquire(mock_secrets)
+        second = self.manager.acquire(mock_secrets)
+        self.manager.release(second)
+
+        self.assertIs(first, pooled)
+        self.assertIs(second, extra)
+        extra.close.assert_called_once()
+        pooled.close.assert_not_called()
+
+    @patch('pymysql.connect')
+    def test_failed_connect_does_not_leave_manager_busy(self, mock_connect):
+        mock_connect.side_effect = [pymysql.OperationalError(2003, "Cannot connect"), self.make_connection()]
+
+        with self.assertRaises(pymysql.OperationalError):
+            self.manager.acquire(mock_secrets)
+        self.manager.acquire(mock_secrets)
+
+        self.assertEqual(self.manager.stats(), {"hits": 0, "misses": 2})
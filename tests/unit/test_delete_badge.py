@@ -160,4 +160,56 @@ class TestDeleteBadge(unittest.TestCase):
         response = app.lambda_handler(mock_body, None)
         self.assertEqual(response["statusCode"], 404)
         response_body = json.loads(response['body'])
-        self.assertIn("error", response_body)
\ No newline at end of file
+        self.assertIn("error", response_body)
+
+    @patch("delete_badges.app.get_secret")
+    @patch("delete_badges.app.pymysql.connect")
+    def test_lambda_handler_bulk_single_transaction(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'test_host',
+            'username': 'test_user',
+            'password': 'test_pass'
+        }
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.execute.side_effect = [4, 2]
+        mock_connect.return_value = mock_connection
+
+        event = {"body": json.dumps({"id_badges": [3, "5", 3, 9]})}
+        response = app.lambda_handler(event, None)
+
+        self.assertEqual(response["statusCode"], 200)
+        response_body = json.loads(response['body'])
+        self.assertEqual(response_body["deleted"], 2)
+        update_call, delete_call = mock_cursor.execute.call_args_list
+        self.assertEqual(update_call.args, (
+            "UPDATE Users SET fk_id_badge = NULL WHERE fk_id_badge IN (%s, %s, %s)", [3, 5, 9]))
+        self.assertEqual(delete_call.args, (
+            "DELETE FROM Badges WHERE id_badge IN (%s, %s, %s)", [3, 5, 9]))
+        mock_connection.commit.assert_called_once()
+
+    @patch("delete_badges.app.get_secret")
+    def test_lambda_handler_invalid_ids(self, mock_get_secret):
+        for ids in ([], ["x"], "1,2", list(range(app.MAX_IDS + 1))):
+            response = app.lambda_handler({"body": json.dumps({"id_badges": ids})}, None)
+            self.assertEqual(response["statusCode"], 400)
+        mock_get_secret.assert_not_called()
+
+    @patch("delete_badges.app.get_secret")
+    def test_lambda_handler_rejects_non_integer_ids(self, mock_get_secret):
+        for ids in ([2.7], [True], [1, False], ["1.5"], [[1]]):
+            response = app.lambda_handler({"body": json.dumps({"id_badges": ids})}, None)
+            self.assertEqual(response["statusCode"], 400)
+            self.assertEqual(json.loads(response['body'])["message"], "id_badge must be an integer")
+        response = app.lambda_handler({"body": json.dumps({"id_badge": 2.0})}, None)
+        self.assertEqual(response["statusCode"], 400)
+        mock_get_secret.assert_not_called()
+
+    @patch("delete_badges.app.get_secret")
+    def test_lambda_handler_non_object_body(self, mock_get_secret):
+        for body in ("5", "null", "[1, 2]", '"id_badge"'):
+            response = app.lambda_handler({"body": body}, None)
+            self.assertEqual(response["statusCode"], 400)
+            self.assertEqual(json.loads(response['body'])["message"], "Request body must be a JSON object")
+        mock_get_secret.assert_not_called()
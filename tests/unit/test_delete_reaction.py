@@ -178,4 +178,97 @@ class TestLambdaHandler(unittest.TestCase):
 
         self.assertEqual(response['statusCode'], 500)
         response_body = json.loads(response['body'])
-        self.assertEqual(response_body["error"], "An unexpected error occurred")
\ No newline at end of file
+        self.assertEqual(response_body["error"], "An unexpected error occurred")
+
+    @patch('delete_reaction.app.get_secret')
+    @patch('delete_reaction.app.pymysql.connect')
+    def test_lambda_handler_decrements_counter(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.execute.return_value = 1
+        mock_cursor.fetchone.return_value = (25, 'dislike')
+        mock_connect.return_value = mock_connection
+
+        response = app.lambda_handler(mock_body, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        statements = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        self.assertIn("FOR UPDATE", statements[0])
+        self.assertTrue(statements[1].startswith("DELETE FROM Interactions"))
+        self.assertIn("dislikes_count = GREATEST(dislikes_count, %s) - %s", statements[2])
+        self.assertEqual(mock_cursor.execute.call_args_list[2].args[1], (1, 1, 25))
+        self.assertIn("CatalogVersion", statements[3])
+        mock_connection.commit.assert_called_once()
+
+    @patch('delete_reaction.app.get_secret')
+    @patch('delete_reaction.app.pymysql.connect')
+    def test_lambda_handler_delete_by_natural_key(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.execute.return_value = 1
+        mock_connect.return_value = mock_connection
+
+        event = {"body": json.dumps({"Fk_id_user": 1, "Fk_id_pokemon": 25, "interaction_type": "like"})}
+
+        response = app.lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        # Primero se lee created_at para restar el aporte trending de la reacción
+        read_call, delete_call = mock_cursor.execute.call_args_list[:2]
+        self.assertIn("UNIX_TIMESTAMP(created_at)", read_call.args[0])
+        self.assertTrue(delete_call.args[0].startswith("DELETE FROM Interactions WHERE Fk_id_user"))
+        self.assertEqual(delete_call.args[1], (1, 25, 'like'))
+        mock_cursor.fetchone.assert_not_called()
+
+    @patch('delete_reaction.app.get_secret')
+    @patch('delete_reaction.app.pymysql.connect')
+    def test_lambda_handler_natural_key_not_found(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.execute.return_value = 0
+        mock_connect.return_value = mock_connection
+
+        event = {"body": json.dumps({"Fk_id_user": 1, "Fk_id_pokemon": 25, "interaction_type": "like"})}
+
+        response = app.lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 404)
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        self.assertTrue(mock_cursor.execute.call_args.args[0].startswith("DELETE FROM Interactions"))
+
+    def test_lambda_handler_incomplete_natural_key(self):
+        event = {"body": json.dumps({"Fk_id_user": 1, "interaction_type": "like"})}
+
+        response = app.lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 400)
+        self.assertEqual(json.loads(response['body'])["error"], "Missing required fields: Fk_id_pokemon")
+
+    def test_lambda_handler_body_not_an_object(self):
+        for body in ([1, 2], "id_interaction", 5):
+            response = app.lambda_handler({"body": json.dumps(body)}, {})
+
+            self.assertEqual(response['statusCode'], 400)
+            self.assertEqual(json.loads(response['body'])["error"], "Request body must be a JSON object")
+
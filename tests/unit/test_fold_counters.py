@@ -0,0 +1,120 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+from sionpo_common import reactions, trending
+
+from fold_counters import app
+
+mock_secrets = {
+    'host': 'mock-host',
+    'username': 'mock-username',
+    'password': 'mock-password'
+}
+
+
+class TestShardedCounters(unittest.TestCase):
+
+    @patch('sionpo_common.reactions.COUNTER_SHARDS', 8)
+    def test_adjust_counter_writes_random_shard_without_touching_pokemon(self):
+        cursor = MagicMock()
+
+        with patch('random.randrange', return_value=5):
+            reactions.adjust_counter(cursor, 25, 'dislike', -1)
+
+        cursor.execute.assert_called_once_with(reactions.SHARD_UPSERT_SQL, (25, 5, 0, -1))
+
+    @patch('sionpo_common.reactions.COUNTER_SHARDS', 8)
+    def test_add_batch_writes_one_shard_row_per_pokemon(self):
+        cursor = MagicMock()
+        cursor.execute.return_value = 2
+
+        reactions.add_batch(cursor, [(1, 25, 'like'), (2, 25, 'like')])
+
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        self.assertEqual(statements[2], reactions.SHARD_UPSERT_SQL)
+        self.assertEqual(cursor.execute.call_args_list[2].args[1][2:], (2, 0))
+        self.assertFalse(any("CatalogVersion" in statement for statement in statements))
+
+    @patch('sionpo_common.reactions.COUNTER_SHARDS', 8)
+    def test_add_writes_trending_to_a_shard(self):
+        cursor = MagicMock()
+        cursor.execute.return_value = 1
+
+        with patch('random.randrange', return_value=3):
+            reactions.add(cursor, 1, 25, 'like')
+
+        statements = [call.args for call in cursor.execute.call_args_list]
+        self.assertFalse(any("INTO TrendingScore " in sql for sql, _ in statements))
+        self.assertTrue(statements[-1][0].startswith("INSERT INTO TrendingScoreShard"))
+        self.assertEqual(statements[-1][1][:2], [25, 3])
+
+    def test_with_pending_counts_never_goes_negative(self):
+        record = {"likes_count": 1, "dislikes_count": 0, "pokemon_name": "Pikachu"}
+
+        reactions.with_pending_counts(record, {"likes_count": -3, "dislikes_count": 2})
+
+        self.assertEqual(record, {"likes_count": 0, "dislikes_count": 2, "pokemon_name": "Pikachu"})
+
+
+class TestFoldCounters(unittest.TestCase):
+
+    def test_fold_moves_shard_totals_into_pokemon(self):
+        connection = MagicMock()
+        cursor = MagicMock()
+        connection.cursor.return_value.__enter__.return_value = cursor
+        cursor.fetchall.side_effect = [
+            [(25,), (7,)],
+            [(25, 3, 0), (25, 4, 1), (7, 1, -1), (7, -1, 1)],
+            [],
+        ]
+
+        folded = app.fold(connection)
+
+        self.assertEqual(folded, 1)
+        statements = [call.args for call in cursor.execute.call_args_list]
+        self.assertIn("FOR UPDATE", statements[1][0])
+        self.assertTrue(statements[2][0].startswith("UPDATE Pokemon SET likes_count = GREATEST"))
+        self.assertEqual(statements[2][1], (7, 1, 25))
+        self.assertTrue(statements[3][0].startswith("UPDATE PokemonCounterShard SET likes_count = 0"))
+        self.assertEqual(statements[4][1], ('Pokemon', 0, 'Pokemon', 25))
+        connection.commit.assert_called_once()
+
+    def test_fold_uses_one_transaction_per_chunk(self):
+        connection = MagicMock()
+        cursor = MagicMock()
+        connection.cursor.return_value.__enter__.return_value = cursor
+        cursor.fetchall.side_effect = [[(1,), (2,), (3,)], [(1, 1, 0), (2, 1, 0)], [], [(3, 1, 0)], []]
+
+        self.assertEqual(app.fold(connection, chunk_size=2), 3)
+        self.assertEqual(connection.commit.call_count, 2)
+
+    def test_fold_merges_trending_shards(self):
+        connection = MagicMock()
+        cursor = MagicMock()
+        connection.cursor.return_value.__enter__.return_value = cursor
+        like = trending.log_weight('like')
+        cursor.fetchall.side_effect = [[(25,)], [], [(25, like), (25, like)]]
+
+        self.assertEqual(app.fold(connection), 1)
+
+        statements = [call.args for call in cursor.execute.call_args_list]
+        self.assertTrue(statements[-2][0].startswith("INSERT INTO TrendingScore (id_pokemon, score)"))
+        self.assertAlmostEqual(trending.current_score(statements[-2][1][1]), 2.0, places=3)
+        self.assertEqual(statements[-1], ("DELETE FROM TrendingScoreShard WHERE id_pokemon IN (%s)", [25]))
+        connection.commit.assert_called_once()
+
+    @patch('fold_counters.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = mock_secrets
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        response = app.lambda_handler({}, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body']), {"folded": 0})
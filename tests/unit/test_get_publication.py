@@ -122,3 +122,100 @@ class TestApp(unittest.TestCase):
         self.assertEqual(body, "Database error: Generic database error")
 
 # No if __name__ == '__main__': unittest.main()
+
+    @patch("get_publication.app.get_secret")
+    @patch("get_publication.app.pymysql.connect")
+    def test_lambda_handler_projects_fields(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'test_host',
+            'username': 'test_user',
+            'password': 'test_pass'
+        }
+
+        mock_connection = MagicMock()
+        mock_connect.return_value = mock_connection
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.fetchone.side_effect = [(4,), ('Pikachu', '["electric"]')]
+        mock_cursor.description = (('pokemon_name',), ('types',))
+
+        event = {"queryStringParameters": {"id_pokemon": "1", "fields": "pokemon_name, types"}}
+
+        result = app.lambda_handler(event, None)
+        self.assertEqual(result["statusCode"], 200)
+        mock_cursor.execute.assert_called_with(
+            "SELECT pokemon_name, types FROM Pokemon WHERE id_pokemon = %s AND deleted_at IS NULL", ("1",))
+        self.assertEqual(json.loads(result["body"]), {'pokemon_name': 'Pikachu', 'types': '["electric"]'})
+
+    @patch("get_publication.app.get_secret")
+    @patch("get_publication.app.pymysql.connect")
+    def test_lambda_handler_unknown_field(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'test_host',
+            'username': 'test_user',
+            'password': 'test_pass'
+        }
+
+        mock_connection = MagicMock()
+        mock_connect.return_value = mock_connection
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+
+        event = {"queryStringParameters": {"id_pokemon": "1", "fields": "pokemon_name,password"}}
+
+        result = app.lambda_handler(event, None)
+        self.assertEqual(result["statusCode"], 400)
+        self.assertIn("Unknown field: password", json.loads(result["body"]))
+        mock_cursor.execute.assert_not_called()
+
+    @patch("get_publication.app.get_secret")
+    @patch("get_publication.app.pymysql.connect")
+    def test_lambda_handler_serves_cached_row_until_version_changes(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'test_host',
+            'username': 'test_user',
+            'password': 'test_pass'
+        }
+
+        mock_connection = MagicMock()
+        mock_connect.return_value = mock_connection
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.description = (('id_pokemon',), ('pokemon_name',))
+        mock_cursor.fetchone.side_effect = [(3,), (1, 'Pikachu'), (3,), (4,), (1, 'Raichu')]
+
+        first = app.lambda_handler(mock_event, None)
+        second = app.lambda_handler(mock_event, None)
+        third = app.lambda_handler(mock_event, None)
+
+        self.assertEqual(first["headers"]["X-Cache"], "MISS")
+        self.assertEqual(second["headers"]["X-Cache"], "HIT")
+        self.assertEqual(second["body"], first["body"])
+        self.assertEqual(third["headers"]["X-Cache"], "MISS")
+        self.assertEqual(json.loads(third["body"])["pokemon_name"], "Raichu")
+        self.assertEqual(mock_cursor.execute.call_count, 5)
+
+    @patch("sionpo_common.reactions.COUNTER_SHARDS", 8)
+    @patch("get_publication.app.get_secret")
+    @patch("get_publication.app.pymysql.connect")
+    def test_lambda_handler_adds_pending_shard_counts(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'test_host',
+            'username': 'test_user',
+            'password': 'test_pass'
+        }
+
+        mock_connection = MagicMock()
+        mock_connect.return_value = mock_connection
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.description = (('id_pokemon',), ('likes_count',), ('dislikes_count',))
+        mock_cursor.fetchone.side_effect = [(3,), (5, -1), (1, 10, 2), (3,), (6, -1)]
+
+        first = app.lambda_handler(mock_event, None)
+        second = app.lambda_handler(mock_event, None)
+
+        self.assertEqual(json.loads(first["body"]), {"id_pokemon": 1, "likes_count": 15, "dislikes_count": 1})
+        self.assertEqual(second["headers"]["X-Cache"], "HIT")
+        self.assertEqual(json.loads(second["body"])["likes_count"], 16)
+        self.assertNotEqual(first["headers"]["ETag"], second["headers"]["ETag"])
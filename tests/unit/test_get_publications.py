@@ -4,6 +4,10 @@ import json
 import pymysql
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
 from get_data_all_pokemon.app import get_secret, lambda_handler
+from sionpo_common import json_stream, pokemon, response_cache
+from sionpo_common.pagination import encode_cursor
+
+ALL_COLUMNS = pokemon.select_list(None)
 
 
 class TestLambdaHandler(unittest.TestCase):
@@ -284,3 +288,188 @@ class TestLambdaHandler(unittest.TestCase):
         self.assertIn('Some general MySQL error', response['body'])
 
 
+
+    @patch('get_data_all_pokemon.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_first_page(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.description = [('id_pokemon',), ('pokemon_name',)]
+        mock_cursor.fetchall.return_value = [(1, 'Bulbasaur'), (2, 'Ivysaur'), (3, 'Venusaur')]
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        event = {'queryStringParameters': {'limit': '2'}}
+
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        mock_cursor.execute.assert_called_with(
+            f"SELECT {ALL_COLUMNS} FROM Pokemon WHERE deleted_at IS NULL ORDER BY id_pokemon LIMIT %s", (3,))
+        body = json.loads(response['body'])
+        self.assertEqual([item['id_pokemon'] for item in body['items']], [1, 2])
+        self.assertEqual(body['next_cursor'], encode_cursor(2))
+
+    @patch('get_data_all_pokemon.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_next_page_uses_keyset(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.description = [('id_pokemon',), ('pokemon_name',)]
+        mock_cursor.fetchall.return_value = [(3, 'Venusaur')]
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        event = {'queryStringParameters': {'limit': '2', 'cursor': encode_cursor(2)}}
+
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        mock_cursor.execute.assert_called_with(
+            f"SELECT {ALL_COLUMNS} FROM Pokemon WHERE deleted_at IS NULL AND id_pokemon > %s "
+            "ORDER BY id_pokemon LIMIT %s", (2, 3))
+        body = json.loads(response['body'])
+        self.assertEqual(body['items'], [{'id_pokemon': 3, 'pokemon_name': 'Venusaur'}])
+        self.assertIsNone(body['next_cursor'])
+
+    def test_lambda_handler_invalid_page_params(self):
+        for params in ({'limit': '0'}, {'limit': 'abc'}, {'limit': '1000'}, {'cursor': 'not-a-cursor'}):
+            response = lambda_handler({'queryStringParameters': params}, {})
+
+            self.assertEqual(response['statusCode'], 400)
+
+    @patch('get_data_all_pokemon.app.STREAM_FULL_CATALOG', True)
+    @patch('get_data_all_pokemon.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_streams_full_catalog(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        rows = [(1, 'Bulbasaur'), (2, 'Ivysaur'), (3, 'Venusaur')]
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.side_effect = [rows[:2], rows[2:], []]
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        response = lambda_handler({}, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        mock_connection.cursor.assert_called_with(pymysql.cursors.SSCursor)
+        mock_cursor.fetchall.assert_not_called()
+        self.assertEqual(response['body'], json.dumps(rows, default=str))
+
+    def test_json_stream_matches_json_dumps(self):
+        for rows in ([], [(1, 'Bulbasaur', None)], [(i, f'Pokemon {i}', '2024-06-01') for i in range(7)]):
+            mock_cursor = MagicMock()
+            chunks = [rows[i:i + 3] for i in range(0, len(rows), 3)] + [[]]
+            mock_cursor.fetchmany.side_effect = chunks
+
+            self.assertEqual(json_stream.dumps_rows(mock_cursor, chunk_rows=3), json.dumps(rows, default=str))
+
+    @patch('get_data_all_pokemon.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_page_with_fields_keeps_sort_key(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.description = [('id_pokemon',), ('pokemon_name',), ('image',)]
+        mock_cursor.fetchall.return_value = [(1, 'Bulbasaur', 'b.png')]
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        event = {'queryStringParameters': {'limit': '10', 'fields': 'pokemon_name,image'}}
+
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        mock_cursor.execute.assert_called_with(
+            "SELECT id_pokemon, pokemon_name, image FROM Pokemon WHERE deleted_at IS NULL "
+            "ORDER BY id_pokemon LIMIT %s", (11,))
+
+    def test_lambda_handler_rejects_unknown_field(self):
+        response = lambda_handler({'queryStringParameters': {'fields': 'pokemon_name;DROP TABLE Pokemon'}}, {})
+
+        self.assertEqual(response['statusCode'], 400)
+
+    @patch('get_data_all_pokemon.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_returns_etag(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (7,)
+        mock_cursor.fetchall.return_value = [(1, 'Bulbasaur')]
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        response = lambda_handler({}, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertTrue(response['headers']['ETag'].startswith('"7-'))
+
+    @patch('get_data_all_pokemon.app.time.time', return_value=1000.0)
+    @patch('get_data_all_pokemon.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_not_modified_skips_query(self, mock_connect, mock_get_secret, mock_time):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (7,)
+        mock_cursor.fetchall.return_value = [(1, 'Bulbasaur')]
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        etag = lambda_handler({}, {})['headers']['ETag']
+        mock_cursor.reset_mock()
+
+        response = lambda_handler({'headers': {'if-none-match': f'W/{etag}'}}, {})
+
+        self.assertEqual(response['statusCode'], 304)
+        self.assertEqual(response['headers']['ETag'], etag)
+        self.assertEqual(response['body'], '')
+        mock_cursor.execute.assert_called_once()
+        mock_cursor.fetchall.assert_not_called()
+
+        mock_cursor.fetchone.return_value = (8,)
+        response = lambda_handler({'headers': {'If-None-Match': etag}}, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertNotEqual(response['headers']['ETag'], etag)
+
+        # Los contadores no cambian la versión de tabla: la ETag caduca con la ventana de la caché
+        mock_cursor.fetchone.return_value = (7,)
+        mock_time.return_value = 1000.0 + response_cache.RESPONSE_CACHE_TTL
+        response = lambda_handler({'headers': {'If-None-Match': etag}}, {})
+
+        self.assertEqual(response['statusCode'], 200)
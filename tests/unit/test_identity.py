@@ -0,0 +1,186 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+import jwt
+from botocore.exceptions import ClientError
+from sionpo_common import identity, jwks, secret_cache
+
+from confirm_register import app as confirm_register_app
+from delete_publication import app as delete_publication_app
+from import_users import app as import_users_app
+from login import app as login_app
+from register_user import app as register_user_app
+
+
+def call(handler, **body):
+    response = handler({'body': json.dumps(body)}, None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+class TestLocalCognito(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Generar la clave RSA es lo caro; un pool por clase, usuarios distintos por prueba
+        cls.cognito = identity.LocalCognito(user_pool_id=delete_publication_app.USERPOOL_ID,
+                                            client_id=delete_publication_app.APP_CLIENT_ID)
+
+    def setUp(self):
+        identity.set_client(self.cognito)
+        secret_cache.get_secret('cognitoKeys', self.cognito.secrets)
+        patcher = patch.multiple(login_app, key_stores={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def register(self, username, password="Secret123!"):
+        return call(register_user_app.lambda_handler, username=username, password=password,
+                    email=f"{username}@example.com", picture="https://example.com/p.png")
+
+    def test_register_confirm_login_through_handlers(self):
+        status, registered = self.register("ash")
+        self.assertEqual(status, 200)
+
+        status, _ = call(confirm_register_app.lambda_handler, username="ash",
+                         confirmation_code=self.cognito.confirmation_code("ash"))
+        self.assertEqual(status, 200)
+
+        status, tokens = call(login_app.lambda_handler, username="ash", password="Secret123!")
+        self.assertEqual(status, 200)
+        self.assertEqual(tokens['role'], 'user')
+        claims = jwt.decode(tokens['id_token'], options={"verify_signature": False})
+        self.assertEqual(claims['sub'], registered['user_sub'])
+        self.assertEqual(claims['email'], "ash@example.com")
+
+    def test_login_before_confirmation_fails(self):
+        self.register("brock")
+
+        status, body = call(login_app.lambda_handler, username="brock", password="Secret123!")
+
+        self.assertEqual(status, 400)
+        self.assertIn('UserNotConfirmedException', body['error'])
+
+    def test_duplicate_username_and_wrong_code(self):
+        self.register("misty")
+
+        status, body = self.register("misty")
+        self.assertIn('UsernameExistsException', body['error'])
+        status, body = call(confirm_register_app.lambda_handler, username="misty", confirmation_code="bad")
+        self.assertIn('CodeMismatchException', body['error'])
+
+    def test_secret_hash_is_checked(self):
+        with self.assertRaises(ClientError) as context:
+            self.cognito.sign_up(ClientId=self.cognito.client_id, Username="gary", Password="x", SecretHash="wrong")
+
+        self.assertEqual(context.exception.response['Error']['Code'], 'NotAuthorizedException')
+
+    def test_delete_publication_verifies_local_tokens(self):
+        self.register("dawn")
+        call(confirm_register_app.lambda_handler, username="dawn",
+             confirmation_code=self.cognito.confirmation_code("dawn"))
+        _, tokens = call(login_app.lambda_handler, username="dawn", password="Secret123!")
+
+        with patch.object(delete_publication_app, "key_store", identity.key_store(delete_publication_app.JWKS_URL)), \
+                patch.object(delete_publication_app, "token_cache", jwks.TokenCache()):
+            claims = delete_publication_app.verify_token(tokens['id_token'])
+
+        self.assertEqual(claims['cognito:username'], "dawn")
+        self.assertEqual(claims['cognito:groups'], ['user'])
+
+    def test_repeated_confirm_repairs_missing_group(self):
+        self.register("iris")
+        code = self.cognito.confirmation_code("iris")
+        throttled = ClientError({"Error": {"Code": "TooManyRequestsException", "Message": "Rate exceeded"}},
+                                "AdminAddUserToGroup")
+
+        with patch.object(self.cognito, 'admin_add_user_to_group', side_effect=throttled), \
+                patch('sionpo_common.identity.time.sleep'):
+            status, _ = call(confirm_register_app.lambda_handler, username="iris", confirmation_code=code)
+        self.assertEqual(status, 500)
+
+        status, body = call(confirm_register_app.lambda_handler, username="iris", confirmation_code=code)
+
+        self.assertEqual((status, body['message']), (200, 'User account already confirmed'))
+        groups = self.cognito.admin_list_groups_for_user(Username="iris", UserPoolId=self.cognito.user_pool_id)
+        self.assertEqual([group['GroupName'] for group in groups['Groups']], ['user'])
+
+    def test_login_adds_default_group_to_user_confirmed_outside_the_api(self):
+        self.register("cilan")
+        # Confirmado directamente en el pool (consola o API admin): confirm_register nunca corre
+        self.cognito.confirm_sign_up(ClientId=self.cognito.client_id, Username="cilan",
+                                     ConfirmationCode=self.cognito.confirmation_code("cilan"),
+                                     SecretHash=identity.secret_hash("cilan", self.cognito.client_id,
+                                                                     self.cognito.client_secret))
+
+        status, tokens = call(login_app.lambda_handler, username="cilan", password="Secret123!")
+
+        self.assertEqual((status, tokens['role']), (200, 'user'))
+        claims = jwt.decode(tokens['id_token'], options={"verify_signature": False})
+        self.assertEqual(claims['cognito:groups'], ['user'])
+
+    def test_imported_user_sets_password_on_first_login(self):
+        import_users_app.import_users(self.cognito, self.cognito.user_pool_id,
+                                      [{"index": 0, "username": "serena", "email": "serena@example.com",
+                                        "picture": "", "group": "user"}], rate=1000)
+        temporary = self.cognito.temporary_password("serena")
+
+        status, body = call(login_app.lambda_handler, username="serena", password=temporary)
+        self.assertEqual((status, body['challenge']), (403, 'NEW_PASSWORD_REQUIRED'))
+
+        status, tokens = call(login_app.lambda_handler, username="serena", password=temporary,
+                              new_password="Secret123!")
+        self.assertEqual((status, tokens['role']), (200, 'user'))
+
+        status, _ = call(login_app.lambda_handler, username="serena", password="Secret123!")
+        self.assertEqual(status, 200)
+
+    def test_load_jwks_uses_url_without_local_provider(self):
+        identity.set_client(None)
+
+        with patch('sionpo_common.jwks.load_jwks', return_value={"keys": []}) as mock_load:
+            identity.load_jwks("https://example.com/jwks.json")
+
+        mock_load.assert_called_once_with("https://example.com/jwks.json", 5)
+
+
+class TestRetryAndRateLimit(unittest.TestCase):
+
+    def test_call_with_retry_backs_off_on_throttling_only(self):
+        throttled = ClientError({"Error": {"Code": "TooManyRequestsException", "Message": "Rate exceeded"}}, "Op")
+        operation = MagicMock(side_effect=[throttled, throttled, "ok"])
+        delays = []
+
+        result = identity.call_with_retry(operation, sleep=delays.append, Username="ash")
+
+        self.assertEqual(result, "ok")
+        self.assertEqual(operation.call_count, 3)
+        self.assertTrue(0 <= delays[0] <= identity.RETRY_BASE_DELAY and 0 <= delays[1] <= 2 * identity.RETRY_BASE_DELAY)
+
+        other = ClientError({"Error": {"Code": "UserNotFoundException", "Message": "missing"}}, "Op")
+        with self.assertRaises(ClientError):
+            identity.call_with_retry(MagicMock(side_effect=other), sleep=delays.append)
+        self.assertEqual(len(delays), 2)
+
+    def test_rate_limiter_spaces_calls_after_burst(self):
+        now = [0.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        limiter = identity.RateLimiter(rate=10, burst=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(5):
+            limiter.acquire()
+
+        # 2 de ráfaga y 3 más a 10 por segundo
+        self.assertAlmostEqual(now[0], 0.3)
+
+    @patch('boto3.client')
+    def test_get_client_is_created_once(self, mock_boto_client):
+        identity.set_client(None)
+
+        self.assertIs(identity.get_client(), identity.get_client())
+        mock_boto_client.assert_called_once_with('cognito-idp')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import json
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+from botocore.exceptions import ClientError, EndpointConnectionError
+from sionpo_common import identity
+
+from import_users import app
+
+CSV_BODY = """username,email,picture,group
+ash,ash@example.com,https://example.com/ash.png,
+misty,misty@example.com,,moderator
+"""
+
+
+class ThrottlingCognito(identity.LocalCognito):
+    """LocalCognito that throttles the first call per user and records peak concurrency."""
+
+    def __init__(self):
+        super().__init__()
+        self.throttled = set()
+        self.active = 0
+        self.peak = 0
+        self._count_lock = threading.Lock()
+
+    def admin_create_user(self, **kwargs):
+        with self._count_lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if kwargs['Username'] not in self.throttled:
+                self.throttled.add(kwargs['Username'])
+                raise ClientError({"Error": {"Code": "TooManyRequestsException", "Message": "Rate exceeded"}},
+                                  "AdminCreateUser")
+            return super().admin_create_user(**kwargs)
+        finally:
+            with self._count_lock:
+                self.active -= 1
+
+
+class TestImportUsers(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cognito = identity.LocalCognito()
+
+    def test_parse_csv_and_ndjson(self):
+        from_csv = app.parse_records(CSV_BODY)
+        from_ndjson = app.parse_records('{"username": "ash", "email": "a@x.com"}\n{"username": "b", "email": "b@x.com"}')
+
+        self.assertEqual([record['username'] for record in from_csv], ['ash', 'misty'])
+        self.assertEqual(from_csv[1]['group'], 'moderator')
+        self.assertEqual(len(from_ndjson), 2)
+
+    def test_validate_records_reports_bad_rows(self):
+        users, errors = app.validate_records([
+            {"username": "ash", "email": "ash@example.com"},
+            {"username": "ash", "email": "other@example.com"},
+            {"username": "brock"},
+            {"username": "gary", "email": "gary@example.com", "group": "admin"},
+        ])
+
+        self.assertEqual([user['username'] for user in users], ['ash'])
+        self.assertEqual([error['index'] for error in errors], [1, 2, 3])
+
+    def test_validate_records_rejects_malformed_records(self):
+        users, errors = app.validate_records([
+            ["ash", "ash@example.com"],
+            "misty",
+            {"username": ["brock"], "email": "brock@example.com"},
+            {"username": "gary", "email": 7},
+            {"username": "dawn", "email": "dawn@example.com"},
+        ])
+
+        self.assertEqual([user['username'] for user in users], ['dawn'])
+        self.assertEqual([error['message'] for error in errors],
+                         ["Record must be an object"] * 2 + ["username, email, picture and group must be strings"] * 2)
+
+    def test_import_creates_users_and_groups(self):
+        cognito = identity.LocalCognito()
+        users, _ = app.validate_records(app.parse_records(CSV_BODY))
+
+        stats = app.import_users(cognito, cognito.user_pool_id, users, max_workers=4, rate=1000)
+
+        self.assertEqual(stats['created'], 2)
+        groups = cognito.admin_list_groups_for_user(Username='misty', UserPoolId=cognito.user_pool_id)
+        self.assertEqual(groups['Groups'][0]['GroupName'], 'moderator')
+
+    def test_reimport_only_completes_groups(self):
+        cognito = identity.LocalCognito()
+        users, _ = app.validate_records(app.parse_records(CSV_BODY))
+        app.import_users(cognito, cognito.user_pool_id, users, rate=1000)
+
+        stats = app.import_users(cognito, cognito.user_pool_id, users, rate=1000)
+
+        self.assertEqual((stats['created'], stats['exists'], stats['failed']), (0, 2, 0))
+
+    @patch('sionpo_common.identity.time.sleep')
+    def test_throttling_is_retried_within_bounded_pool(self, mock_sleep):
+        cognito = ThrottlingCognito()
+        users, _ = app.validate_records([{"username": f"user{i}", "email": f"u{i}@x.com"} for i in range(20)])
+
+        stats = app.import_users(cognito, cognito.user_pool_id, users, max_workers=3, rate=1000)
+
+        self.assertEqual(stats['created'], 20)
+        self.assertLessEqual(cognito.peak, 3)
+        self.assertEqual(mock_sleep.call_count, 20)
+
+    def test_users_after_deadline_are_skipped(self):
+        cognito = identity.LocalCognito()
+        users, _ = app.validate_records([{"username": f"user{i}", "email": f"u{i}@x.com"} for i in range(5)])
+        remaining = iter([60000, 60000] + [1000] * 3)
+
+        stats = app.import_users(cognito, cognito.user_pool_id, users, max_workers=1, rate=1000,
+                                 time_left=lambda: next(remaining))
+
+        self.assertEqual((stats['created'], stats['skipped']), (2, 3))
+
+    def test_unexpected_errors_fail_only_that_user(self):
+        cognito = identity.LocalCognito()
+        users, _ = app.validate_records(app.parse_records(CSV_BODY))
+        create_user = cognito.admin_create_user
+
+        def admin_create_user(**kwargs):
+            if kwargs['Username'] == 'ash':
+                raise EndpointConnectionError(endpoint_url="https://cognito-idp.us-east-2.amazonaws.com")
+            return create_user(**kwargs)
+
+        cognito.admin_create_user = admin_create_user
+        stats = app.import_users(cognito, cognito.user_pool_id, users, max_workers=2, rate=1000)
+
+        self.assertEqual((stats['created'], stats['failed']), (1, 1))
+        self.assertEqual(stats['errors'][0]['username'], 'ash')
+        self.assertTrue(stats['errors'][0]['message'].startswith("EndpointConnectionError: "))
+
+    @patch('import_users.app.get_secret')
+    def test_lambda_handler(self, mock_get_secret):
+        cognito = identity.LocalCognito()
+        identity.set_client(cognito)
+        mock_get_secret.return_value = cognito.secrets()
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 900000
+
+        response = app.lambda_handler({"body": CSV_BODY + "brock,,,\n"}, context)
+
+        self.assertEqual(response['statusCode'], 200)
+        body = json.loads(response['body'])
+        self.assertEqual((body['created'], body['rejected']), (2, 1))
+
+    def test_lambda_handler_missing_body(self):
+        response = app.lambda_handler({}, None)
+
+        self.assertEqual(response['statusCode'], 400)
+
+    @patch('import_users.app.get_secret')
+    def test_lambda_handler_invalid_options(self, mock_get_secret):
+        for options in ({"rate": 0}, {"rate": -1}, {"rate": "nan"}, {"rate": "fast"}, {"max_workers": 0}):
+            response = app.lambda_handler(dict(options, body=CSV_BODY), None)
+
+            self.assertEqual(response['statusCode'], 400)
+        mock_get_secret.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
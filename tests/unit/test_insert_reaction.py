@@ -3,6 +3,7 @@ from unittest.mock import patch, MagicMock
 import json
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
 import pymysql
+from sionpo_common import reaction_queue, trending
 from post_reaction.app import get_secret, lambda_handler
 
 
@@ -55,6 +56,211 @@ class TestLambdaHandler(unittest.TestCase):
         response_body = json.loads(response['body'])
         self.assertEqual(response_body['message'], 'Interacción añadida exitosamente')
 
+    @patch('post_reaction.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_increments_counter_in_same_transaction(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor.execute.return_value = 1
+        mock_connect.return_value = mock_connection
+        mock_connection.attach_mock(mock_cursor.execute, 'execute')
+
+        event = {
+            "body": json.dumps({
+                "Fk_id_user": 1,
+                "Fk_id_pokemon": 25,
+                "interaction_type": "like"
+            })
+        }
+
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        calls = [call for call in mock_connection.mock_calls if call[0] in ('execute', 'commit')]
+        self.assertEqual([call[0] for call in calls], ['execute', 'execute', 'execute', 'execute', 'execute', 'commit'])
+        self.assertIn("deleted_at IS NOT NULL", calls[0].args[0])
+        self.assertIn("ON DUPLICATE KEY UPDATE", calls[1].args[0])
+        self.assertEqual(calls[2].args, ("UPDATE Pokemon SET likes_count = likes_count + %s WHERE id_pokemon = %s", (1, 25)))
+        self.assertIn("CatalogVersion", calls[3].args[0])
+        self.assertIn("INSERT INTO TrendingScore", calls[4].args[0])
+
+    @patch('post_reaction.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_duplicate_is_idempotent(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.execute.return_value = 0
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        event = {
+            "body": json.dumps({
+                "Fk_id_user": 1,
+                "Fk_id_pokemon": 25,
+                "interaction_type": "like"
+            })
+        }
+
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertFalse(json.loads(response['body'])['created'])
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        mock_connection.commit.assert_called_once()
+
+    @patch('post_reaction.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_toggle_removes_existing(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = [1, 0, 1, 1, 1, 1, 1]
+        mock_cursor.fetchall.side_effect = [[], [(25, 'like', 1717545600)]]
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        event = {
+            "body": json.dumps({
+                "Fk_id_user": 1,
+                "Fk_id_pokemon": 25,
+                "interaction_type": "like",
+                "toggle": True
+            })
+        }
+
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        response_body = json.loads(response['body'])
+        self.assertTrue(response_body['removed'])
+        self.assertEqual(response_body['message'], 'Interacción eliminada exitosamente')
+        statements = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        self.assertIn("UNIX_TIMESTAMP(created_at)", statements[2])
+        self.assertTrue(statements[3].startswith("DELETE FROM Interactions WHERE Fk_id_user"))
+        self.assertIn("likes_count = GREATEST(likes_count, %s) - %s", statements[4])
+        self.assertEqual(statements[-1], trending.SUBTRACT_SQL)
+        self.assertEqual(mock_cursor.execute.call_args.args[1],
+                         (trending.log_weight('like', 1717545600), trending.MIN_FRACTION, 25))
+
+    @patch('post_reaction.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_favorite_has_no_counter(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        event = {
+            "body": json.dumps({
+                "Fk_id_user": 1,
+                "Fk_id_pokemon": 25,
+                "interaction_type": "favorite"
+            })
+        }
+
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+
+    @patch('post_reaction.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_deleted_pokemon(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(25,)]
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        event = {
+            "body": json.dumps({
+                "Fk_id_user": 1,
+                "Fk_id_pokemon": "25",
+                "interaction_type": "like"
+            })
+        }
+
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 404)
+        mock_cursor.execute.assert_called_once()
+        mock_connection.commit.assert_not_called()
+
+    @patch('post_reaction.app.REACTION_WRITE_MODE', 'async')
+    @patch('post_reaction.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_async_mode_enqueues(self, mock_connect, mock_get_secret):
+        queue = reaction_queue.MemoryQueue()
+        reaction_queue.set_queue(queue)
+
+        event = {
+            "body": json.dumps({
+                "Fk_id_user": 1,
+                "Fk_id_pokemon": 25,
+                "interaction_type": "like"
+            })
+        }
+
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 202)
+        mock_get_secret.assert_not_called()
+        mock_connect.assert_not_called()
+        self.assertEqual(json.loads(queue.receive()[0]['body']),
+                         {"Fk_id_user": 1, "Fk_id_pokemon": 25, "interaction_type": "like"})
+
+    @patch('post_reaction.app.REACTION_WRITE_MODE', 'async')
+    def test_lambda_handler_async_mode_validates_first(self):
+        queue = reaction_queue.MemoryQueue()
+        reaction_queue.set_queue(queue)
+
+        response = lambda_handler({"body": json.dumps({"Fk_id_user": 1})}, {})
+
+        self.assertEqual(response['statusCode'], 400)
+        self.assertEqual(len(queue), 0)
+
+    @patch('post_reaction.app.REACTION_WRITE_MODE', 'async')
+    def test_lambda_handler_async_mode_missing_body(self):
+        queue = reaction_queue.MemoryQueue()
+        reaction_queue.set_queue(queue)
+
+        for event in ({}, {"body": None}):
+            response = lambda_handler(event, {})
+
+            self.assertEqual(response['statusCode'], 400)
+            self.assertEqual(json.loads(response['body'])['message'], "Missing request body")
+        self.assertEqual(len(queue), 0)
+
     @patch('post_reaction.app.get_secret')
     @patch('pymysql.connect')
     def test_lambda_handler_missing_fields(self, mock_connect, mock_get_secret):
@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+from sionpo_common import jwks
+
+from delete_publication import app as delete_publication_app
+
+AUDIENCE = "5s5c1ofpkq30gkbt61q1hdicfd"
+
+
+def make_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def write_jwks(path, keys):
+    entries = []
+    for kid, private_key in keys.items():
+        jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+        jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+        entries.append(jwk)
+    Path(path).write_text(json.dumps({"keys": entries}))
+
+
+def sign(private_key, kid, expires_in=3600, **claims):
+    payload = {"sub": "user-1", "aud": AUDIENCE, "exp": int(time.time()) + expires_in}
+    payload.update(claims)
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+class TestJWKS(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.key_a = make_key()
+        cls.key_b = make_key()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "jwks.json")
+        self.url = Path(self.path).as_uri()
+        write_jwks(self.path, {"kid-a": self.key_a})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_verifies_locally_signed_token_from_file_jwks(self):
+        store = jwks.JWKSKeyStore(self.url)
+
+        claims = jwks.verify(sign(self.key_a, "kid-a"), store, AUDIENCE)
+
+        self.assertEqual(claims["sub"], "user-1")
+        self.assertEqual(store.fetches, 1)
+
+    def test_keys_are_reused_until_ttl(self):
+        store = jwks.JWKSKeyStore(self.url)
+
+        jwks.verify(sign(self.key_a, "kid-a"), store, AUDIENCE)
+        jwks.verify(sign(self.key_a, "kid-a", sub="user-2"), store, AUDIENCE)
+
+        self.assertEqual(store.fetches, 1)
+
+    def test_unknown_kid_triggers_refresh(self):
+        now = [0]
+        store = jwks.JWKSKeyStore(self.url, min_refresh_interval=30, clock=lambda: now[0])
+        jwks.verify(sign(self.key_a, "kid-a"), store, AUDIENCE)
+
+        write_jwks(self.path, {"kid-a": self.key_a, "kid-b": self.key_b})
+        now[0] = 31
+        claims = jwks.verify(sign(self.key_b, "kid-b"), store, AUDIENCE)
+
+        self.assertEqual(claims["sub"], "user-1")
+        self.assertEqual(store.fetches, 2)
+
+    def test_unknown_kid_refresh_is_rate_limited(self):
+        store = jwks.JWKSKeyStore(self.url, min_refresh_interval=30, clock=lambda: 0)
+        jwks.verify(sign(self.key_a, "kid-a"), store, AUDIENCE)
+
+        with self.assertRaises(jwt.InvalidTokenError):
+            jwks.verify(sign(self.key_b, "kid-b"), store, AUDIENCE)
+        self.assertEqual(store.fetches, 1)
+
+    def test_token_cache_skips_signature_check(self):
+        store = jwks.JWKSKeyStore(self.url)
+        cache = jwks.TokenCache()
+        token = sign(self.key_a, "kid-a")
+
+        jwks.verify(token, store, AUDIENCE, cache)
+        with patch("jwt.decode") as mock_decode:
+            claims = jwks.verify(token, store, AUDIENCE, cache)
+
+        mock_decode.assert_not_called()
+        self.assertEqual(claims["sub"], "user-1")
+
+    def test_token_cache_honours_exp_and_size(self):
+        now = [1000]
+        cache = jwks.TokenCache(max_size=2, clock=lambda: now[0])
+        cache.put("t1", {"exp": 1010})
+        cache.put("t2", {"exp": 2000})
+        cache.put("t3", {"exp": 2000})
+
+        self.assertIsNone(cache.get("t1"))
+        now[0] = 1500
+        self.assertEqual(cache.get("t2"), {"exp": 2000})
+        now[0] = 2000
+        self.assertIsNone(cache.get("t3"))
+
+    def test_delete_publication_verify_token_offline(self):
+        store = jwks.JWKSKeyStore(self.url)
+        with patch.object(delete_publication_app, "key_store", store), \
+                patch.object(delete_publication_app, "token_cache", jwks.TokenCache()):
+            claims = delete_publication_app.verify_token(sign(self.key_a, "kid-a"))
+            self.assertEqual(claims["aud"], AUDIENCE)
+
+            with self.assertRaisesRegex(Exception, "Token has expired"):
+                delete_publication_app.verify_token(sign(self.key_a, "kid-a", expires_in=-10))
+            with self.assertRaisesRegex(Exception, "Invalid token"):
+                delete_publication_app.verify_token(sign(self.key_a, "kid-a", aud="other-client"))
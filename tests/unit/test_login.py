@@ -1,10 +1,25 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import json
+import os
+import tempfile
+import time
+from pathlib import Path
 
+import jwt
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+from sionpo_common import identity
+from login import app
 from login.app import lambda_handler, get_secret
 
+mock_cognito_secrets = {
+    'USER_POOL_ID': 'us-east-2_mockpool',
+    'CLIENT_ID': 'mock_client_id',
+    'CLIENT_SECRET': 'mock_client_secret'
+}
+
 
 class TestLambdaHandler(unittest.TestCase):
 
@@ -274,4 +289,210 @@ class TestLambdaHandler(unittest.TestCase):
         self.assertEqual(response['statusCode'], 500)
         data = json.loads(response['body'])
         self.assertIn('error', data)
-        self.assertIn('Internal server error: General error', data['error'])
\ No newline at end of file
+        self.assertIn('Internal server error: General error', data['error'])
+
+
+class LocalJWKSTestCase(unittest.TestCase):
+    """Points login at a JWKS file holding the public half of a test RSA key."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "jwks.json")
+        jwk = json.loads(RSAAlgorithm.to_jwk(self.private_key.public_key()))
+        jwk.update({"kid": "kid-1", "alg": "RS256", "use": "sig"})
+        Path(path).write_text(json.dumps({"keys": [jwk]}))
+        patcher = patch.multiple(app, JWKS_URL=Path(path).as_uri(), key_stores={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+
+class TestLoginRole(LocalJWKSTestCase):
+    """Role comes from the IdToken's cognito:groups, checked against a local JWKS file."""
+
+    def id_token(self, key=None, **claims):
+        payload = {"sub": "user-1", "aud": "mock_client_id", "exp": int(time.time()) + 3600}
+        payload.update(claims)
+        return jwt.encode(payload, key or self.private_key, algorithm="RS256", headers={"kid": "kid-1"})
+
+    def login(self, mock_boto_client, id_token):
+        mock_cognito_client = MagicMock()
+        mock_boto_client.return_value = mock_cognito_client
+        mock_cognito_client.initiate_auth.return_value = {
+            'AuthenticationResult': {
+                'IdToken': id_token,
+                'AccessToken': 'mock_access_token',
+                'RefreshToken': 'mock_refresh_token'
+            }
+        }
+        mock_cognito_client.admin_list_groups_for_user.return_value = {'Groups': [{'GroupName': 'admin'}]}
+        event = {'body': json.dumps({'username': 'testuser', 'password': 'testpassword'})}
+        return mock_cognito_client, lambda_handler(event, {})
+
+    @patch('login.app.get_secret', return_value=mock_cognito_secrets)
+    @patch('boto3.client')
+    def test_role_from_id_token_skips_admin_call(self, mock_boto_client, mock_get_secret):
+        client, response = self.login(mock_boto_client, self.id_token(**{"cognito:groups": ["moderator", "user"]}))
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])['role'], 'moderator')
+        client.admin_list_groups_for_user.assert_not_called()
+
+    @patch('login.app.get_secret', return_value=mock_cognito_secrets)
+    @patch('boto3.client')
+    def test_token_without_groups_checks_admin_api(self, mock_boto_client, mock_get_secret):
+        client, response = self.login(mock_boto_client, self.id_token())
+
+        self.assertEqual(json.loads(response['body'])['role'], 'admin')
+        client.admin_add_user_to_group.assert_not_called()
+        client.initiate_auth.assert_called_once()
+
+    @patch('login.app.get_secret', return_value=mock_cognito_secrets)
+    @patch('boto3.client')
+    def test_user_without_groups_gets_default_group(self, mock_boto_client, mock_get_secret):
+        mock_cognito_client = MagicMock()
+        mock_boto_client.return_value = mock_cognito_client
+        mock_cognito_client.initiate_auth.return_value = {
+            'AuthenticationResult': {'IdToken': self.id_token(), 'AccessToken': 'mock_access_token'}
+        }
+        mock_cognito_client.admin_list_groups_for_user.return_value = {'Groups': []}
+
+        response = lambda_handler({'body': json.dumps({'username': 'testuser', 'password': 'testpassword'})}, {})
+
+        self.assertEqual(json.loads(response['body'])['role'], 'user')
+        mock_cognito_client.admin_add_user_to_group.assert_called_once_with(
+            UserPoolId='us-east-2_mockpool', Username='testuser', GroupName='user')
+        # Se vuelven a pedir los tokens para que el IdToken lleve el grupo
+        self.assertEqual(mock_cognito_client.initiate_auth.call_count, 2)
+
+    @patch('login.app.get_secret', return_value=mock_cognito_secrets)
+    @patch('boto3.client')
+    def test_unverifiable_token_falls_back_to_admin_api(self, mock_boto_client, mock_get_secret):
+        other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+        client, response = self.login(mock_boto_client, self.id_token(key=other_key, **{"cognito:groups": ["admin"]}))
+
+        self.assertEqual(json.loads(response['body'])['role'], 'admin')
+        client.admin_list_groups_for_user.assert_called_once_with(
+            Username='testuser', UserPoolId='us-east-2_mockpool')
+
+    @patch('login.app.get_secret', return_value=mock_cognito_secrets)
+    @patch('boto3.client')
+    def test_jwks_fetched_once_per_container(self, mock_boto_client, mock_get_secret):
+        self.login(mock_boto_client, self.id_token())
+        self.login(mock_boto_client, self.id_token(sub="user-2"))
+
+        self.assertEqual(app.get_key_store('us-east-2_mockpool').fetches, 1)
+
+
+class FakeCognito:
+    """Local stand-in for the cognito-idp client: USER_PASSWORD_AUTH and REFRESH_TOKEN_AUTH with SECRET_HASH checks."""
+
+    def __init__(self, private_key, secrets, users, groups=None):
+        self.private_key = private_key
+        self.secrets = secrets
+        self.users = users
+        self.groups = groups or {}
+        self.refresh_tokens = {}
+        self.calls = []
+
+    def _reject(self, message):
+        raise ClientError({"Error": {"Code": "NotAuthorizedException", "Message": message}}, "InitiateAuth")
+
+    def _tokens(self, username):
+        now = int(time.time())
+        claims = {"sub": username, "aud": self.secrets['CLIENT_ID'], "exp": now + 3600, "iat": now}
+        if self.groups.get(username):
+            claims["cognito:groups"] = self.groups[username]
+        return {
+            'IdToken': jwt.encode(claims, self.private_key, algorithm="RS256", headers={"kid": "kid-1"}),
+            'AccessToken': f"access-{username}-{len(self.calls)}",
+        }
+
+    def initiate_auth(self, ClientId, AuthFlow, AuthParameters):
+        self.calls.append(AuthFlow)
+        if ClientId != self.secrets['CLIENT_ID']:
+            self._reject("Invalid client")
+        if AuthFlow == 'USER_PASSWORD_AUTH':
+            username = AuthParameters['USERNAME']
+            if self.users.get(username) != AuthParameters['PASSWORD']:
+                self._reject("Incorrect username or password.")
+        elif AuthFlow == 'REFRESH_TOKEN_AUTH':
+            username = self.refresh_tokens.get(AuthParameters['REFRESH_TOKEN'])
+            if username is None:
+                self._reject("Invalid Refresh Token")
+        else:
+            self._reject(f"Unsupported flow {AuthFlow}")
+        expected = identity.secret_hash(username, self.secrets['CLIENT_ID'], self.secrets['CLIENT_SECRET'])
+        if AuthParameters.get('SECRET_HASH') != expected:
+            self._reject(f"Unable to verify secret hash for client {ClientId}")
+
+        result = self._tokens(username)
+        if AuthFlow == 'USER_PASSWORD_AUTH':
+            result['RefreshToken'] = f"refresh-{username}-{len(self.refresh_tokens)}"
+            self.refresh_tokens[result['RefreshToken']] = username
+        return {'AuthenticationResult': result}
+
+    def admin_list_groups_for_user(self, Username, UserPoolId):
+        self.calls.append('admin_list_groups_for_user')
+        return {'Groups': [{'GroupName': name} for name in self.groups.get(Username, [])]}
+
+
+class TestLoginRefresh(LocalJWKSTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cognito = FakeCognito(self.private_key, mock_cognito_secrets,
+                                   users={'ash': 'pikachu'}, groups={'ash': ['moderator']})
+        patcher = patch('boto3.client', return_value=self.cognito)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def call(self, **body):
+        response = lambda_handler({'body': json.dumps(body)}, {})
+        return response['statusCode'], json.loads(response['body'])
+
+    @patch('login.app.get_secret', return_value=mock_cognito_secrets)
+    def test_refresh_token_issues_new_tokens_without_password(self, mock_get_secret):
+        _, first = self.call(username='ash', password='pikachu')
+
+        status, refreshed = self.call(username='ash', refresh_token=first['refresh_token'])
+
+        self.assertEqual(status, 200)
+        self.assertEqual(refreshed['message'], 'Tokens refreshed successfully')
+        self.assertEqual(refreshed['refresh_token'], first['refresh_token'])
+        self.assertNotEqual(refreshed['access_token'], first['access_token'])
+        self.assertEqual(refreshed['role'], 'moderator')
+        self.assertEqual(self.cognito.calls, ['USER_PASSWORD_AUTH', 'REFRESH_TOKEN_AUTH'])
+
+    @patch('login.app.get_secret', return_value=mock_cognito_secrets)
+    def test_invalid_refresh_token_is_rejected(self, mock_get_secret):
+        status, body = self.call(username='ash', refresh_token='stolen')
+
+        self.assertEqual(status, 400)
+        self.assertIn('NotAuthorizedException', body['error'])
+
+    @patch('login.app.get_secret', return_value=mock_cognito_secrets)
+    def test_refresh_secret_hash_uses_username(self, mock_get_secret):
+        _, first = self.call(username='ash', password='pikachu')
+
+        status, body = self.call(username='misty', refresh_token=first['refresh_token'])
+
+        self.assertEqual(status, 400)
+        self.assertIn('secret hash', body['error'])
+
+    @patch('boto3.session.Session.client')
+    def test_refresh_reuses_cached_secrets(self, mock_session_client):
+        mock_session_client.return_value.get_secret_value.return_value = {
+            'SecretString': json.dumps(mock_cognito_secrets)
+        }
+        _, first = self.call(username='ash', password='pikachu')
+
+        self.call(username='ash', refresh_token=first['refresh_token'])
+        self.call(username='ash', refresh_token=first['refresh_token'])
+
+        self.assertEqual(mock_session_client.return_value.get_secret_value.call_count, 1)
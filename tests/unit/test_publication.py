@@ -6,6 +6,7 @@ import pymysql
 from botocore.exceptions import ClientError
 from pymysql import MySQLError
 from post_publication import app
+from sionpo_common import pokemon
 
 mock_body = {
     "body": json.dumps({
@@ -41,7 +42,7 @@ class TestPostPublication(unittest.TestCase):
         mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
         mock_connect.return_value = mock_connection
 
-        event = mock_body
+        event = dict(mock_body, queryStringParameters={'full_list': 'true'})
 
         response = app.lambda_handler(event, None)
 
@@ -154,7 +155,7 @@ class TestPostPublication(unittest.TestCase):
         response_body = json.loads(response['body'])
         self.assertIsInstance(response_body, dict)
         self.assertIn('message', response_body)
-        self.assertEqual(response_body['message'], 'likes_count cannot be negative')
+        self.assertEqual(response_body['message'], 'dislikes_count cannot be negative')
 
     @patch('post_publication.app.get_secret')
     def test_lambda_handler_get_secret_fail(self, mock_get_secret):
@@ -169,3 +170,47 @@ class TestPostPublication(unittest.TestCase):
         response_body = json.loads(response['body'])
         self.assertEqual(response_body["message"], "Test secret error")
 
+
+    @patch('post_publication.app.get_secret')
+    @patch('post_publication.app.pymysql.connect')
+    def test_lambda_handler_bumps_catalog_version(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        app.lambda_handler(mock_body, None)
+
+        statements = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        self.assertIn('INSERT INTO CatalogVersion', statements[1])
+        self.assertEqual(mock_cursor.execute.call_args_list[1].args[1], ('Pokemon', 0, 'Pokemon', 25))
+        mock_connection.commit.assert_called_once()
+
+    @patch('post_publication.app.get_secret')
+    @patch('post_publication.app.pymysql.connect')
+    def test_lambda_handler_returns_created_row(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'mock-host',
+            'username': 'mock-username',
+            'password': 'mock-password'
+        }
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.description = (('id_pokemon',), ('pokemon_name',))
+        mock_cursor.fetchone.return_value = (25, 'Pikachu')
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        response = app.lambda_handler(mock_body, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body']), {'id_pokemon': 25, 'pokemon_name': 'Pikachu'})
+        mock_cursor.execute.assert_called_with(
+            f"SELECT {', '.join(pokemon.POKEMON_COLUMNS)} FROM Pokemon WHERE id_pokemon = %s", (25,))
+        mock_cursor.fetchall.assert_not_called()
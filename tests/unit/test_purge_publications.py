@@ -0,0 +1,128 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+import pymysql
+from purge_publications import app
+
+mock_secrets = {
+    'host': 'mock-host',
+    'username': 'mock-username',
+    'password': 'mock-password'
+}
+
+
+class FakeDatabase:
+    """Tombstoned Pokemon with a number of Interactions each; DELETE ... LIMIT removes up to the limit."""
+
+    def __init__(self, interactions):
+        self.interactions = dict(interactions)
+        self.pokemon = set(interactions)
+        self.statements = []
+        self.connection = MagicMock()
+        self.cursor = MagicMock()
+        self.cursor.execute.side_effect = self.execute
+        self.connection.cursor.return_value.__enter__.return_value = self.cursor
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+        if sql.startswith("SELECT id_pokemon FROM Pokemon"):
+            self.cursor.fetchall.return_value = [(i,) for i in sorted(self.pokemon)][:params[1]]
+            return len(self.cursor.fetchall.return_value)
+        if sql.startswith("DELETE FROM Interactions"):
+            id_pokemon, limit = params
+            deleted = min(self.interactions[id_pokemon], limit)
+            self.interactions[id_pokemon] -= deleted
+            return deleted
+        if sql.startswith("DELETE FROM Pokemon"):
+            self.pokemon.discard(params[0])
+            return 1
+        return 0
+
+
+class TestPurgePublications(unittest.TestCase):
+
+    def test_purge_deletes_interactions_in_chunks_then_the_row(self):
+        database = FakeDatabase({1: 5, 2: 0})
+
+        stats = app.purge(database.connection, chunk_size=2)
+
+        self.assertEqual(stats, {"purged": 2, "interactions_deleted": 5, "pending": 0, "failed": 0})
+        self.assertEqual(database.pokemon, set())
+        # 1 lectura + Pokemon 1: 3 bloques (2, 2, 1) + Pokemon 2: 1 bloque
+        self.assertEqual(database.connection.commit.call_count, 5)
+        chunk_sql = [sql for sql in database.statements if sql.startswith("DELETE FROM Interactions")]
+        self.assertEqual(len(chunk_sql), 4)
+
+    def test_row_only_deleted_after_last_chunk(self):
+        database = FakeDatabase({1: 4})
+
+        app.purge(database.connection, chunk_size=2)
+
+        pokemon_delete = database.statements.index(
+            "DELETE FROM Pokemon WHERE id_pokemon = %s AND deleted_at IS NOT NULL")
+        self.assertEqual(
+            [sql for sql in database.statements[:pokemon_delete] if sql.startswith("DELETE FROM Interactions")],
+            ["DELETE FROM Interactions WHERE Fk_id_pokemon = %s LIMIT %s"] * 3
+        )
+
+    def test_purge_stops_before_deadline(self):
+        database = FakeDatabase({1: 10, 2: 3})
+        remaining = iter([60000, 60000, 1000])
+
+        stats = app.purge(database.connection, chunk_size=4, time_left=lambda: next(remaining))
+
+        self.assertEqual(stats, {"purged": 0, "interactions_deleted": 8, "pending": 2, "failed": 0})
+        self.assertEqual(database.pokemon, {1, 2})
+        self.assertEqual(database.interactions[1], 2)
+
+    def test_failed_chunk_rolls_back(self):
+        database = FakeDatabase({1: 3})
+        database.cursor.execute.side_effect = pymysql.MySQLError("lock wait timeout")
+
+        with self.assertRaises(pymysql.MySQLError):
+            app.purge_chunk(database.connection, 1, 2)
+        database.connection.rollback.assert_called_once()
+
+    def test_failed_pokemon_does_not_abort_the_run(self):
+        database = FakeDatabase({1: 1, 2: 1})
+        execute = database.execute
+
+        def fail_first_row(sql, params=None):
+            # Una reacción entró en el Pokemon 1 después del tombstone
+            if sql.startswith("DELETE FROM Pokemon") and params[0] == 1:
+                raise pymysql.IntegrityError(1451, "Cannot delete or update a parent row")
+            return execute(sql, params)
+
+        database.cursor.execute.side_effect = fail_first_row
+
+        stats = app.purge(database.connection, chunk_size=2)
+
+        self.assertEqual((stats["purged"], stats["failed"]), (1, 1))
+        self.assertEqual(database.pokemon, {1})
+
+    @patch('purge_publications.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_success(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = mock_secrets
+        database = FakeDatabase({7: 1})
+        mock_connect.return_value = database.connection
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 300000
+
+        response = app.lambda_handler({}, context)
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])['purged'], 1)
+
+    @patch('purge_publications.app.get_secret')
+    def test_lambda_handler_secret_error(self, mock_get_secret):
+        mock_get_secret.side_effect = Exception("Error retrieving secret")
+
+        response = app.lambda_handler({}, None)
+
+        self.assertEqual(response['statusCode'], 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+import pymysql
+from sionpo_common import reaction_queue, reactions
+
+from reaction_consumer import app
+
+mock_secrets = {
+    'host': 'mock-host',
+    'username': 'mock-username',
+    'password': 'mock-password'
+}
+
+
+def reaction(user, pokemon, interaction_type='like'):
+    return {"Fk_id_user": user, "Fk_id_pokemon": pokemon, "interaction_type": interaction_type}
+
+
+def sqs_event(*bodies):
+    return {"Records": [{"messageId": f"m{index}", "body": json.dumps(body)} for index, body in enumerate(bodies)]}
+
+
+class TestAddBatch(unittest.TestCase):
+
+    def test_coalesces_per_pokemon(self):
+        cursor = MagicMock()
+        cursor.execute.side_effect = lambda sql, params: len(params) // 3 if sql.startswith("INSERT INTO Interactions") else 1
+        keys = [
+            (1, 25, 'like'), (2, 25, 'like'), (1, 25, 'like'),
+            (3, 25, 'dislike'), (4, 7, 'favorite'), (5, 7, 'like'),
+        ]
+
+        created = reactions.add_batch(cursor, keys)
+
+        self.assertEqual(created, {25: {'like': 2, 'dislike': 1}, 7: {'favorite': 1, 'like': 1}})
+        statements = [call.args for call in cursor.execute.call_args_list]
+        inserts = [args for args in statements if args[0].startswith("INSERT INTO Interactions")]
+        self.assertEqual(len(inserts), 4)
+        self.assertEqual(inserts[0][1], [1, 25, 'like', 2, 25, 'like'])
+        updates = [args for args in statements if args[0].startswith("UPDATE Pokemon")]
+        self.assertEqual(updates, [
+            ("UPDATE Pokemon SET likes_count = likes_count + %s, dislikes_count = dislikes_count + %s "
+             "WHERE id_pokemon = %s", [2, 1, 25]),
+            ("UPDATE Pokemon SET likes_count = likes_count + %s WHERE id_pokemon = %s", [1, 7]),
+        ])
+        bumps = [args for args in statements if "CatalogVersion" in args[0]]
+        self.assertEqual(len(bumps), 1)
+        # Solo versiones de fila: la fila de tabla (row_id 0) no se toca desde las reacciones
+        self.assertEqual(bumps[0][1], ('Pokemon', 25, 'Pokemon', 7))
+
+    def test_existing_reactions_do_not_touch_counters(self):
+        cursor = MagicMock()
+        cursor.execute.return_value = 0
+
+        reactions.add_batch(cursor, [(1, 25, 'like')])
+
+        # La búsqueda de Pokemon borrados y el upsert
+        self.assertEqual(cursor.execute.call_count, 2)
+
+    def test_reactions_to_deleted_pokemon_are_dropped(self):
+        cursor = MagicMock()
+        cursor.execute.return_value = 1
+        cursor.fetchall.return_value = [(25,)]
+
+        created = reactions.add_batch(cursor, [(1, 25, 'like'), (1, 7, 'like')])
+
+        self.assertEqual(created, {7: {'like': 1}})
+
+
+class TestReactionConsumer(unittest.TestCase):
+
+    @patch('reaction_consumer.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_writes_batch_in_one_transaction(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = mock_secrets
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.execute.return_value = 1
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        event = sqs_event(reaction(1, 25), reaction(2, 25), {"Fk_id_user": 3})
+
+        response = app.lambda_handler(event, None)
+
+        self.assertEqual(response, {"batchItemFailures": [{"itemIdentifier": "m2"}]})
+        mock_connection.commit.assert_called_once()
+
+    @patch('reaction_consumer.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_falls_back_to_single_writes(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = mock_secrets
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        foreign_key_error = pymysql.IntegrityError(1452, "Cannot add or update a child row")
+
+        def execute(sql, params):
+            if sql.startswith("INSERT INTO Interactions") and 999 in params:
+                raise foreign_key_error
+            return 1
+
+        mock_cursor.execute.side_effect = execute
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        event = sqs_event(reaction(1, 25), reaction(1, 999), reaction(2, 26))
+
+        response = app.lambda_handler(event, None)
+
+        self.assertEqual(response, {"batchItemFailures": [{"itemIdentifier": "m1"}]})
+        mock_connection.rollback.assert_called()
+        self.assertEqual(mock_connection.commit.call_count, 2)
+
+    def test_lambda_handler_nothing_valid_skips_database(self):
+        with patch('reaction_consumer.app.get_secret') as mock_get_secret:
+            response = app.lambda_handler(sqs_event("not a reaction"), None)
+
+        mock_get_secret.assert_not_called()
+        self.assertEqual(response, {"batchItemFailures": [{"itemIdentifier": "m0"}]})
+
+    def test_drain_file_queue(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = reaction_queue.FileQueue(os.path.join(tmp, "reactions.jsonl"))
+            for user in range(1, 6):
+                queue.send(reaction(user, 25))
+            connection = MagicMock()
+            cursor = MagicMock()
+            cursor.execute.return_value = 1
+            connection.cursor.return_value.__enter__.return_value = cursor
+
+            written, failed = app.drain(queue, connection, batch_size=2)
+
+            self.assertEqual((written, failed), (5, 0))
+            self.assertEqual(len(queue), 0)
+            self.assertEqual(connection.commit.call_count, 3)
@@ -0,0 +1,89 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+from reconcile_counters import app
+
+mock_secrets = {
+    'host': 'mock-host',
+    'username': 'mock-username',
+    'password': 'mock-password'
+}
+
+
+class FakeDatabase:
+    """Answers the reconciliation queries from in-memory Pokemon counters and Interactions counts."""
+
+    def __init__(self, pokemon, interactions):
+        self.pokemon = pokemon
+        self.interactions = interactions
+        self.updates = []
+        self.connection = MagicMock()
+        self.cursor = MagicMock()
+        self.cursor.execute.side_effect = self.execute
+        self.connection.cursor.return_value.__enter__.return_value = self.cursor
+        self._result = []
+
+    def execute(self, sql, params=None):
+        if sql.startswith("SELECT id_pokemon, likes_count, dislikes_count FROM Pokemon"):
+            if "IN (" in sql:
+                ids = params
+            elif "WHERE id_pokemon >" in sql:
+                ids = [i for i in sorted(self.pokemon) if i > params[0]][:params[1]]
+            else:
+                ids = sorted(self.pokemon)[:params[0]]
+            self._result = [(i, *self.pokemon[i]) for i in ids if i in self.pokemon]
+        elif sql.startswith("SELECT Fk_id_pokemon"):
+            self._result = [(i, *self.interactions[i]) for i in params if i in self.interactions]
+        elif sql.startswith("UPDATE Pokemon"):
+            self.pokemon[params[2]] = (params[0], params[1])
+            self.updates.append(params[2])
+        self.cursor.fetchall.return_value = self._result
+
+
+class TestReconcileCounters(unittest.TestCase):
+
+    def test_reconcile_fixes_only_drifted_rows(self):
+        database = FakeDatabase(
+            pokemon={1: (3, 0), 2: (10, 1), 3: (0, 0), 4: (5, 5)},
+            interactions={1: (3, 0), 2: (4, 1), 4: (5, 2)},
+        )
+
+        stats = app.reconcile(database.connection, chunk_size=3)
+
+        self.assertEqual(database.updates, [2, 4])
+        self.assertEqual(database.pokemon[2], (4, 1))
+        self.assertEqual(database.pokemon[4], (5, 2))
+        self.assertEqual(stats["scanned"], 4)
+        self.assertEqual(stats["fixed"], 2)
+        self.assertEqual(stats["likes_drift"], 6)
+        self.assertEqual(stats["dislikes_drift"], 3)
+        self.assertEqual(stats["max_drift"], 6)
+        self.assertEqual(stats["examples"][0], {"id_pokemon": 2, "stored": [10, 1], "expected": [4, 1]})
+
+    def test_reconcile_dry_run_reports_without_writing(self):
+        database = FakeDatabase(pokemon={1: (2, 0)}, interactions={})
+
+        stats = app.reconcile(database.connection, dry_run=True)
+
+        self.assertEqual(stats["drifted"], 1)
+        self.assertEqual(stats["fixed"], 0)
+        self.assertEqual(database.updates, [])
+
+    def test_fix_batch_rechecks_under_lock(self):
+        database = FakeDatabase(pokemon={1: (2, 0)}, interactions={1: (2, 0)})
+
+        self.assertEqual(app.fix_batch(database.connection, [1]), {})
+        self.assertIn("FOR UPDATE", database.cursor.execute.call_args_list[0].args[0])
+        self.assertEqual(database.updates, [])
+
+    @patch('reconcile_counters.app.get_secret', return_value=mock_secrets)
+    @patch('pymysql.connect')
+    def test_lambda_handler_reports_stats(self, mock_connect, mock_get_secret):
+        database = FakeDatabase(pokemon={1: (1, 0)}, interactions={})
+        mock_connect.return_value = database.connection
+
+        response = app.lambda_handler({"dry_run": True}, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])["drifted"], 1)
@@ -53,6 +53,8 @@ class TestLambdaHandler(unittest.TestCase):
         data = json.loads(response['body'])
         self.assertEqual(data['message'], 'User registration successful')
         self.assertIn('user_sub', data)
+        # El grupo se asigna al confirmar, fuera del camino del registro
+        mock_cognito_client.admin_add_user_to_group.assert_not_called()
 
     @patch('register_user.app.get_secret')
     @patch('boto3.client')
@@ -0,0 +1,59 @@
+import unittest
+
+from sionpo_common.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(max_bytes=10, ttl=60, clock=self.clock)
+
+    def test_hit_requires_same_version(self):
+        self.cache.put('list', 1, '[1, 2]')
+
+        self.assertEqual(self.cache.get('list', 1), '[1, 2]')
+        self.assertIsNone(self.cache.get('list', 2))
+        self.assertIsNone(self.cache.get('list', 1))
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 2)
+        self.assertEqual(self.cache.stats()['bytes'], 0)
+
+    def test_entries_expire_after_ttl(self):
+        self.cache.put('list', 1, '[]')
+        self.clock.now = 60
+
+        self.assertIsNone(self.cache.get('list', 1))
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        self.cache.put('a', 1, 'aaaa')
+        self.cache.put('b', 1, 'bbbb')
+        self.cache.get('a', 1)
+        self.cache.put('c', 1, 'cccc')
+
+        self.assertEqual(self.cache.get('a', 1), 'aaaa')
+        self.assertIsNone(self.cache.get('b', 1))
+        self.assertEqual(self.cache.get('c', 1), 'cccc')
+        self.assertEqual(self.cache.stats()['bytes'], 8)
+
+    def test_values_larger_than_budget_are_not_cached(self):
+        self.cache.put('big', 1, 'x' * 11)
+
+        self.assertIsNone(self.cache.get('big', 1))
+        self.assertEqual(self.cache.stats()['bytes'], 0)
+
+    def test_hit_ratio(self):
+        self.cache.put('a', 1, 'a')
+        self.cache.get('a', 1)
+        self.cache.get('a', 1)
+        self.cache.get('b', 1)
+
+        self.assertAlmostEqual(self.cache.stats()['hit_ratio'], 2 / 3)
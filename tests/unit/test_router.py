@@ -0,0 +1,95 @@
+import json
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+
+import yaml
+
+from router import app
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'template.yaml')
+
+mock_secrets = {
+    'host': 'mock-host',
+    'username': 'mock-username',
+    'password': 'mock-password'
+}
+
+
+class TemplateLoader(yaml.SafeLoader):
+    """Ignores CloudFormation tags such as !GetAtt and !Sub."""
+
+
+TemplateLoader.add_multi_constructor('!', lambda loader, suffix, node: None)
+
+
+class TestRouter(unittest.TestCase):
+
+    def test_routes_match_template_api_events(self):
+        with open(TEMPLATE, encoding='utf-8') as template_file:
+            template = yaml.load(template_file, Loader=TemplateLoader)
+
+        routes = {}
+        for resource in template['Resources'].values():
+            properties = resource.get('Properties') or {}
+            if resource['Type'] != 'AWS::Serverless::Function' or resource.get('Condition') != 'PerFunction':
+                continue
+            for event in (properties.get('Events') or {}).values():
+                if event['Type'] == 'Api':
+                    route = (event['Properties']['Path'], event['Properties']['Method'].upper())
+                    routes[route] = properties['CodeUri'].strip('/')
+
+        self.assertEqual(routes, app.ROUTES)
+
+    def test_every_route_handler_imports(self):
+        for package in set(app.ROUTES.values()):
+            self.assertTrue(callable(app.get_handler(package)), package)
+
+    def test_dispatches_by_path_and_method(self):
+        handler = MagicMock(return_value={"statusCode": 200, "body": "{}"})
+        event = {"path": "/trending/", "httpMethod": "GET", "queryStringParameters": {"limit": "3"}}
+
+        with patch.dict(app._handlers, {'get_trending': handler}):
+            response = app.lambda_handler(event, "context")
+
+        self.assertEqual(response["statusCode"], 200)
+        handler.assert_called_once_with(event, "context")
+
+    def test_http_api_v2_event(self):
+        handler = MagicMock(return_value={"statusCode": 200, "body": "{}"})
+        event = {"rawPath": "/login", "requestContext": {"http": {"method": "POST"}}}
+
+        with patch.dict(app._handlers, {'login': handler}):
+            app.lambda_handler(event, None)
+
+        handler.assert_called_once()
+
+    def test_unknown_path_and_wrong_method(self):
+        response = app.lambda_handler({"path": "/nope", "httpMethod": "GET"}, None)
+        self.assertEqual(response["statusCode"], 404)
+
+        response = app.lambda_handler({"path": "/login", "httpMethod": "GET"}, None)
+        self.assertEqual(response["statusCode"], 405)
+        self.assertEqual(response["headers"]["Allow"], "POST")
+
+    @patch('boto3.session.Session.client')
+    @patch('pymysql.connect')
+    def test_routes_share_secret_cache_and_connection(self, mock_connect, mock_session_client):
+        mock_session_client.return_value.get_secret_value.return_value = {'SecretString': json.dumps(mock_secrets)}
+        mock_connection = MagicMock()
+        mock_connect.return_value = mock_connection
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = []
+
+        trending = app.lambda_handler({"path": "/trending", "httpMethod": "GET"}, None)
+        reactions = app.lambda_handler(
+            {"path": "/my_reactions", "httpMethod": "GET", "queryStringParameters": {"id_user": "1", "ids": "4"}},
+            None)
+
+        self.assertEqual((trending["statusCode"], reactions["statusCode"]), (200, 200))
+        self.assertEqual(mock_session_client.return_value.get_secret_value.call_count, 1)
+        self.assertEqual(mock_connect.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from sionpo_common.secret_cache import SecretCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSecretCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = SecretCache(ttl=60, max_stale=600, clock=self.clock)
+
+    def test_fresh_value_is_served_from_cache(self):
+        loader = MagicMock(return_value={'host': 'h1'})
+
+        self.assertEqual(self.cache.get('sionpoKeys', loader), {'host': 'h1'})
+        self.assertEqual(self.cache.get('sionpoKeys', loader), {'host': 'h1'})
+
+        loader.assert_called_once()
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_stale_value_is_served_while_refreshing(self):
+        refreshed = threading.Event()
+        values = iter([{'host': 'h1'}, {'host': 'h2'}])
+
+        def loader():
+            value = next(values)
+            if value['host'] == 'h2':
+                refreshed.set()
+            return value
+
+        self.cache.get('sionpoKeys', loader)
+        self.clock.now = 61
+
+        self.assertEqual(self.cache.get('sionpoKeys', loader), {'host': 'h1'})
+        self.assertTrue(refreshed.wait(1))
+        for _ in range(100):
+            if not self.cache._refreshing:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(self.cache.get('sionpoKeys', loader), {'host': 'h2'})
+
+    def test_expired_value_is_fetched_synchronously(self):
+        loader = MagicMock(side_effect=[{'host': 'h1'}, {'host': 'h2'}])
+
+        self.cache.get('sionpoKeys', loader)
+        self.clock.now = 661
+
+        self.assertEqual(self.cache.get('sionpoKeys', loader), {'host': 'h2'})
+        self.assertEqual(loader.call_count, 2)
+
+    def test_loader_error_is_not_cached(self):
+        loader = MagicMock(side_effect=[Exception("boom"), {'host': 'h1'}])
+
+        with self.assertRaises(Exception):
+            self.cache.get('sionpoKeys', loader)
+        self.assertEqual(self.cache.get('sionpoKeys', loader), {'host': 'h1'})
+
+    def test_invalidate_forces_refetch(self):
+        loader = MagicMock(side_effect=[{'host': 'h1'}, {'host': 'h2'}])
+
+        self.cache.get('sionpoKeys', loader)
+        self.cache.invalidate('sionpoKeys')
+
+        self.assertEqual(self.cache.get('sionpoKeys', loader), {'host': 'h2'})
+
@@ -0,0 +1,218 @@
+import json
+import math
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from sionpo_common import reactions, trending
+
+from get_trending import app as get_trending_app
+from rebuild_trending import app as rebuild_app
+
+mock_secrets = {
+    'host': 'mock-host',
+    'username': 'mock-username',
+    'password': 'mock-password'
+}
+DAY = 24 * 3600
+
+
+class FakeReactionCursor:
+    """Just the Interactions rows and TrendingScore that reactions.add/remove touch, kept in memory."""
+
+    def __init__(self, now):
+        self.now = now
+        self.rows = {}
+        self.scores = {}
+        self.result = []
+
+    def execute(self, sql, params=()):
+        self.result = []
+        if sql.startswith("INSERT INTO Interactions"):
+            key = tuple(params)
+            if key in self.rows:
+                return 0
+            self.rows[key] = self.now
+            return 1
+        if sql.startswith("SELECT Fk_id_pokemon, interaction_type, UNIX_TIMESTAMP(created_at)"):
+            keys = [tuple(params[i:i + 3]) for i in range(0, len(params), 3)]
+            self.result = [(key[1], key[2], self.rows[key]) for key in keys if key in self.rows]
+            return len(self.result)
+        if sql.startswith("DELETE FROM Interactions"):
+            return int(self.rows.pop(tuple(params), None) is not None)
+        if sql.startswith("INSERT INTO TrendingScore "):
+            id_pokemon, score = params
+            self.scores[id_pokemon] = trending.log_add(self.scores.get(id_pokemon), score)
+            return 1
+        if sql == trending.SUBTRACT_SQL:
+            score, _, id_pokemon = params
+            self.scores[id_pokemon] = trending.log_sub(self.scores[id_pokemon], score)
+            return 1
+        # Pokemon borrados, contadores y versiones
+        return 0
+
+    def fetchall(self):
+        return self.result
+
+
+class TestTrendingScore(unittest.TestCase):
+
+    def test_score_halves_every_half_life(self):
+        now = trending.EPOCH + 100 * DAY
+        score = trending.log_weight('like', now)
+
+        self.assertAlmostEqual(trending.current_score(score, now), 1.0)
+        self.assertAlmostEqual(trending.current_score(score, now + DAY), 0.5)
+        self.assertAlmostEqual(trending.current_score(trending.log_weight('favorite', now), now), 2.0)
+        self.assertIsNone(trending.log_weight('dislike', now))
+
+    def test_log_add_matches_linear_sum_without_overflow(self):
+        now = trending.EPOCH + 5000 * DAY
+        total = None
+        for _ in range(3):
+            total = trending.log_add(total, trending.log_weight('like', now))
+
+        self.assertAlmostEqual(trending.current_score(total, now), 3.0)
+        self.assertTrue(math.isfinite(total))
+
+    def test_recent_reactions_outrank_old_ones(self):
+        now = trending.EPOCH + 100 * DAY
+        old = trending.scores_for({1: {'like': 10}}, now - 5 * DAY)[1]
+        new = trending.scores_for({2: {'like': 1}}, now)[2]
+
+        self.assertGreater(new, old)
+
+    def test_record_scores_is_one_multi_row_upsert(self):
+        cursor = MagicMock()
+
+        trending.record_scores(cursor, {25: 1.5, 7: 2.5})
+
+        sql, params = cursor.execute.call_args.args
+        self.assertIn("VALUES (%s, %s), (%s, %s) ON DUPLICATE KEY UPDATE", sql)
+        self.assertEqual(params, [25, 1.5, 7, 2.5])
+
+    def test_record_scores_with_shards_writes_one_random_slot(self):
+        cursor = MagicMock()
+
+        with patch('random.randrange', return_value=4):
+            trending.record_scores(cursor, {25: 1.5, 7: 2.5}, shards=8)
+
+        sql, params = cursor.execute.call_args.args
+        self.assertTrue(sql.startswith("INSERT INTO TrendingScoreShard"))
+        self.assertEqual(params, [25, 4, 1.5, 7, 4, 2.5])
+
+    def test_record_ignores_dislikes(self):
+        cursor = MagicMock()
+
+        trending.record(cursor, 25, 'dislike')
+
+        cursor.execute.assert_not_called()
+
+    def test_log_sub_undoes_log_add_and_floors_at_zero(self):
+        now = trending.EPOCH + 100 * DAY
+        like = trending.log_weight('like', now)
+        total = trending.log_add(trending.log_weight('favorite', now), like)
+
+        self.assertAlmostEqual(trending.current_score(trending.log_sub(total, like), now), 2.0)
+        self.assertAlmostEqual(trending.current_score(trending.log_sub(like, total), now), 0.0)
+
+    def test_toggle_loop_does_not_inflate_the_score(self):
+        now = trending.EPOCH + 100 * DAY
+        cursor = FakeReactionCursor(now)
+
+        with patch('time.time', return_value=now):
+            reactions.add(cursor, 2, 25, 'like')
+            for _ in range(50):
+                reactions.add(cursor, 1, 25, 'like')
+                reactions.remove(cursor, 1, 25, 'like')
+            self.assertAlmostEqual(trending.current_score(cursor.scores[25], now), 1.0)
+
+            reactions.add(cursor, 1, 25, 'like')
+            self.assertAlmostEqual(trending.current_score(cursor.scores[25], now), 2.0)
+
+    def test_retract_scores_folds_shards_first(self):
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [(25, 3.0)]
+
+        trending.retract_scores(cursor, {25: 1.5}, shards=4)
+
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        self.assertTrue(statements[0].startswith("SELECT id_pokemon, score FROM TrendingScoreShard"))
+        self.assertEqual(statements[-1], trending.SUBTRACT_SQL)
+        self.assertEqual(cursor.execute.call_args.args[1], (1.5, trending.MIN_FRACTION, 25))
+
+
+class TestGetTrending(unittest.TestCase):
+
+    @patch('get_trending.app.get_secret', return_value=mock_secrets)
+    @patch('pymysql.connect')
+    def test_lambda_handler_reads_top_n(self, mock_connect, mock_get_secret):
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+        score = trending.log_weight('like')
+        mock_cursor.fetchall.return_value = [(25, score, 'Pikachu', 'pikachu.png')]
+
+        response = get_trending_app.lambda_handler({"queryStringParameters": {"limit": "5"}}, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        item = json.loads(response['body'])['items'][0]
+        self.assertEqual(item['id_pokemon'], 25)
+        self.assertAlmostEqual(item['score'], 1.0, places=2)
+        sql, params = mock_cursor.execute.call_args.args
+        self.assertIn("ORDER BY t.score DESC LIMIT %s", sql)
+        self.assertEqual(params, (5,))
+
+    def test_lambda_handler_invalid_limit(self):
+        for limit in ("0", "abc", str(get_trending_app.MAX_LIMIT + 1)):
+            response = get_trending_app.lambda_handler({"queryStringParameters": {"limit": limit}}, None)
+
+            self.assertEqual(response['statusCode'], 400)
+
+
+class TestRebuildTrending(unittest.TestCase):
+
+    def test_compute_scores_reads_in_chunks(self):
+        now = trending.EPOCH + 100 * DAY
+        connection = MagicMock()
+        cursor = MagicMock()
+        connection.cursor.return_value.__enter__.return_value = cursor
+        cursor.fetchall.side_effect = [
+            [(1, 25, 'like', now), (2, 25, 'favorite', now)],
+            [(5, 7, 'like', now - DAY)],
+        ]
+
+        scores = rebuild_app.compute_scores(connection, 9, now=now, chunk_size=2)
+
+        self.assertAlmostEqual(trending.current_score(scores[25], now), 3.0)
+        self.assertAlmostEqual(trending.current_score(scores[7], now), 0.5)
+        self.assertEqual(cursor.execute.call_args_list[1].args[1][:2], [2, 9])
+
+    def test_merge_scores_keeps_reactions_newer_than_the_snapshot(self):
+        now = time.time()
+        connection = MagicMock()
+        cursor = MagicMock()
+        connection.cursor.return_value.__enter__.return_value = cursor
+        cursor.fetchall.side_effect = [
+            [(7,), (9,)],
+            [],
+            # Un like a 25 confirmado mientras se calculaba
+            [(25, 'like', now)],
+        ]
+        scores = {25: trending.log_weight('like', now), 7: trending.log_weight('favorite', now)}
+
+        ranked = rebuild_app.merge_scores(connection, scores, until_id=100, chunk_size=2)
+
+        self.assertEqual(ranked, 2)
+        statements = [call.args for call in cursor.execute.call_args_list]
+        self.assertFalse(any(sql == "DELETE FROM TrendingScore" for sql, *_ in statements))
+        self.assertIn("FOR UPDATE", statements[1][0])
+        self.assertEqual(statements[3][1][:3], [100, 7, 9])
+        upserts = [args for args in statements if args[0].startswith("INSERT INTO TrendingScore")]
+        self.assertIn("score = VALUES(score)", upserts[0][0])
+        self.assertEqual([params[0] for _, params in upserts], [7, 25])
+        for _, params in upserts:
+            self.assertAlmostEqual(trending.current_score(params[1], now), 2.0, places=3)
+        self.assertIn(("DELETE FROM TrendingScore WHERE id_pokemon IN (%s)", [9]), statements)
+        self.assertEqual(connection.commit.call_count, 3)
@@ -27,8 +27,8 @@ class TestLambdaHandler(unittest.TestCase):
             'body': json.dumps({
                 'id_pokemon': 1,
                 'updated_data': {
-                    'name': 'Pikachu',
-                    'type': 'Electric'
+                    'pokemon_name': 'Pikachu',
+                    'types': 'Electric'
                 }
             })
         }
@@ -61,6 +61,48 @@ class TestLambdaHandler(unittest.TestCase):
         data = json.loads(response['body'])
         self.assertEqual(data['message'], 'Missing id_pokemon or updated_data in request body')
 
+    @patch('update_publication.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_rejects_deleted_at(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'test_host',
+            'username': 'test_user',
+            'password': 'test_pass'
+        }
+
+        event = {
+            'body': json.dumps({
+                'id_pokemon': 1,
+                'updated_data': {'deleted_at': None}
+            })
+        }
+
+        response = lambda_handler(event, {})
+
+        self.assertEqual(response['statusCode'], 400)
+        mock_connect.assert_not_called()
+
+    @patch('update_publication.app.get_secret')
+    @patch('pymysql.connect')
+    def test_lambda_handler_rejects_unknown_columns(self, mock_connect, mock_get_secret):
+        mock_get_secret.return_value = {
+            'host': 'test_host',
+            'username': 'test_user',
+            'password': 'test_pass'
+        }
+
+        for updated_data, message in (
+                ({'DELETED_AT': '2024-01-01'}, "deleted_at cannot be updated, use /delete_pokemon"),
+                ({'id_pokemon': 2}, "Unknown field: id_pokemon"),
+                ({'pokemon_name': 'x', 'image=NULL, pokemon_name': 'y'}, "Unknown field: image=NULL, pokemon_name")):
+            event = {'body': json.dumps({'id_pokemon': 1, 'updated_data': updated_data})}
+
+            response = lambda_handler(event, {})
+
+            self.assertEqual(response['statusCode'], 400)
+            self.assertEqual(json.loads(response['body'])['message'], message)
+        mock_connect.assert_not_called()
+
     @patch('update_publication.app.get_secret')
     @patch('pymysql.connect')
     def test_lambda_handler_database_error(self, mock_connect, mock_get_secret):
@@ -76,8 +118,8 @@ class TestLambdaHandler(unittest.TestCase):
             'body': json.dumps({
                 'id_pokemon': 1,
                 'updated_data': {
-                    'name': 'Pikachu',
-                    'type': 'Electric'
+                    'pokemon_name': 'Pikachu',
+                    'types': 'Electric'
                 }
             })
         }
@@ -97,8 +139,8 @@ class TestLambdaHandler(unittest.TestCase):
             'body': json.dumps({
                 'id_pokemon': 1,
                 'updated_data': {
-                    'name': 'Pikachu',
-                    'type': 'Electric'
+                    'pokemon_name': 'Pikachu',
+                    'types': 'Electric'
                 }
             })
         }
@@ -118,8 +160,8 @@ class TestLambdaHandler(unittest.TestCase):
             'body': json.dumps({
                 'id_pokemon': 1,
                 'updated_data': {
-                    'name': 'Pikachu',
-                    'type': 'Electric'
+                    'pokemon_name': 'Pikachu',
+                    'types': 'Electric'
                 }
             })
         }
@@ -175,8 +217,8 @@ class TestLambdaHandler(unittest.TestCase):
     #         'body': json.dumps({
     #             'id_pokemon': 999,
     #             'updated_data': {
-    #                 'name': 'Pikachu',
-    #                 'type': 'Electric'
+    #                 'pokemon_name': 'Pikachu',
+    #                 'types': 'Electric'
     #             }
     #         })
     #     }
@@ -0,0 +1,117 @@
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+from sionpo_common import pagination
+
+from get_favorites import app as favorites_app
+from get_user_reactions import app as reactions_app
+
+mock_secrets = {
+    'host': 'mock-host',
+    'username': 'mock-username',
+    'password': 'mock-password'
+}
+
+
+def mock_database(mock_connect):
+    mock_connection = MagicMock()
+    mock_cursor = MagicMock()
+    mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_connect.return_value = mock_connection
+    return mock_cursor
+
+
+class TestUserReactions(unittest.TestCase):
+
+    @patch('get_user_reactions.app.get_secret', return_value=mock_secrets)
+    @patch('pymysql.connect')
+    def test_lambda_handler_answers_with_one_in_query(self, mock_connect, mock_get_secret):
+        mock_cursor = mock_database(mock_connect)
+        mock_cursor.fetchall.return_value = [(25, 'favorite'), (25, 'like'), (7, 'dislike')]
+
+        event = {"queryStringParameters": {"id_user": "1", "ids": "25,7,4,25"}}
+        response = reactions_app.lambda_handler(event, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(json.loads(response['body'])['reactions'],
+                         {"25": ["like", "favorite"], "7": ["dislike"], "4": []})
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT i.Fk_id_pokemon, i.interaction_type FROM Interactions i "
+            "JOIN Pokemon p ON p.id_pokemon = i.Fk_id_pokemon "
+            "WHERE i.Fk_id_user = %s AND i.Fk_id_pokemon IN (%s, %s, %s) AND p.deleted_at IS NULL",
+            [1, 25, 7, 4]
+        )
+
+    @patch('get_user_reactions.app.get_secret', return_value=mock_secrets)
+    @patch('pymysql.connect')
+    def test_lambda_handler_skips_deleted_pokemon(self, mock_connect, mock_get_secret):
+        mock_cursor = mock_database(mock_connect)
+        # 7 está borrado: el JOIN con deleted_at IS NULL no devuelve sus filas
+        mock_cursor.fetchall.return_value = [(25, 'like')]
+
+        event = {"queryStringParameters": {"id_user": "1", "ids": "25,7"}}
+        response = reactions_app.lambda_handler(event, None)
+
+        self.assertEqual(json.loads(response['body'])['reactions'], {"25": ["like"], "7": []})
+        sql = mock_cursor.execute.call_args.args[0]
+        self.assertIn("JOIN Pokemon p ON p.id_pokemon = i.Fk_id_pokemon", sql)
+        self.assertTrue(sql.endswith("AND p.deleted_at IS NULL"))
+
+    @patch('pymysql.connect')
+    def test_lambda_handler_validates_ids(self, mock_connect):
+        too_many = ",".join(str(i) for i in range(reactions_app.MAX_IDS + 1))
+        for params in ({"ids": "1"}, {"id_user": "1", "ids": "a,b"}, {"id_user": "1", "ids": ","},
+                       {"id_user": "1", "ids": too_many}, None):
+            response = reactions_app.lambda_handler({"queryStringParameters": params}, None)
+
+            self.assertEqual(response['statusCode'], 400)
+        mock_connect.assert_not_called()
+
+
+class TestFavorites(unittest.TestCase):
+
+    @patch('get_favorites.app.get_secret', return_value=mock_secrets)
+    @patch('pymysql.connect')
+    def test_lambda_handler_first_page(self, mock_connect, mock_get_secret):
+        mock_cursor = mock_database(mock_connect)
+        mock_cursor.description = (('id_pokemon',), ('pokemon_name',))
+        mock_cursor.fetchall.return_value = [(4, 'Charmander'), (7, 'Squirtle'), (25, 'Pikachu')]
+
+        event = {"queryStringParameters": {"id_user": "1", "limit": "2", "fields": "pokemon_name"}}
+        response = favorites_app.lambda_handler(event, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        body = json.loads(response['body'])
+        self.assertEqual([item['id_pokemon'] for item in body['items']], [4, 7])
+        self.assertEqual(pagination.decode_cursor(body['next_cursor']), 7)
+        mock_cursor.execute.assert_called_once_with(
+            "SELECT p.id_pokemon, p.pokemon_name FROM Interactions i "
+            "JOIN Pokemon p ON p.id_pokemon = i.Fk_id_pokemon "
+            "WHERE i.Fk_id_user = %s AND i.interaction_type = 'favorite' AND p.deleted_at IS NULL "
+            "ORDER BY i.Fk_id_pokemon LIMIT %s",
+            [1, 3]
+        )
+
+    @patch('get_favorites.app.get_secret', return_value=mock_secrets)
+    @patch('pymysql.connect')
+    def test_lambda_handler_next_page_uses_keyset(self, mock_connect, mock_get_secret):
+        mock_cursor = mock_database(mock_connect)
+        mock_cursor.description = (('id_pokemon',),)
+        mock_cursor.fetchall.return_value = [(25,)]
+
+        event = {"queryStringParameters": {"id_user": "1", "cursor": pagination.encode_cursor(7)}}
+        response = favorites_app.lambda_handler(event, None)
+
+        body = json.loads(response['body'])
+        self.assertIsNone(body['next_cursor'])
+        sql, params = mock_cursor.execute.call_args.args
+        self.assertIn("AND i.Fk_id_pokemon > %s ORDER BY", sql)
+        self.assertTrue(sql.startswith("SELECT p.id_pokemon, p.pokemon_name, p.abilities"))
+        self.assertEqual(params, [1, 7, pagination.DEFAULT_LIMIT + 1])
+
+    def test_lambda_handler_invalid_request(self):
+        for params in ({}, {"id_user": "x"}, {"id_user": "1", "cursor": "???"}, {"id_user": "1", "limit": "0"}):
+            response = favorites_app.lambda_handler({"queryStringParameters": params}, None)
+
+            self.assertEqual(response['statusCode'], 400)
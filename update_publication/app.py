@@ -2,10 +2,13 @@ import json
 import pymysql
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
+from sionpo_common import db, pokemon, secret_cache, versions
 
+SECRET_NAME = 'sionpoKeys'
 
-def get_secret():
-    secret_name = 'sionpoKeys'
+
+def fetch_secret():
+    secret_name = SECRET_NAME
     region_name = 'us-east-2'
 
     session = boto3.session.Session()
@@ -65,46 +68,55 @@ def get_secret():
         })
 
 
+def get_secret(refresh=False):
+    return secret_cache.get_secret(SECRET_NAME, fetch_secret, refresh)
+
+
 def lambda_handler(event, context):
     global response
     try:
         secrets = get_secret()
 
-        host = secrets['host']
-        name = secrets['username']
-        password = secrets['password']
-        db_name = "SIONPO"
-
         body = json.loads(event.get("body", "{}"))
         pokemon_id = body.get("id_pokemon")
         updated_data = body.get("updated_data", {})
 
-        if not pokemon_id or not updated_data:
+        if not pokemon_id or not updated_data or not isinstance(updated_data, dict):
             return {
                 "statusCode": 400,
                 "body": json.dumps({"message": "Missing id_pokemon or updated_data in request body"})
             }
 
-        connection = pymysql.connect(
-            host=host,
-            user=name,
-            password=password,
-            db=db_name,
-            connect_timeout=5
-        )
+        # Las claves se interpolan en el SQL: solo nombres exactos de columnas editables
+        for key in updated_data:
+            if key not in pokemon.UPDATABLE_COLUMNS:
+                if key.lower() == 'deleted_at':
+                    message = "deleted_at cannot be updated, use /delete_pokemon"
+                else:
+                    message = f"Unknown field: {key}"
+                return {
+                    "statusCode": 400,
+                    "body": json.dumps({"message": message})
+                }
+
+        connection = db.acquire(secrets, get_secret)
 
         try:
             with connection.cursor() as cursor:
                 update_query = "UPDATE Pokemon SET "
                 update_query += ", ".join([f"{key}=%s" for key in updated_data.keys()])
-                update_query += " WHERE id_pokemon=%s"
+                # Una publicación borrada no se puede editar (ni revivir)
+                update_query += f" WHERE id_pokemon=%s AND {pokemon.NOT_DELETED}"
 
                 update_values = list(updated_data.values()) + [pokemon_id]
 
                 cursor.execute(update_query, tuple(update_values))
+                updated = cursor.rowcount
+                if updated != 0:
+                    versions.bump(cursor, 'Pokemon', pokemon_id)
                 connection.commit()
 
-                if cursor.rowcount == 0:
+                if updated == 0:
                     response = {
                         "statusCode": 404,
                         "body": json.dumps({"message": "Pokemon not found"})
@@ -147,7 +159,7 @@ def lambda_handler(event, context):
                     "body": json.dumps({"message": f"Database error: {str(error)}"})
                 }
         finally:
-            connection.close()
+            db.release(connection)
             return response
 
     except Exception as e: